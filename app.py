@@ -3,7 +3,10 @@ GCScan Web Interface (Entry Point)
 """
 
 import streamlit as st
-from src.infrastructure.web.components import render_sidebar, process_uploads, render_main_dashboard
+from src.infrastructure.web.components import (
+    analysis_key, collect_results, render_analysis_status, render_live_analysis, render_main_dashboard,
+    render_sidebar, session_analysis
+)
 
 def main():
     st.set_page_config(
@@ -14,13 +17,21 @@ def main():
     st.title("🧬 GCScan - Analisador de Conteúdo GC (Pro)")
     st.markdown("Ferramenta profissional de bioinformática.")
     
-    files, do_sw, w, s, do_cpg = render_sidebar()
+    files, do_sw, w, s, do_cpg, kernel = render_sidebar()
     
     if files:
-        results, sw_res, cpg_res = process_uploads(files, do_sw, w, s, do_cpg)
+        job = session_analysis(files, do_sw, w, s, do_cpg, kernel)
+        if not job.done and not job.cancelled:
+            # Só o fragmento de progresso é reexecutado enquanto a análise roda
+            render_live_analysis(job, len(files) > 1)
+            return
+        render_analysis_status(job)
+        results, sw_res, cpg_res = collect_results(job, len(files) > 1)
         if results:
             sw_params = {'window': w, 'step': s}
-            render_main_dashboard(results, sw_res, cpg_res, sw_params)
+            # Resultados parciais (cancelados) não entram no cache de tabelas
+            key = analysis_key(files, do_sw, w, s, do_cpg, kernel) if not job.cancelled else None
+            render_main_dashboard(results, sw_res, cpg_res, sw_params, key)
     else:
         st.info("Aguardando upload de arquivos.")
 
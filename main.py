@@ -4,10 +4,14 @@ GCScan - Analisador de Conteúdo GC (CLI Entry Point)
 
 import sys
 import os
-from src.infrastructure.cli.parser import parse_args
+from src.infrastructure.cli.parser import COMMANDS, parse_args, parse_command_args
 from src.infrastructure.cli.runner import run_analysis
+from src.infrastructure.cli.commands import run_index, run_query
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return _run_command(parse_command_args(sys.argv[1:]))
+
     args = parse_args()
     
     if not os.path.exists(args.input):
@@ -20,5 +24,12 @@ def main():
         print(f"Ocorreu um erro inesperado: {e}")
         sys.exit(1)
 
+def _run_command(args):
+    try:
+        (run_index if args.command == "index" else run_query)(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
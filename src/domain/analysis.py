@@ -1,5 +1,20 @@
-from typing import List, Tuple, Optional
-from src.domain.models import CpGIsland
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, compress, count, repeat
+from operator import le, sub
+from typing import Iterator, List, Tuple, Optional
+from src.domain.models import ChunkScan, CpGIsland, CpGIslandTable, SequenceAnalysis, window_array
+
+_GC_BASES = frozenset("GCgc")
+_GC_FLAGS = bytes(1 if chr(b) in "GC" else 0 for b in range(256))
+_SEED_LEN = 50
+_SEED_STEP = 10
+# Janelas por bloco na geração em fluxo (256 KB em float32)
+WINDOW_CHUNK = 1 << 16
+# Versão dos resultados deste kernel: incrementar quando a saída mudar (invalida caches)
+KERNEL_VERSION = "1"
+# Critérios padrão de ilhas CpG (min_len, min_gc, min_oe), os mesmos das assinaturas abaixo
+CPG_THRESHOLDS = (200, 50.0, 0.6)
 
 def calculate_gc_percentage(sequence: str) -> float:
     """Calcula a porcentagem de GC em uma sequência de DNA."""
@@ -8,39 +23,174 @@ def calculate_gc_percentage(sequence: str) -> float:
     gc_count = seq.count('G') + seq.count('C')
     return (gc_count / len(seq)) * 100
 
+def build_gc_index(sequence: str) -> array:
+    """
+    Constrói o índice cumulativo de G+C: index[i] = nº de G/C em sequence[:i].
+    Montado uma única vez por sequência, responde qualquer janela com duas leituras.
+    """
+    return array('q', accumulate(map(_GC_BASES.__contains__, sequence), initial=0))
+
+def gc_percentage_in_range(gc_index: array, start: int, end: int) -> float:
+    """Calcula a porcentagem de GC em sequence[start:end] a partir do índice cumulativo."""
+    length = end - start
+    if length <= 0: return 0.0
+    return ((gc_index[end] - gc_index[start]) / length) * 100
+
+def gc_and_oe_from_counts(g: int, c: int, cg: int, length: int) -> Tuple[float, float]:
+    """GC% e razão Obs/Exp de CpG a partir de contagens (mesmas fórmulas da validação de ilhas)."""
+    if length <= 0: return 0.0, 0.0
+    oe = (cg * length) / (c * g) if (c * g) > 0 else 0
+    return ((g + c) / length) * 100, oe
+
 def calculate_sliding_window(sequence: str, win_size: int, step: int) -> List[float]:
-    """Calcula GC em janelas deslizantes."""
-    return [calculate_gc_percentage(sequence[i:i+win_size]) 
-            for i in range(0, len(sequence)-win_size+1, step)]
+    """Calcula GC em janelas deslizantes em O(n) via índice cumulativo."""
+    starts = range(0, len(sequence)-win_size+1, step)
+    if win_size <= 0: return [calculate_gc_percentage(sequence[i:i+win_size]) for i in starts]
+    return list(_iter_windows(build_gc_index(sequence), win_size, starts))
+
+def iter_window_chunks(sequence: str, win_size: int, step: int = 0, chunk_windows: int = WINDOW_CHUNK) -> Iterator[array]:
+    """
+    Gera as janelas (passo padrão = janela) em blocos float32 de até `chunk_windows` valores.
+    Cada bloco usa um índice cumulativo só do trecho que cobre, então a memória é O(bloco),
+    e os valores são idênticos aos de `scan_sequence`.
+    """
+    if win_size <= 0: return
+    yield from _window_chunks(str(sequence), win_size, step if step > 0 else win_size, chunk_windows)
+
+def _window_chunks(seq_str: str, win_size: int, step: int, chunk_windows: int) -> Iterator[array]:
+    starts = range(0, len(seq_str) - win_size + 1, step)
+    for k in range(0, len(starts), chunk_windows):
+        block = starts[k:k + chunk_windows]
+        lo, hi = block[0], block[-1] + win_size
+        idx = build_gc_index(seq_str[lo:hi])
+        yield window_array(_iter_windows(idx, win_size, range(0, hi - lo - win_size + 1, step)))
+
+def _iter_windows(idx: array, win_size: int, starts: range) -> Iterator[float]:
+    return (((idx[i + win_size] - idx[i]) / win_size) * 100 for i in starts)
+
+def scan_sequence(seq_id: str, sequence: str, win_size: int = 0, step: int = 0, cpg: bool = False,
+                  min_len: int = 200, min_gc: float = 50.0, min_oe: float = 0.6) -> SequenceAnalysis:
+    """
+    Varredura fundida: normaliza a sequência uma única vez e deriva GC global, janelas
+    (passo padrão = janela) e ilhas CpG da mesma cópia e do mesmo índice cumulativo.
+    O resultado é compacto: janelas em float32 e ilhas em tabela colunar.
+    """
+    seq_str = str(sequence).upper()
+    n = len(seq_str)
+    windows = window_array()
+    if win_size > 0:
+        idx = build_gc_index(seq_str)
+        gc_count = idx[-1]
+        windows = window_array(_iter_windows(idx, win_size, range(0, n-win_size+1, step if step > 0 else win_size)))
+    else:
+        gc_count = seq_str.count('G') + seq_str.count('C')
+    gc = (gc_count / n) * 100 if n else 0.0
+    islands = CpGIslandTable(_scan_cpg_islands(seq_str, min_len, min_gc, min_oe) if cpg else ())
+    return SequenceAnalysis(seq_id, gc, windows, islands)
+
+def scan_stream(seq_id: str, sequence: str, win_size: int = 0, step: int = 0, cpg: bool = False,
+                chunk_windows: int = WINDOW_CHUNK, min_len: int = 200, min_gc: float = 50.0,
+                min_oe: float = 0.6) -> Tuple[SequenceAnalysis, Iterator[array]]:
+    """
+    Como `scan_sequence`, mas as janelas saem em blocos (ver `iter_window_chunks`) gerados
+    da mesma cópia normalizada: GC e ilhas na hora, janelas sob demanda, em memória O(bloco).
+    """
+    seq_str = str(sequence).upper()
+    n = len(seq_str)
+    gc = ((seq_str.count('G') + seq_str.count('C')) / n) * 100 if n else 0.0
+    islands = CpGIslandTable(_scan_cpg_islands(seq_str, min_len, min_gc, min_oe) if cpg else ())
+    chunks = _window_chunks(seq_str, win_size, step if step > 0 else win_size, chunk_windows) if win_size > 0 else iter(())
+    return SequenceAnalysis(seq_id, gc, window_array(), islands), chunks
+
+def scan_chunk(chunk: str, core_len: int, win_size: int = 0, step: int = 0, cpg: bool = False,
+               min_gc: float = 50.0, min_oe: float = 0.6) -> ChunkScan:
+    """
+    Varre um pedaço de sequência longa: `chunk[:core_len]` é o núcleo do pedaço e o restante
+    é a sobreposição com o próximo. Retorna a contagem de G+C do núcleo, as janelas e as
+    sementes CpG aprovadas que começam no núcleo (posições relativas ao pedaço).
+    """
+    seq_str = str(chunk).upper()
+    core = seq_str[:core_len]
+    windows = window_array()
+    if win_size > 0:
+        starts = range(0, min(core_len, len(seq_str) - win_size + 1), step if step > 0 else win_size)
+        windows = window_array(_iter_windows(build_gc_index(seq_str), win_size, starts))
+    seeds = array('q', (p for p in screen_cpg_seeds(seq_str, min_gc, min_oe) if p < core_len) if cpg else ())
+    return ChunkScan(core.count('G') + core.count('C'), windows, seeds)
+
+def screen_cpg_seeds(sequence: str, min_gc: float = 50.0, min_oe: float = 0.6) -> List[int]:
+    """
+    Todas as posições (não só a grade de 10 bp) cujas sementes de 50 bp passam no critério.
+    O GC de cada semente vem de uma soma deslizante em iteradores C; só as sementes acima
+    do corte de GC são conferidas uma a uma.
+    """
+    seq_str = str(sequence).upper()
+    if len(seq_str) < _SEED_LEN: return []
+    flags = seq_str.encode('ascii', 'replace').translate(_GC_FLAGS)
+    gc_counts = accumulate(map(sub, flags[_SEED_LEN:], flags), initial=sum(flags[:_SEED_LEN]))
+    # ((g + c) / 50) * 100 é monotônico em g + c: o corte vira um limiar inteiro exato
+    min_count = next((k for k in range(_SEED_LEN + 1) if ((k / _SEED_LEN) * 100) >= min_gc), _SEED_LEN + 1)
+    return [i for i in compress(count(), map(le, repeat(min_count), gc_counts))
+            if _seed_passes(seq_str, i, min_gc, min_oe)]
+
+def islands_from_seeds(seq_str: str, seeds: List[int], min_len: int = 200, min_gc: float = 50.0, min_oe: float = 0.6) -> List[CpGIsland]:
+    """
+    Reproduz a varredura de `detect_cpg_islands` a partir das sementes aprovadas (ordenadas,
+    sequência em maiúsculas): a próxima semente visitada é sempre a primeira aprovada ≥ i
+    na mesma classe de resíduo da grade de 10 bp.
+    """
+    by_residue = [[] for _ in range(_SEED_STEP)]
+    for p in seeds:
+        by_residue[p % _SEED_STEP].append(p)
+    cursors = [0] * _SEED_STEP  # i só cresce: cada classe retoma a busca de onde parou
+    islands, i = [], 0
+    while True:
+        r = i % _SEED_STEP
+        bucket = by_residue[r]
+        k = bisect_left(bucket, i, cursors[r])
+        res = None
+        while k < len(bucket) and not res:
+            res = _expand_and_validate(seq_str, bucket[k], min_len, min_gc, min_oe)
+            k += 1
+        if not res: return islands
+        cursors[r] = k
+        islands.append(res[0])
+        i = res[1]
 
 def detect_cpg_islands(sequence: str, min_len: int = 200, min_gc: float = 50.0, min_oe: float = 0.6) -> List[CpGIsland]:
     """Identifica ilhas CpG em uma sequência de DNA."""
+    return _scan_cpg_islands(str(sequence).upper(), min_len, min_gc, min_oe)
+
+def _scan_cpg_islands(seq_str: str, min_len: int, min_gc: float, min_oe: float) -> List[CpGIsland]:
+    """Varredura de sementes sobre a sequência já normalizada em maiúsculas."""
     islands = []
-    seq_str = str(sequence).upper()
     i, n = 0, len(seq_str)
-    while i < n - 50 + 1:
+    while i < n - _SEED_LEN + 1:
         res = _try_seed_at(seq_str, i, min_len, min_gc, min_oe)
         if res:
             islands.append(res[0])
             i = res[1]
         else:
-            i += 10
+            i += _SEED_STEP
     return islands
 
 def _try_seed_at(seq: str, i: int, m_len: int, m_gc: float, m_oe: float) -> Optional[Tuple[CpGIsland, int]]:
     """Tenta encontrar e expandir uma semente na posição i."""
-    sub = seq[i : i + 50]
-    g, c = sub.count('G'), sub.count('C')
-    if ((g + c) / 50) * 100 < m_gc: return None
-    
-    oe = (sub.count('CG') * 50) / (c * g) if (c * g) > 0 else 0
-    if oe < m_oe: return None
-    
+    if not _seed_passes(seq, i, m_gc, m_oe): return None
     return _expand_and_validate(seq, i, m_len, m_gc, m_oe)
 
+def _seed_passes(seq: str, i: int, m_gc: float, m_oe: float) -> bool:
+    """Critério da semente de 50 bp em i: GC mínimo e razão Obs/Exp de CpG mínima."""
+    seed = seq[i : i + _SEED_LEN]
+    g, c = seed.count('G'), seed.count('C')
+    if ((g + c) / _SEED_LEN) * 100 < m_gc: return False
+    
+    oe = (seed.count('CG') * _SEED_LEN) / (c * g) if (c * g) > 0 else 0
+    return oe >= m_oe
+
 def _expand_and_validate(seq: str, i: int, m_len: int, m_gc: float, m_oe: float) -> Optional[Tuple[CpGIsland, int]]:
     """Expande semente e valida critérios finais."""
-    start, end = _expand_borders(seq, i, i + 50)
+    start, end = _expand_borders(seq, i, i + _SEED_LEN)
     
     # Encontrar limites reais de G/C dentro do range expandido
     sub = seq[start:end]
@@ -0,0 +1,202 @@
+"""
+Kernel vetorizado (NumPy) para as análises de GC e ilhas CpG.
+Espelha `analysis.py` (implementação de referência) produzindo resultados idênticos,
+mas trabalha sobre uma visão `uint8` da sequência em vez de fatias de string.
+"""
+
+from array import array
+from typing import Iterator, List, Tuple, Union
+import numpy as np
+from src.domain.models import ChunkScan, CpGIsland, CpGIslandTable, SequenceAnalysis, window_array
+from src.domain.analysis import _SEED_LEN, _SEED_STEP, WINDOW_CHUNK
+
+KERNEL_VERSION = "1"
+
+_G, _C = ord('G'), ord('C')
+
+def as_uint8(sequence: Union[str, bytes]) -> np.ndarray:
+    """Normaliza a sequência (maiúsculas) e a expõe como array `uint8`."""
+    raw = sequence.encode('ascii', 'replace') if isinstance(sequence, str) else bytes(sequence)
+    return np.frombuffer(raw.upper(), dtype=np.uint8)
+
+def calculate_gc_percentage(sequence: Union[str, bytes]) -> float:
+    """Calcula a porcentagem de GC em uma sequência de DNA."""
+    if not sequence: return 0.0
+    arr = as_uint8(sequence)
+    gc_count = int(np.count_nonzero((arr == _G) | (arr == _C)))
+    return (gc_count / len(arr)) * 100
+
+def calculate_sliding_window(sequence: Union[str, bytes], win_size: int, step: int) -> List[float]:
+    """Calcula GC em janelas deslizantes a partir de somas cumulativas vetorizadas."""
+    starts = range(0, len(sequence)-win_size+1, step)
+    if win_size <= 0: return [calculate_gc_percentage(sequence[i:i+win_size]) for i in starts]
+    if not starts: return []
+    arr = as_uint8(sequence)
+    return _window_values(_prefix((arr == _G) | (arr == _C)), win_size, starts).tolist()
+
+def iter_window_chunks(sequence: Union[str, bytes], win_size: int, step: int = 0, chunk_windows: int = WINDOW_CHUNK) -> Iterator[array]:
+    """Versão vetorizada de `analysis.iter_window_chunks`: blocos float32 com memória O(bloco)."""
+    if win_size <= 0: return
+    yield from _window_chunks(as_uint8(sequence), win_size, step if step > 0 else win_size, chunk_windows)
+
+def _window_chunks(arr: np.ndarray, win_size: int, step: int, chunk_windows: int) -> Iterator[array]:
+    starts = range(0, len(arr) - win_size + 1, step)
+    for k in range(0, len(starts), chunk_windows):
+        block = starts[k:k + chunk_windows]
+        lo, hi = block[0], block[-1] + win_size
+        part = arr[lo:hi]
+        yield _compact_windows(_prefix((part == _G) | (part == _C)), win_size, range(0, hi - lo - win_size + 1, step))
+
+def _window_values(idx: np.ndarray, win_size: int, starts: range) -> np.ndarray:
+    pos = np.arange(starts.start, starts.stop, starts.step, dtype=np.int64)
+    return ((idx[pos + win_size] - idx[pos]) / win_size) * 100
+
+def _compact_windows(idx: np.ndarray, win_size: int, starts: range) -> array:
+    """Janelas já no buffer float32 do modelo (mesmo arredondamento de `array('f')`)."""
+    return window_array(_window_values(idx, win_size, starts).astype(np.float32).tobytes())
+
+def scan_sequence(seq_id: str, sequence: Union[str, bytes], win_size: int = 0, step: int = 0, cpg: bool = False,
+                  min_len: int = 200, min_gc: float = 50.0, min_oe: float = 0.6) -> SequenceAnalysis:
+    """
+    Varredura fundida: uma única visão `uint8` normalizada e um único par de máscaras G/C
+    alimentam GC global, janelas (passo padrão = janela) e ilhas CpG.
+    """
+    arr = as_uint8(sequence)
+    n = len(arr)
+    counts = _BaseCounts(arr, cpg)
+    gc = ((int(counts.g[-1]) + int(counts.c[-1])) / n) * 100 if n else 0.0
+    windows = window_array()
+    if win_size > 0:
+        windows = _compact_windows(counts.g + counts.c, win_size, range(0, n-win_size+1, step if step > 0 else win_size))
+    islands = CpGIslandTable(_find_islands(counts, min_len, min_gc, min_oe) if cpg and n >= _SEED_LEN else ())
+    return SequenceAnalysis(seq_id, gc, windows, islands)
+
+def scan_stream(seq_id: str, sequence: Union[str, bytes], win_size: int = 0, step: int = 0, cpg: bool = False,
+                chunk_windows: int = WINDOW_CHUNK, min_len: int = 200, min_gc: float = 50.0,
+                min_oe: float = 0.6) -> Tuple[SequenceAnalysis, Iterator[array]]:
+    """Versão vetorizada de `analysis.scan_stream`: uma visão `uint8` para GC, ilhas e blocos de janelas."""
+    arr = as_uint8(sequence)
+    n = len(arr)
+    gc = (int(np.count_nonzero((arr == _G) | (arr == _C))) / n) * 100 if n else 0.0
+    islands = CpGIslandTable(_find_islands(_BaseCounts(arr), min_len, min_gc, min_oe) if cpg and n >= _SEED_LEN else ())
+    chunks = _window_chunks(arr, win_size, step if step > 0 else win_size, chunk_windows) if win_size > 0 else iter(())
+    return SequenceAnalysis(seq_id, gc, window_array(), islands), chunks
+
+def scan_chunk(chunk: Union[str, bytes], core_len: int, win_size: int = 0, step: int = 0, cpg: bool = False,
+               min_gc: float = 50.0, min_oe: float = 0.6) -> ChunkScan:
+    """Versão vetorizada de `analysis.scan_chunk` (núcleo + sobreposição de um pedaço)."""
+    arr = as_uint8(chunk)
+    n = len(arr)
+    counts = _BaseCounts(arr, cpg)
+    core = min(core_len, n)
+    gc_count = int(counts.g[core]) + int(counts.c[core])
+    windows = window_array()
+    if win_size > 0:
+        windows = _compact_windows(counts.g + counts.c, win_size, range(0, min(core_len, n-win_size+1), step if step > 0 else win_size))
+    seeds = array('q')
+    if cpg and n >= _SEED_LEN:
+        found = counts.screen_seeds(min_gc, min_oe)
+        seeds.frombytes(found[found < core_len].astype(np.int64).tobytes())
+    return ChunkScan(gc_count, windows, seeds)
+
+def detect_cpg_islands(sequence: Union[str, bytes], min_len: int = 200, min_gc: float = 50.0, min_oe: float = 0.6) -> List[CpGIsland]:
+    """
+    Identifica ilhas CpG com o mesmo resultado da varredura de referência.
+    Todas as sementes são triadas em uma passada por contagens cumulativas de G, C e CG,
+    as aprovadas são expandidas em lote e a varredura só visita expansões válidas.
+    """
+    arr = as_uint8(sequence)
+    if len(arr) < _SEED_LEN: return []
+    return _find_islands(_BaseCounts(arr), min_len, min_gc, min_oe)
+
+def _find_islands(counts: "_BaseCounts", min_len: int, min_gc: float, min_oe: float) -> List[CpGIsland]:
+    seeds = counts.screen_seeds(min_gc, min_oe)
+    start, end, valid = counts.expand(seeds, min_len, min_gc, min_oe)
+
+    # A varredura original avança em passos de 10 bp e recomeça no fim de cada ilha,
+    # então a próxima semente é sempre a primeira válida na mesma classe de resíduo.
+    by_residue = []
+    for r in range(_SEED_STEP):
+        keep = valid & (seeds % _SEED_STEP == r)
+        by_residue.append((seeds[keep], start[keep], end[keep]))
+
+    islands = []
+    i = 0
+    while True:
+        pos, isl_start, isl_end = by_residue[i % _SEED_STEP]
+        k = np.searchsorted(pos, i)
+        if k == len(pos): break
+        islands.append(counts.island(int(isl_start[k]), int(isl_end[k])))
+        i = int(isl_end[k])
+    return islands
+
+class _BaseCounts:
+    """Contagens cumulativas de G, C e (opcionalmente) do dinucleotídeo CG de uma sequência."""
+
+    def __init__(self, arr: np.ndarray, cpg: bool = True):
+        is_g, is_c = arr == _G, arr == _C
+        self.n = len(arr)
+        self.g = _prefix(is_g)
+        self.c = _prefix(is_c)
+        if cpg:
+            # cg[k] = nº de dinucleotídeos CG iniciando antes de k
+            self.cg = _prefix(is_c[:-1] & is_g[1:])
+            is_gc = is_g | is_c
+            self.gc_pos = np.flatnonzero(is_gc)
+            self.non_gc_pos = np.flatnonzero(~is_gc)
+
+    def screen_seeds(self, m_gc: float, m_oe: float) -> np.ndarray:
+        """Posições (ordenadas) cujas sementes de 50 bp passam nos critérios de GC e Obs/Exp."""
+        g = self.g[_SEED_LEN:] - self.g[:-_SEED_LEN]
+        c = self.c[_SEED_LEN:] - self.c[:-_SEED_LEN]
+        # ((g + c) / 50) * 100 é monotônico em g + c: o corte vira um limiar inteiro exato
+        min_gc_count = next((k for k in range(_SEED_LEN + 1) if ((k / _SEED_LEN) * 100) >= m_gc), _SEED_LEN + 1)
+        pos = np.flatnonzero(g + c >= min_gc_count)
+        g, c = g[pos].astype(np.int64), c[pos].astype(np.int64)
+        cg = (self.cg[pos + _SEED_LEN - 1] - self.cg[pos]).astype(np.int64)
+        return pos[_oe_ratio(cg * _SEED_LEN, c * g) >= m_oe]
+
+    def expand(self, seeds: np.ndarray, m_len: int, m_gc: float, m_oe: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Expande todas as sementes de uma vez (equivalente a `_expand_and_validate`)."""
+        n = self.n
+        non_gc = np.concatenate(([-1], self.non_gc_pos, [n]))
+        # Fronteiras: último não-G/C antes da semente e primeiro não-G/C após seu fim
+        border_start = non_gc[np.searchsorted(non_gc, seeds) - 1] + 1
+        border_end = non_gc[np.searchsorted(non_gc, seeds + _SEED_LEN)]
+
+        gc_pos = np.concatenate(([-1], self.gc_pos, [n]))
+        first_gc = gc_pos[np.searchsorted(gc_pos, border_start)]
+        last_gc = gc_pos[np.searchsorted(gc_pos, border_end) - 1]
+        has_gc = first_gc < border_end
+        start = np.where(has_gc, first_gc, 0)
+        end = np.where(has_gc, last_gc + 1, 1)
+
+        f_len = end - start
+        g = (self.g[end] - self.g[start]).astype(np.int64)
+        c = (self.c[end] - self.c[start]).astype(np.int64)
+        cg = (self.cg[end - 1] - self.cg[start]).astype(np.int64)
+        # Exato enquanto cg * f_len < 2**53 (ilhas de até ~100 Mb)
+        gc = ((g + c) / f_len) * 100
+        valid = has_gc & (f_len >= m_len) & (gc >= m_gc) & (_oe_ratio(cg * f_len, c * g) >= m_oe)
+        return start, end, valid
+
+    def island(self, start: int, end: int) -> CpGIsland:
+        """Métricas finais de uma ilha calculadas com inteiros Python, como na referência."""
+        f_len = end - start
+        g = int(self.g[end] - self.g[start])
+        c = int(self.c[end] - self.c[start])
+        cg = int(self.cg[end - 1] - self.cg[start])
+        gc = ((g + c) / f_len) * 100
+        oe = (cg * f_len) / (c * g) if (c * g) > 0 else 0
+        return CpGIsland(start, end, gc, oe)
+
+def _oe_ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """Razão Obs/Exp vetorizada, zero quando não há C ou G."""
+    return np.divide(num, den, out=np.zeros(len(num)), where=den > 0)
+
+def _prefix(mask: np.ndarray) -> np.ndarray:
+    """Soma cumulativa com zero inicial: out[i] = nº de verdadeiros em mask[:i]."""
+    # int32 basta para qualquer cromossomo real e reduz pela metade o tráfego de memória
+    out = np.zeros(len(mask) + 1, dtype=np.int32 if len(mask) < 2**31 else np.int64)
+    np.cumsum(mask, out=out[1:])
+    return out
@@ -0,0 +1,40 @@
+"""
+Divisão de sequências muito longas em pedaços sobrepostos e costura dos resultados parciais.
+O resultado costurado é idêntico ao de uma varredura serial da sequência inteira.
+"""
+
+from typing import List, Sequence, Tuple
+from src.domain.analysis import _SEED_LEN, islands_from_seeds
+from src.domain.models import ChunkScan, CpGIslandTable, SequenceAnalysis, window_array
+
+def plan_chunks(length: int, chunk_size: int, win_size: int = 0, step: int = 0, cpg: bool = False) -> List[Tuple[int, int, int]]:
+    """
+    Retorna (início do núcleo, fim do núcleo, fim da leitura) para cada pedaço.
+    O núcleo é múltiplo do passo para manter a grade das janelas; a leitura avança
+    o suficiente para cobrir a última janela e a última semente CpG do núcleo.
+    """
+    if length <= 0: return []
+    step = step if step > 0 else win_size
+    core = max(1, chunk_size)
+    if win_size > 0:
+        core = max(step, core - core % step)
+    overlap = max(win_size - 1 if win_size > 0 else 0, _SEED_LEN - 1 if cpg else 0)
+    return [(s, min(s + core, length), min(s + core + overlap, length)) for s in range(0, length, core)]
+
+def merge_chunk_scans(seq_id: str, length: int, parts: Sequence[Tuple[int, ChunkScan]], sequence: str = "",
+                      cpg: bool = False, min_len: int = 200, min_gc: float = 50.0, min_oe: float = 0.6) -> SequenceAnalysis:
+    """
+    Costura os pedaços (offset, ChunkScan) em ordem: soma as contagens de GC, concatena as
+    janelas e refaz a varredura de ilhas sobre as sementes aprovadas, em coordenadas globais.
+    Ilhas que cruzam fronteiras são expandidas sobre a sequência completa (só exigida com `cpg`).
+    """
+    gc_count = sum(part.gc_count for _, part in parts)
+    gc = (gc_count / length) * 100 if length else 0.0
+    windows = window_array()
+    for _, part in parts:
+        windows.extend(part.sliding_window)
+    islands = CpGIslandTable()
+    if cpg:
+        seeds = [offset + p for offset, part in parts for p in part.cpg_seeds]
+        islands = CpGIslandTable(islands_from_seeds(str(sequence).upper(), seeds, min_len, min_gc, min_oe))
+    return SequenceAnalysis(seq_id, gc, windows, islands)
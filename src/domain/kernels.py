@@ -0,0 +1,38 @@
+"""
+Registro de kernels de análise intercambiáveis.
+O kernel "python" é a implementação de referência; "numpy" é a versão vetorizada.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Tuple
+from src.domain.models import ChunkScan, CpGIsland, SequenceAnalysis
+
+DEFAULT_KERNEL = "python"
+KERNEL_NAMES = ("python", "numpy")
+
+@dataclass(frozen=True)
+class AnalysisKernel:
+    name: str
+    gc_percentage: Callable[[str], float]
+    sliding_window: Callable[[str, int, int], List[float]]
+    cpg_islands: Callable[..., List[CpGIsland]]
+    scan: Callable[..., SequenceAnalysis]
+    scan_chunk: Callable[..., ChunkScan]
+    window_chunks: Callable[..., Iterator[array]]
+    scan_stream: Callable[..., Tuple[SequenceAnalysis, Iterator[array]]]
+    version: str = ""
+
+def get_kernel(name: str = DEFAULT_KERNEL) -> AnalysisKernel:
+    """Resolve o kernel pelo nome (import tardio para não exigir NumPy no kernel de referência)."""
+    if name == "python":
+        from src.domain import analysis as impl
+    elif name == "numpy":
+        from src.domain import analysis_numpy as impl
+    else:
+        raise ValueError(f"Kernel desconhecido: '{name}'. Opções: {', '.join(KERNEL_NAMES)}.")
+    return AnalysisKernel(
+        name, impl.calculate_gc_percentage, impl.calculate_sliding_window, impl.detect_cpg_islands,
+        impl.scan_sequence, impl.scan_chunk, impl.iter_window_chunks, impl.scan_stream,
+        impl.KERNEL_VERSION
+    )
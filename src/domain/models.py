@@ -1,19 +1,89 @@
+from array import array
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from typing import Iterable, Iterator, Union
 
-@dataclass(frozen=True)
+# Janelas em float32: 4 bytes por valor, contra ~32 de um float Python dentro de uma lista
+WINDOW_TYPECODE = 'f'
+
+def window_array(values: Union[Iterable[float], bytes] = ()) -> array:
+    """Cria o buffer compacto de janelas (aceita valores ou bytes float32 nativos)."""
+    return array(WINDOW_TYPECODE, values)
+
+@dataclass(frozen=True, slots=True)
 class CpGIsland:
     start: int
     end: int
     gc_percent: float
     oe_ratio: float
 
-@dataclass(frozen=True)
+class CpGIslandTable:
+    """
+    Ilhas CpG em colunas (struct-of-arrays): início/fim em int64 e métricas em float64.
+    Itera, indexa e compara como uma lista de `CpGIsland`, criando os objetos sob demanda.
+    """
+    __slots__ = ("starts", "ends", "gc_percents", "oe_ratios")
+
+    def __init__(self, islands: Iterable[CpGIsland] = ()):
+        self.starts, self.ends = array('q'), array('q')
+        self.gc_percents, self.oe_ratios = array('d'), array('d')
+        for island in islands:
+            self.append(island)
+
+    def append(self, island: CpGIsland):
+        self.starts.append(island.start)
+        self.ends.append(island.end)
+        self.gc_percents.append(island.gc_percent)
+        self.oe_ratios.append(island.oe_ratio)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[CpGIsland]:
+        return map(CpGIsland, self.starts, self.ends, self.gc_percents, self.oe_ratios)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CpGIslandTable(list(self)[index])
+        return CpGIsland(self.starts[index], self.ends[index], self.gc_percents[index], self.oe_ratios[index])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (CpGIslandTable, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __getstate__(self):
+        return self.starts, self.ends, self.gc_percents, self.oe_ratios
+
+    def __setstate__(self, state):
+        self.starts, self.ends, self.gc_percents, self.oe_ratios = state
+
+    def __repr__(self) -> str:
+        return f"CpGIslandTable({list(self)!r})"
+
+@dataclass(frozen=True, slots=True)
 class SequenceAnalysis:
     id: str
     gc_percent: float
-    sliding_window: List[float]
-    cpg_islands: List[CpGIsland]
+    sliding_window: array
+    cpg_islands: CpGIslandTable
+
+@dataclass(frozen=True, slots=True)
+class ChunkScan:
+    """Resultado parcial de um pedaço de sequência longa (núcleo sem a sobreposição)."""
+    gc_count: int
+    sliding_window: array
+    cpg_seeds: array
+
+@dataclass(frozen=True, slots=True)
+class RegionStats:
+    """Métricas de uma região [start, end) de uma sequência (coordenadas 0-based)."""
+    seq_id: str
+    start: int
+    end: int
+    gc_percent: float
+    oe_ratio: float
+    n_count: int
+    sliding_window: array
 
 @dataclass(frozen=True)
 class AnalysisSummary:
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Dict, Iterable, List
 import math
 
 def calculate_descriptive_stats(data: List[float]) -> Dict[str, float]:
@@ -32,3 +32,126 @@ def _calculate_std_dev(data: List[float], n: int) -> float:
     mean = sum(data) / n
     variance = sum((x - mean) ** 2 for x in data) / n
     return math.sqrt(variance)
+
+class StreamingStats:
+    """
+    Acumulador online e combinável de estatísticas descritivas.
+    Média e variância por Welford (memória O(1)); mediana e quantis por um sketch de
+    compactadores com `capacity` itens por nível (exato enquanto count <= capacity).
+    """
+    __slots__ = ("count", "mean", "min", "max", "_m2", "_capacity", "_levels", "_flips")
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._m2 = 0.0
+        self._capacity = capacity
+        self._levels: List[List[float]] = [[]]
+        self._flips: List[int] = [0]
+
+    def update(self, value: float) -> None:
+        """Incorpora um valor (Welford)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+        self._levels[0].append(value)
+        if len(self._levels[0]) > self._capacity: self._compact(0)
+
+    def extend(self, values: Iterable[float]) -> "StreamingStats":
+        """Incorpora uma sequência de valores sem materializá-la."""
+        for value in values:
+            self.update(value)
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Combina outro acumulador (de outro worker ou arquivo) neste, sem reler dados."""
+        if other.count == 0: return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for h, items in enumerate(other._levels):
+            self._ensure_level(h)
+            self._levels[h].extend(items)
+        h = 0
+        while h < len(self._levels):
+            if len(self._levels[h]) > self._capacity: self._compact(h)
+            h += 1
+        return self
+
+    @property
+    def std_dev(self) -> float:
+        """Desvio padrão populacional."""
+        return math.sqrt(max(self._m2, 0.0) / self.count) if self.count else 0.0
+
+    @property
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def quantile(self, q: float) -> float:
+        """Quantil q (0..1): exato sem compactação, aproximado (erro de posto limitado) depois."""
+        if self.count == 0: return math.nan
+        if len(self._levels) == 1:
+            data = sorted(self._levels[0])
+            if q == 0.5: return _calculate_median(data, self.count)
+            return data[min(int(q * self.count), self.count - 1)]
+        weighted = sorted((v, 1 << h) for h, level in enumerate(self._levels) for v in level)
+        target = q * self.count
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target: return value
+        return weighted[-1][0]
+
+    def to_dict(self) -> Dict[str, float]:
+        """Mesmo formato de `calculate_descriptive_stats`."""
+        if self.count == 0: return {}
+        return {
+            "mean": self.mean,
+            "median": self.median,
+            "std_dev": self.std_dev,
+            "min": self.min,
+            "max": self.max,
+            "count": float(self.count)
+        }
+
+    def to_state(self) -> Dict:
+        """Estado completo em tipos simples (para persistir e retomar sem reler dados)."""
+        return {
+            "count": self.count, "mean": self.mean, "min": self.min, "max": self.max, "m2": self._m2,
+            "capacity": self._capacity, "levels": [list(level) for level in self._levels], "flips": list(self._flips),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "StreamingStats":
+        stats = cls(state["capacity"])
+        stats.count, stats.mean, stats.min, stats.max = state["count"], state["mean"], state["min"], state["max"]
+        stats._m2 = state["m2"]
+        stats._levels = [list(level) for level in state["levels"]]
+        stats._flips = list(state["flips"])
+        return stats
+
+    def _ensure_level(self, h: int) -> None:
+        while len(self._levels) <= h:
+            self._levels.append([])
+            self._flips.append(0)
+
+    def _compact(self, h: int) -> None:
+        """Ordena o nível h e promove metade dos itens (peso dobrado) ao nível h+1."""
+        self._ensure_level(h + 1)
+        items = sorted(self._levels[h])
+        leftover = [items.pop()] if len(items) % 2 else []
+        # Alterna o deslocamento para não enviesar o sketch para cima ou para baixo
+        offset = self._flips[h]
+        self._flips[h] ^= 1
+        self._levels[h + 1].extend(items[offset::2])
+        self._levels[h] = leftover
+        if len(self._levels[h + 1]) > self._capacity: self._compact(h + 1)
@@ -0,0 +1,35 @@
+"""
+Subcomandos de índice: `index` grava o sidecar `.gci` e `query` responde regiões a partir dele.
+"""
+
+from src.domain.analysis import gc_and_oe_from_counts
+from src.domain.kernels import DEFAULT_KERNEL, get_kernel
+from src.domain.models import RegionStats, window_array
+from src.infrastructure.cli.formatter import print_region_stats
+from src.infrastructure.io.faidx import parse_region
+from src.infrastructure.io.gcindex import GCIndex, write_gc_index
+
+def run_index(args):
+    for fasta_path in args.fasta:
+        print(f"Índice gravado: {write_gc_index(fasta_path, interval=args.interval)}")
+
+def run_query(args):
+    stats = query_region(args.fasta, args.region, args.window or 0, args.step or 0, args.kernel)
+    print_region_stats(stats, args.window or 0, args.step or 0)
+
+def query_region(fasta_path: str, region: str, window: int = 0, step: int = 0, kernel_name: str = DEFAULT_KERNEL) -> RegionStats:
+    """
+    GC%, razão Obs/Exp de CpG e N da região (formato samtools, 1-based) a partir do índice.
+    Com `window`, calcula também as janelas da região lendo só as bases dela.
+    """
+    with GCIndex(fasta_path) as index:
+        seq_id, start, end = parse_region(region, index.sequences)
+        end = index.length(seq_id) if end is None else min(end, index.length(seq_id))
+        start = min(start or 0, end)
+        g, c, cg, n = index.counts(seq_id, start, end)
+        windows = window_array()
+        if window > 0:
+            for chunk in get_kernel(kernel_name).window_chunks(index.fasta.fetch(seq_id, start, end), window, step):
+                windows.extend(chunk)
+    gc, oe = gc_and_oe_from_counts(g, c, cg, end - start)
+    return RegionStats(seq_id, start, end, gc, oe, n, windows)
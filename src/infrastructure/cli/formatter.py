@@ -1,5 +1,5 @@
 from typing import Dict, List
-from src.domain.models import CpGIsland
+from src.domain.models import CpGIsland, RegionStats
 
 def print_header(file_count: int):
     print("=" * 60)
@@ -13,6 +13,10 @@ def print_stats(stats: Dict[str, float]):
     print(f"  > Sequências: {stats['count']}")
     print(f"  > Média GC:   {stats['mean']:.2f}% (± {stats['std_dev']:.2f})")
 
+def print_run_summary(stats: Dict[str, float]):
+    print(f"\nResumo geral: {int(stats['count'])} sequências")
+    print(f"  > Média GC:   {stats['mean']:.2f}% (± {stats['std_dev']:.2f}), mediana ≈ {stats['median']:.2f}%")
+
 def print_sliding_window_info(seq_id: str, count: int):
     print(f"    > Janela Deslizante ({seq_id}): {count} janelas calculadas.")
 
@@ -24,6 +28,27 @@ def print_cpg_islands(seq_id: str, islands: List[CpGIsland]):
     else:
         print(f"    > Ilhas CpG ({seq_id}): Nenhuma encontrada.")
 
+def print_cache_hit(output_count: int):
+    print(f"  > Inalterado desde a última execução: resultados em cache ({output_count} arquivo(s) de saída mantidos).")
+
+def print_cache_summary(hits: int, misses: int):
+    print(f"\nCache de resultados: {hits} acerto(s), {misses} arquivo(s) recalculado(s).")
+
+def print_memo_summary(hits: int, misses: int, entries: int):
+    print(f"\nMemo de registros: {hits} acerto(s), {misses} falha(s), {entries} registro(s) em memória.")
+
 def print_footer():
     print("\n" + "=" * 60)
     print("Processamento concluído com sucesso!")
+
+def print_region_stats(stats: RegionStats, window: int = 0, step: int = 0):
+    print(f"{stats.seq_id}:{stats.start + 1:,}-{stats.end:,} ({stats.end - stats.start:,} bp)")
+    print(f"  > GC:       {stats.gc_percent:.2f}%")
+    print(f"  > CpG O/E:  {stats.oe_ratio:.2f}")
+    print(f"  > Bases N:  {stats.n_count}")
+    if window:
+        step = step if step > 0 else window
+        print(f"  > Janelas ({window} bp, passo {step}): {len(stats.sliding_window)}")
+        for k, value in enumerate(stats.sliding_window):
+            begin = stats.start + k * step
+            print(f"    {begin}\t{begin + window}\t{value:.2f}")
@@ -1,4 +1,24 @@
 import argparse
+from src.domain.kernels import DEFAULT_KERNEL, KERNEL_NAMES
+from src.infrastructure.io.gcindex import DEFAULT_INTERVAL
+from src.infrastructure.parallel.dispatcher import DEFAULT_CHUNK_SIZE, DEFAULT_EXECUTOR, EXECUTOR_KINDS
+
+COMMANDS = ("index", "query")
+
+_SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+def parse_size(value: str) -> int:
+    """Converte tamanhos como '512M', '16G' ou '1048576' (bytes) em bytes."""
+    text = value.strip().upper().removesuffix("B")
+    factor = _SIZE_UNITS.get(text[-1:], 1)
+    number = text[:-1] if text[-1:] in _SIZE_UNITS else text
+    try:
+        size = int(float(number) * factor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tamanho inválido: '{value}' (ex.: 512M, 16G).") from None
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"Tamanho inválido: '{value}' (deve ser positivo).")
+    return size
 
 def parse_args():
     """Define e processa argumentos da linha de comando."""
@@ -12,4 +32,34 @@ def parse_args():
     parser.add_argument("--cpg", action="store_true", help="Ativar ilhas CpG.")
     parser.add_argument("--parallel", action="store_true", help="Ativar processamento Multicore (Multiprocessing).")
     parser.add_argument("--workers", type=int, default=None, help="Número de workers paralelos (default: CPU Count).")
+    parser.add_argument("--executor", choices=EXECUTOR_KINDS, default=DEFAULT_EXECUTOR, help="Backend do modo --parallel: processos, threads ou auto (escolhe pelo kernel e pelo perfil da entrada).")
+    parser.add_argument("--file-jobs", type=int, default=None, help="Arquivos analisados simultaneamente em diretórios no modo --parallel (default: nº de workers).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Divide registros maiores que isso (bp) entre os workers no modo --parallel (0 desativa).")
+    parser.add_argument("--worker-parsing", action="store_true", help="No modo --parallel, cada worker lê a própria faixa do arquivo (FASTA não comprimido).")
+    parser.add_argument("--max-memory", type=parse_size, default=None, help="Limite aproximado de dados em voo no modo --parallel (ex.: 4G); a leitura espera os workers.")
+    parser.add_argument("--zoom-track", action="store_true", help="Com --window, grava também uma trilha binária .gcz com níveis de zoom (média/mín/máx) para leitura rápida de qualquer região.")
+    parser.add_argument("--parquet", action="store_true", help="Exporta também GC por sequência, janelas e ilhas CpG em Parquet (colunar, comprimido).")
+    parser.add_argument("--memo-size", type=parse_size, default=None, help="Memoiza registros idênticos (hash da sequência + parâmetros) em um LRU com esse orçamento de memória (ex.: 256M).")
+    parser.add_argument("--cache-dir", default=None, help="Ativa o cache de resultados por arquivo (hash + parâmetros): arquivos inalterados são pulados em novas execuções.")
+    parser.add_argument("--cache-max-size", type=parse_size, default=None, help="Tamanho máximo do cache (ex.: 512M); as entradas menos usadas são removidas.")
+    parser.add_argument("--clear-cache", action="store_true", help="Invalida o cache antes da execução (recalcula tudo).")
+    parser.add_argument("--kernel", choices=KERNEL_NAMES, default=DEFAULT_KERNEL, help="Backend de cálculo (python: referência, numpy: vetorizado).")
     return parser.parse_args()
+
+
+def parse_command_args(argv=None):
+    """Subcomandos `index` e `query` (consultas de região sobre o índice persistente)."""
+    parser = argparse.ArgumentParser(prog="main.py", description="GCScan - Índice de GC e consultas por região")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    index = commands.add_parser("index", help="Grava o índice <fasta>.gci com contagens cumulativas de G/C/CG/N.")
+    index.add_argument("fasta", nargs="+", help="Arquivo(s) FASTA não comprimido(s).")
+    index.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help="Bases entre pontos do índice (menor = consultas mais rápidas, índice maior).")
+
+    query = commands.add_parser("query", help="GC%%, Obs/Exp de CpG e janelas de uma região, via índice.")
+    query.add_argument("fasta", help="Arquivo FASTA indexado.")
+    query.add_argument("region", help="Região no formato samtools: chr, chr:início ou chr:início-fim (1-based).")
+    query.add_argument("--window", "-w", type=int, help="Tamanho da janela (lista as janelas da região).")
+    query.add_argument("--step", "-s", type=int, help="Tamanho do passo.")
+    query.add_argument("--kernel", choices=KERNEL_NAMES, default=DEFAULT_KERNEL, help="Backend de cálculo das janelas.")
+    return parser.parse_args(argv)
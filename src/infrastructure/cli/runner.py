@@ -1,17 +1,27 @@
+import concurrent.futures
+import contextlib
 import os
 import sys
-from src.infrastructure.io.fasta import read_fasta
-from src.infrastructure.io.exporters import save_results_to_csv
+from typing import Dict
+from src.infrastructure.io.fasta import read_fasta, is_fasta_path, fasta_base_name
+from src.infrastructure.io.exporters import WindowTrackWriter, save_results_to_csv
+from src.infrastructure.io.zoomtrack import ZoomTrackWriter
+from src.infrastructure.io.cache import ResultCache
 from src.infrastructure.plotting.adapters import plot_gc_distribution
 from src.infrastructure.cli.formatter import (
     print_header, print_file_start, print_stats, 
-    print_sliding_window_info, print_cpg_islands, print_footer
+    print_sliding_window_info, print_cpg_islands, print_run_summary, print_footer,
+    print_cache_hit, print_cache_summary, print_memo_summary
 )
-from src.domain.analysis import (
-    calculate_gc_percentage, calculate_sliding_window, detect_cpg_islands
+from src.domain.analysis import CPG_THRESHOLDS
+from src.domain.kernels import DEFAULT_KERNEL, get_kernel
+from src.domain.statistics import StreamingStats, calculate_descriptive_stats
+from src.domain.models import window_array
+from src.infrastructure.parallel.dispatcher import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_EXECUTOR, create_worker_pool, iter_fasta_parallel, resolve_executor
 )
-from src.domain.statistics import calculate_descriptive_stats
-from src.infrastructure.parallel.dispatcher import process_fasta_parallel
+from src.infrastructure.parallel.memo import SequenceMemo
+from src.infrastructure.parallel.shared import window_count
 
 def run_analysis(args):
     """Orquestra a análise para os arquivos fornecidos."""
@@ -23,63 +33,264 @@ def run_analysis(args):
     print_header(len(files))
     _ensure_dir(args.output_dir)
 
-    for fasta_file in files:
-        _process_single_file(fasta_file, args)
+    cache = _open_cache(args)
+    memo_size = getattr(args, 'memo_size', None)
+    memo = SequenceMemo(memo_size) if memo_size else None
+    # Acumuladores por arquivo combinados sem reler os dados
+    run_stats = StreamingStats()
+    if getattr(args, 'parallel', False) and len(files) > 1:
+        _run_files_concurrently(files, args, run_stats, cache, memo)
+    else:
+        for fasta_file in files:
+            run_stats.merge(_process_single_file(fasta_file, args, cache, memo))
 
+    if len(files) > 1 and run_stats.count:
+        print_run_summary(run_stats.to_dict())
+    if cache is not None:
+        print_cache_summary(cache.hits, cache.misses)
+    if memo is not None:
+        print_memo_summary(memo.hits, memo.misses, len(memo))
     print_footer()
 
+def _open_cache(args):
+    """Cache de resultados por arquivo (ativo com --cache-dir); --clear-cache invalida antes da execução."""
+    cache_dir = getattr(args, 'cache_dir', None)
+    if not cache_dir:
+        return None
+    cache = ResultCache(cache_dir, getattr(args, 'cache_max_size', None))
+    if getattr(args, 'clear_cache', False):
+        cache.clear()
+    return cache
+
+def _cache_key(cache: ResultCache, file_path: str, args) -> str:
+    """Hash do arquivo + tudo que altera as saídas (parâmetros, kernel e versão, formatos, destino)."""
+    kernel = get_kernel(getattr(args, 'kernel', DEFAULT_KERNEL))
+    return cache.key(file_path, {
+        "window": args.window or 0, "step": args.step or 0, "cpg": bool(args.cpg),
+        "cpg_thresholds": CPG_THRESHOLDS, "kernel": kernel.name, "kernel_version": kernel.version,
+        "parquet": bool(getattr(args, 'parquet', False)), "zoom_track": bool(getattr(args, 'zoom_track', False)),
+        "output_dir": os.path.abspath(args.output_dir),
+    })
+
+def _replay_cached(entry: dict) -> StreamingStats:
+    """Reaproveita um arquivo inalterado: nada é recalculado nem regravado, só o resumo volta."""
+    print_cache_hit(len(entry["outputs"]))
+    file_stats = StreamingStats.from_state(entry["stats"])
+    if file_stats.count:
+        print_stats(entry["summary"])
+    return file_stats
+
+def _run_files_concurrently(files, args, run_stats: StreamingStats, cache=None, memo=None):
+    """
+    Diretórios no modo paralelo: um único pool aquecido atende a execução inteira,
+    vários arquivos são despachados ao mesmo tempo e CSV/PNG são gerados nos workers.
+    A saída no terminal continua na ordem dos arquivos; arquivos em cache não são despachados.
+    """
+    workers = getattr(args, 'workers', None) or os.cpu_count() or 1
+    file_jobs = getattr(args, 'file_jobs', None) or min(len(files), workers)
+    kernel_name = getattr(args, 'kernel', DEFAULT_KERNEL)
+    kind = resolve_executor(getattr(args, 'executor', DEFAULT_EXECUTOR), kernel_name, files)
+    with create_worker_pool(workers, kernel_name, kind) as pool, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=file_jobs) as scheduler:
+        keys = [_cache_key(cache, f, args) if cache is not None else None for f in files]
+        cached = [cache.get(key) if cache is not None else None for key in keys]
+        analyses = [None if entry else scheduler.submit(_analyze_with_details, f, args, pool, memo)
+                    for f, entry in zip(files, cached)]
+        exports, entries = [], []
+        for file_path, key, entry, analysis in zip(files, keys, cached, analyses):
+            base_name = fasta_base_name(file_path)
+            print_file_start(base_name)
+            if analysis is None:
+                run_stats.merge(_replay_cached(entry))
+                continue
+            results, details, outputs = analysis.result()
+            for detail in details:
+                _print_record(*detail, args)
+            summary, file_stats = _summarize(results)
+            if results and kind == "threads":
+                # pyplot não é thread-safe: com threads os gráficos saem no processo principal
+                _export_file_results(results, summary, args.output_dir, base_name)
+            elif results:
+                exports.append(pool.submit(_export_file_results, results, summary, args.output_dir, base_name))
+            if results:
+                outputs += _export_paths(args.output_dir, base_name)
+            entries.append((key, _cache_entry(file_stats, summary, outputs)))
+            run_stats.merge(file_stats)
+        for export in exports:
+            export.result()
+    if cache is not None:
+        for key, entry in entries:
+            cache.put(key, entry)
+
+def _cache_entry(file_stats: StreamingStats, summary: dict, outputs) -> dict:
+    return {"stats": file_stats.to_state(), "summary": summary, "outputs": list(outputs)}
+
 def _identify_files(input_path: str):
     if os.path.isfile(input_path): return [input_path]
     if os.path.isdir(input_path):
         return [os.path.join(input_path, f) for f in os.listdir(input_path)
-                if f.lower().endswith(('.fasta', '.fa', '.fna'))]
+                if is_fasta_path(f)]
     return []
 
 def _ensure_dir(path: str):
     if not os.path.exists(path):
         os.makedirs(path)
 
-def _process_single_file(file_path: str, args):
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
+def _analyze_parallel(file_path: str, args, on_record, executor=None, outputs=None, memo=None) -> Dict[str, float]:
+    """
+    Consome os resultados em fluxo: só o GC de cada registro fica retido (para CSV/gráfico);
+    janelas e ilhas vão para as saídas em disco, são resumidas em `on_record` e descartadas.
+    """
+    window = args.window if args.window else 0
+    step = args.step if args.step else 0
+    records = iter_fasta_parallel(
+        file_path, window, step, args.cpg, getattr(args, 'workers', None), getattr(args, 'kernel', DEFAULT_KERNEL),
+        getattr(args, 'chunk_size', DEFAULT_CHUNK_SIZE), getattr(args, 'worker_parsing', False), executor,
+        getattr(args, 'max_memory', None), getattr(args, 'executor', DEFAULT_EXECUTOR), memo
+    )
+    results = {}
+    for seq_id, gc, islands, windows in records:
+        results[seq_id] = gc
+        if outputs is not None:
+            outputs.write_record(seq_id, gc, islands, [windows])
+        on_record(seq_id, islands, len(windows))
+    return results
+
+def _analyze_with_details(file_path: str, args, executor, memo=None):
+    """Variante para arquivos concorrentes: guarda apenas o resumo de cada registro para impressão ordenada."""
+    details = []
+    with _FileOutputs(args, fasta_base_name(file_path)) as outputs:
+        results = _analyze_parallel(file_path, args, lambda *detail: details.append(detail), executor, outputs, memo)
+    return results, details, outputs.paths()
+
+class _FileOutputs:
+    """
+    Saídas por registro de um arquivo, gravadas à medida que os resultados chegam:
+    trilha bedGraph (com --window), trilha binária com zoom (com --zoom-track) e tabelas
+    Parquet (com --parquet).
+    """
+
+    def __init__(self, args, base_name: str):
+        self.window, self.step, self.cpg = args.window or 0, args.step or 0, args.cpg
+        self._stack = contextlib.ExitStack()
+        self.track = self.zoom = self.parquet = None
+        if self.window:
+            self.track = self._stack.enter_context(
+                WindowTrackWriter(os.path.join(args.output_dir, f"{base_name}_windows.bedgraph")))
+        if self.window and getattr(args, 'zoom_track', False):
+            self.zoom = self._stack.enter_context(
+                ZoomTrackWriter(os.path.join(args.output_dir, f"{base_name}_windows.gcz")))
+        if getattr(args, 'parquet', False):
+            from src.infrastructure.io.parquet import ParquetResultWriter
+            self.parquet = self._stack.enter_context(ParquetResultWriter(args.output_dir, base_name))
+        self._window_sinks = [sink for sink in (self.track, self.zoom, self.parquet) if sink is not None and self.window]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+
+    def paths(self):
+        """Arquivos efetivamente gravados (tabelas Parquet sem dados não são criadas)."""
+        paths = [sink.path for sink in (self.track, self.zoom) if sink is not None]
+        return paths + (self.parquet.paths() if self.parquet is not None else [])
+
+    def write_record(self, seq_id: str, gc: float, islands, window_chunks) -> int:
+        """
+        Repassa cada bloco de janelas a todas as saídas; retorna o total de janelas.
+        Os blocos são sempre consumidos até o fim, mesmo sem saída de janelas (ver `_remember`).
+        """
+        if self.parquet is not None:
+            self.parquet.write_sequence(seq_id, gc)
+            if self.cpg:
+                self.parquet.write_islands(seq_id, islands)
+        written = 0
+        for chunk in window_chunks:
+            for sink in self._window_sinks:
+                sink.write_chunk(seq_id, written, chunk, self.window, self.step)
+            written += len(chunk)
+        return written
+
+def _print_record(seq_id: str, islands, window_count: int, args):
+    if args.window:
+        print_sliding_window_info(seq_id, window_count)
+    if args.cpg:
+        print_cpg_islands(seq_id, islands)
+
+def _summarize(results):
+    """
+    Estatísticas exatas do arquivo (os resultados já estão em memória) para exibir e plotar,
+    e o acumulador combinável usado só no resumo geral entre arquivos.
+    """
+    summary = calculate_descriptive_stats(list(results.values()))
+    if results:
+        print_stats(summary)
+    return summary, StreamingStats().extend(results.values())
+
+def _export_paths(output_dir: str, base_name: str):
+    return [os.path.join(output_dir, f"{base_name}_gc.csv"), os.path.join(output_dir, f"{base_name}_gc_analysis.png")]
+
+def _export_file_results(results, stats, output_dir: str, base_name: str):
+    """Pós-processamento de um arquivo (CSV + gráfico); pode rodar em um worker."""
+    csv_path, png_path = _export_paths(output_dir, base_name)
+    save_results_to_csv(results, csv_path)
+    
+    plot_gc_distribution(results, stats, png_path)
+
+def _remember(memo: SequenceMemo, key, gc: float, islands, chunks, n_windows: int):
+    """Repassa os blocos de janelas e guarda o registro no memo ao final, se couber no orçamento."""
+    if not memo.fits(n_windows):
+        yield from chunks
+        return
+    windows = window_array()
+    for chunk in chunks:
+        windows.extend(chunk)
+        yield chunk
+    memo.put(key, gc, islands, windows)
+
+def _process_single_file(file_path: str, args, cache=None, memo=None) -> StreamingStats:
+    base_name = fasta_base_name(file_path)
     print_file_start(base_name)
+
+    cache_key = _cache_key(cache, file_path, args) if cache is not None else None
+    entry = cache.get(cache_key) if cache is not None else None
+    if entry is not None:
+        return _replay_cached(entry)
     
     results = {}
+    kernel_name = getattr(args, 'kernel', DEFAULT_KERNEL)
     
     if getattr(args, 'parallel', False):
-        window = args.window if args.window else 0
-        step = args.step if args.step else 0
-        workers = getattr(args, 'workers', None)
-        
-        results, all_islands, all_windows = process_fasta_parallel(
-            file_path, window, step, args.cpg, workers
-        )
-        
-        for seq_id in results:
-            if args.window and seq_id in all_windows:
-                print_sliding_window_info(seq_id, len(all_windows[seq_id]))
-            if args.cpg and seq_id in all_islands:
-                print_cpg_islands(seq_id, all_islands[seq_id])
+        with _FileOutputs(args, base_name) as outputs:
+            results = _analyze_parallel(file_path, args, lambda *detail: _print_record(*detail, args), outputs=outputs, memo=memo)
                 
     else:
-        for seq_id, sequence in read_fasta(file_path):
-            gc = calculate_gc_percentage(sequence)
-            results[seq_id] = gc
-            
-            if args.window:
-                step = args.step if args.step else args.window
-                sw = calculate_sliding_window(sequence, args.window, step)
-                print_sliding_window_info(seq_id, len(sw))
-                
-            if args.cpg:
-                islands = detect_cpg_islands(sequence)
-                print_cpg_islands(seq_id, islands)
+        kernel = get_kernel(kernel_name)
+        with _FileOutputs(args, base_name) as outputs:
+            for seq_id, sequence in read_fasta(file_path):
+                key = memo.key(sequence, args.window or 0, args.step or 0, args.cpg, kernel_name) if memo is not None else None
+                cached = memo.get(key) if key is not None else None
+                if cached is not None:
+                    gc, islands, windows = cached
+                    chunks = [windows] if args.window else ()
+                else:
+                    # Uma normalização: GC e ilhas agora, janelas em blocos gravados direto no disco
+                    analysis, chunks = kernel.scan_stream(seq_id, sequence, args.window or 0, args.step or 0, args.cpg)
+                    gc, islands = analysis.gc_percent, analysis.cpg_islands
+                    if key is not None:
+                        chunks = _remember(memo, key, gc, islands, chunks,
+                                           window_count(len(sequence), args.window or 0, args.step or 0))
+                results[seq_id] = gc
+                written = outputs.write_record(seq_id, gc, islands, chunks)
+                _print_record(seq_id, islands, written, args)
 
+    summary, file_stats = _summarize(results)
+    paths = outputs.paths()
     if results:
-        stats = calculate_descriptive_stats(list(results.values()))
-        print_stats(stats)
-        
-        csv_path = os.path.join(args.output_dir, f"{base_name}_gc.csv")
-        save_results_to_csv(results, csv_path)
-        
-        png_path = os.path.join(args.output_dir, f"{base_name}_gc_analysis.png")
-        plot_gc_distribution(results, stats, png_path)
+        _export_file_results(results, summary, args.output_dir, base_name)
+        paths += _export_paths(args.output_dir, base_name)
+    if cache is not None:
+        cache.put(cache_key, _cache_entry(file_stats, summary, paths))
+
+    return file_stats
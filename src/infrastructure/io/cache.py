@@ -0,0 +1,132 @@
+"""
+Cache de resultados por conteúdo para re-execuções sobre diretórios.
+A chave combina o SHA-256 do arquivo com os parâmetros da análise (janela, passo, CpG,
+kernel e versão); cada entrada é um JSON pequeno com o resumo estatístico do arquivo e
+as saídas já gravadas (com tamanho e mtime, para detectar sobrescritas). Entradas menos
+usadas são removidas acima do limite de tamanho.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+_ENTRY_SUFFIX = ".json"
+_DIGESTS_FILE = "digests.json"
+_HASH_BLOCK = 1 << 20
+
+class ResultCache:
+    """
+    Diretório de entradas `<chave>.json`. O hash de cada arquivo é memorizado por
+    (tamanho, mtime) em `digests.json`, então arquivos intactos não são relidos.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._digests_path = os.path.join(cache_dir, _DIGESTS_FILE)
+        self._digests: Dict[str, list] = {}
+        if os.path.exists(self._digests_path):
+            try:
+                with open(self._digests_path, "r", encoding="utf-8") as handle:
+                    self._digests = json.load(handle)
+            except (OSError, ValueError):
+                self._digests = {}
+
+    def file_digest(self, file_path: str) -> str:
+        """SHA-256 do conteúdo; reaproveitado enquanto tamanho e mtime não mudarem."""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        known = self._digests.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(_HASH_BLOCK), b""):
+                digest.update(block)
+        self._digests[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        self._write_json(self._digests_path, self._digests)
+        return digest.hexdigest()
+
+    def key(self, file_path: str, params: Dict) -> str:
+        payload = json.dumps({"file": self.file_digest(file_path), "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Entrada válida (todas as saídas intactas) ou None; um acerto renova a entrada."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if not self._outputs_intact(entry.pop("files", None), entry.get("outputs", [])):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict):
+        """Grava a entrada com (tamanho, mtime) de cada saída, conferidos depois por `get`."""
+        files = {output: self._fingerprint(output) for output in entry.get("outputs", []) if os.path.exists(output)}
+        self._write_json(self._entry_path(key), dict(entry, files=files))
+        self.evict()
+
+    def clear(self) -> int:
+        """Invalida tudo: remove as entradas e os hashes memorizados; retorna quantas entradas saíram."""
+        names = self._entry_names()
+        for name in names:
+            os.remove(os.path.join(self.cache_dir, name))
+        # O índice de hashes não é uma entrada: é zerado à parte e regravado vazio
+        self._digests = {}
+        self._write_json(self._digests_path, self._digests)
+        return len(names)
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o total caber em `max_bytes`."""
+        if self.max_bytes is None: return
+        entries = []
+        for name in self._entry_names():
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes: break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def _entry_names(self) -> List[str]:
+        """Arquivos de entrada do diretório (`<chave>.json`), sem o índice de hashes."""
+        return [name for name in os.listdir(self.cache_dir)
+                if name.endswith(_ENTRY_SUFFIX) and name != _DIGESTS_FILE]
+
+    def _outputs_intact(self, files: Optional[Dict], outputs) -> bool:
+        """
+        Saídas existem e não foram regravadas desde o `put` (ex.: outra execução com
+        parâmetros diferentes no mesmo diretório de saída).
+        """
+        if files is None: return False
+        try:
+            return all(output in files and files[output] == self._fingerprint(output) for output in outputs)
+        except OSError:
+            return False
+
+    @staticmethod
+    def _fingerprint(path: str) -> list:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    @staticmethod
+    def _write_json(path: str, data):
+        """Grava em arquivo temporário e troca atomicamente (execuções interrompidas não corrompem o cache)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        os.replace(tmp, path)
@@ -0,0 +1,110 @@
+"""
+Leitura transparente de FASTA comprimido (gzip e BGZF).
+Arquivos BGZF são descomprimidos bloco a bloco em paralelo, preservando a ordem.
+"""
+
+import concurrent.futures
+import gzip
+import struct
+import zlib
+from collections import deque
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_BGZF_HEADER = b"\x1f\x8b\x08\x04"
+_CHUNK_SIZE = 1 << 20
+# Blocos BGZF têm até 64 KB descomprimidos; lotes de 64 blocos (~4 MB) amortizam o IPC
+_BLOCKS_PER_TASK = 64
+
+def is_gzip(file_path: str) -> bool:
+    """Detecta gzip (inclui BGZF) pelos bytes mágicos, independente da extensão."""
+    with open(file_path, "rb") as handle:
+        return handle.read(2) == _GZIP_MAGIC
+
+def is_bgzf(file_path: str) -> bool:
+    """Detecta BGZF: gzip com campo extra contendo o subcampo 'BC' (tamanho do bloco)."""
+    with open(file_path, "rb") as handle:
+        header = handle.read(12)
+        if len(header) < 12 or header[:4] != _BGZF_HEADER:
+            return False
+        extra = handle.read(int.from_bytes(header[10:12], "little"))
+    return _bgzf_block_size(extra) is not None
+
+def iter_lines(file_path: str, workers: int = 1, executor: Optional[concurrent.futures.Executor] = None) -> Iterator[bytes]:
+    """Itera as linhas (bytes, sem '\\n') de um arquivo gzip/BGZF."""
+    tail = b""
+    for chunk in _iter_chunks(file_path, workers, executor):
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+def _iter_chunks(file_path: str, workers: int, executor) -> Iterator[bytes]:
+    if workers > 1 and is_bgzf(file_path):
+        if executor is not None:
+            yield from _inflate_bgzf_parallel(file_path, workers, executor)
+            return
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from _inflate_bgzf_parallel(file_path, workers, pool)
+        return
+    with gzip.open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            yield chunk
+
+def _inflate_bgzf_parallel(file_path: str, workers: int, executor: concurrent.futures.Executor) -> Iterator[bytes]:
+    """
+    Lê os blocos comprimidos no processo principal e os descomprime no `executor` (o pool
+    da execução, quando houver, para não subir outro por arquivo).
+    No máximo 2 lotes por worker ficam em voo, limitando a memória e mantendo a ordem.
+    """
+    pending = deque()
+    try:
+        with open(file_path, "rb") as handle:
+            blocks = _read_bgzf_blocks(handle)
+            for batch in iter(lambda: list(islice(blocks, _BLOCKS_PER_TASK)), []):
+                pending.append(executor.submit(_inflate_blocks, batch))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def _read_bgzf_blocks(handle: BinaryIO) -> Iterator[bytes]:
+    """Separa os membros BGZF brutos usando o tamanho gravado em cada cabeçalho."""
+    while True:
+        header = handle.read(12)
+        if not header:
+            return
+        if len(header) < 12 or header[:4] != _BGZF_HEADER:
+            raise ValueError("Bloco BGZF inválido.")
+        xlen = int.from_bytes(header[10:12], "little")
+        extra = handle.read(xlen)
+        bsize = _bgzf_block_size(extra)
+        if bsize is None:
+            raise ValueError("Bloco BGZF sem subcampo 'BC'.")
+        yield header + extra + handle.read(bsize + 1 - 12 - xlen)
+
+def _bgzf_block_size(extra: bytes):
+    pos = 0
+    while pos + 4 <= len(extra):
+        slen = int.from_bytes(extra[pos + 2:pos + 4], "little")
+        if extra[pos:pos + 2] == b"BC" and slen == 2:
+            return int.from_bytes(extra[pos + 4:pos + 6], "little")
+        pos += 4 + slen
+    return None
+
+def _inflate_blocks(blocks: List[bytes]) -> bytes:
+    """Tarefa do worker: descomprime um lote de blocos e valida CRC32/ISIZE."""
+    out = []
+    for block in blocks:
+        xlen = int.from_bytes(block[10:12], "little")
+        data = zlib.decompress(block[12 + xlen:-8], wbits=-15)
+        crc, isize = struct.unpack("<II", block[-8:])
+        if zlib.crc32(data) != crc or len(data) & 0xFFFFFFFF != isize:
+            raise ValueError("Bloco BGZF corrompido (CRC/tamanho).")
+        out.append(data)
+    return b"".join(out)
@@ -1,5 +1,5 @@
 import csv
-from typing import Dict
+from typing import Dict, Iterable
 
 def save_results_to_csv(results: Dict[str, float], output_path: str):
     """Salva os resultados do cálculo GC em um arquivo CSV."""
@@ -8,3 +8,39 @@ def save_results_to_csv(results: Dict[str, float], output_path: str):
         writer.writerow(['Sequence_ID', 'GC_Content_Percent'])
         for seq_id, gc_value in results.items():
             writer.writerow([seq_id, f"{gc_value:.2f}"])
+
+class WindowTrackWriter:
+    """
+    Grava janelas deslizantes em bedGraph (id, início, fim, GC%) bloco a bloco,
+    de modo que a trilha completa nunca precisa existir em memória.
+    """
+
+    def __init__(self, output_path: str):
+        self.path = output_path
+        self._handle = open(output_path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_chunk(self, seq_id: str, first: int, chunk: Iterable[float], win_size: int, step: int):
+        """Grava um bloco de janelas cujo primeiro índice no registro é `first`."""
+        step = step if step > 0 else win_size
+        start = first * step
+        self._handle.write("".join(
+            f"{seq_id}\t{start + k * step}\t{start + k * step + win_size}\t{value:.2f}\n"
+            for k, value in enumerate(chunk)
+        ))
+
+    def write_windows(self, seq_id: str, chunks: Iterable[Iterable[float]], win_size: int, step: int) -> int:
+        """Consome os blocos de janelas de um registro à medida que são gerados; retorna o total gravado."""
+        written = 0
+        for chunk in chunks:
+            self.write_chunk(seq_id, written, chunk, win_size, step)
+            written += len(chunk)
+        return written
+
+    def close(self):
+        self._handle.close()
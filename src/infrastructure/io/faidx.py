@@ -0,0 +1,191 @@
+"""
+Acesso aleatório a FASTA via índice `.fai` (compatível com `samtools faidx`) e mmap.
+"""
+
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from typing import Container, Dict, Iterator, List, Optional, Tuple
+from src.infrastructure.io.compression import is_gzip
+
+_REGION_RE = re.compile(r"^(?P<name>.+):(?P<start>[\d,]+)?(?:-(?P<end>[\d,]+))?$")
+
+@dataclass(frozen=True)
+class FaiRecord:
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+def build_fai(fasta_path: str) -> List[FaiRecord]:
+    """
+    Varre o FASTA em modo binário e calcula as entradas do índice.
+    Exige linhas de tamanho uniforme dentro de cada registro (mesma regra do samtools).
+    """
+    if is_gzip(fasta_path):
+        raise ValueError("Índice .fai requer FASTA não comprimido.")
+    records = []
+    name = None
+    with open(fasta_path, "rb") as handle:
+        pos = 0
+        for line in handle:
+            pos += len(line)
+            if line.startswith(b">"):
+                if name is not None:
+                    records.append(FaiRecord(name, length, offset, line_bases, line_width))
+                fields = line[1:].split(maxsplit=1)
+                name = fields[0].decode() if fields else ""
+                length, offset, line_bases, line_width, ended = 0, pos, 0, 0, False
+                continue
+            if name is None:
+                continue
+            bases = len(line.rstrip(b"\r\n"))
+            if bases == 0:
+                ended = True  # Linha em branco: só pode haver cabeçalho depois
+                continue
+            if line_bases == 0:
+                line_bases, line_width = bases, len(line)
+            elif ended or bases > line_bases or (bases == line_bases and line.endswith(b"\n") and len(line) != line_width):
+                raise ValueError(f"Registro '{name}' com linhas de tamanhos diferentes; índice .fai não suportado.")
+            ended = ended or bases < line_bases
+            length += bases
+    if name is not None:
+        records.append(FaiRecord(name, length, offset, line_bases, line_width))
+    return records
+
+def write_fai(records: List[FaiRecord], fai_path: str):
+    """Grava o índice no formato tabulado do samtools."""
+    with open(fai_path, "w", encoding="utf-8") as out:
+        for r in records:
+            out.write(f"{r.name}\t{r.length}\t{r.offset}\t{r.line_bases}\t{r.line_width}\n")
+
+def load_fai(fai_path: str) -> List[FaiRecord]:
+    """Lê um índice `.fai` existente."""
+    records = []
+    with open(fai_path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5: continue
+            records.append(FaiRecord(fields[0], *(int(f) for f in fields[1:5])))
+    return records
+
+def fai_is_current(fasta_path: str, fai_path: Optional[str] = None) -> bool:
+    """O `.fai` existe e não é mais antigo que o FASTA."""
+    fai_path = fai_path or fasta_path + ".fai"
+    return os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(fasta_path)
+
+def parse_region(region: str, names: Optional[Container[str]] = None) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Converte 'chr', 'chr:start' ou 'chr:start-end' (1-based, inclusivo, como no samtools)
+    em (id, início 0-based, fim exclusivo). Como no samtools, um texto que é inteiro um ID
+    de `names` vale como ID, e as coordenadas são só o último ':start-end' (IDs com ':',
+    como 'HLA-A*01:01:01:01', continuam válidos).
+    """
+    region = region.strip()
+    if not region:
+        raise ValueError(f"Região inválida: '{region}'.")
+    match = None if names is not None and region in names else _REGION_RE.match(region)
+    if not match:
+        return region, None, None
+    start = match.group("start")
+    end = match.group("end")
+    start0 = int(start.replace(",", "")) - 1 if start else None
+    end0 = int(end.replace(",", "")) if end else None
+    if start0 is not None and start0 < 0:
+        raise ValueError(f"Região inválida: '{region}' (coordenadas começam em 1).")
+    return match.group("name"), start0, end0
+
+class IndexedFasta:
+    """
+    FASTA mapeado em memória com busca por ID e por região.
+    Carrega `<arquivo>.fai` se estiver atualizado; caso contrário o reconstrói (e tenta gravá-lo).
+    As fatias vêm direto do page cache, sem copiar o arquivo inteiro para strings Python.
+    """
+
+    def __init__(self, fasta_path: str, fai_path: Optional[str] = None):
+        self.path = fasta_path
+        self.fai_path = fai_path or fasta_path + ".fai"
+        self.records: Dict[str, FaiRecord] = {}
+        for record in self._load_or_build_index():
+            self.records.setdefault(record.name, record)
+        self._handle = open(fasta_path, "rb")
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(fasta_path) else b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, seq_id: str) -> bool:
+        return seq_id in self.records
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Itera (id, sequência) na ordem do arquivo, como `read_fasta`."""
+        for seq_id in self.records:
+            yield seq_id, self.fetch(seq_id)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._handle.close()
+
+    def length(self, seq_id: str) -> int:
+        return self._record(seq_id).length
+
+    def fetch_bytes(self, seq_id: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Bases de seq_id[start:end] (0-based, fim exclusivo) lidas do mmap."""
+        rec = self._record(seq_id)
+        end = rec.length if end is None else min(end, rec.length)
+        start = max(0, min(start, end))
+        if start == end: return b""
+        raw = self._map[self._byte_offset(rec, start):self._byte_offset(rec, end)]
+        return raw.translate(None, b"\r\n")
+
+    def fetch(self, seq_id: str, start: int = 0, end: Optional[int] = None) -> str:
+        return self.fetch_bytes(seq_id, start, end).decode("ascii")
+
+    def fetch_region(self, region: str) -> str:
+        """Busca uma região no formato samtools ('chr1:1,000-2,000')."""
+        seq_id, start, end = parse_region(region, self.records)
+        return self.fetch(seq_id, start or 0, end)
+
+    def record_spans(self) -> Iterator[Tuple[int, int]]:
+        """
+        Faixas de bytes [início, fim) de cada registro, como `iter_record_spans`, mas a partir
+        do índice: só o cabeçalho antes de cada sequência é procurado, sem varrer as bases.
+        """
+        size = len(self._map)
+        start = 0
+        for rec in list(self.records.values())[1:]:
+            boundary = self._map.rfind(b"\n>", 0, rec.offset) + 1
+            if boundary > start:
+                yield start, boundary
+                start = boundary
+        if size > start:
+            yield start, size
+
+    def _record(self, seq_id: str) -> FaiRecord:
+        try:
+            return self.records[seq_id]
+        except KeyError:
+            raise KeyError(f"Sequência '{seq_id}' não encontrada no índice.") from None
+
+    @staticmethod
+    def _byte_offset(rec: FaiRecord, pos: int) -> int:
+        return rec.offset + (pos // rec.line_bases) * rec.line_width + pos % rec.line_bases
+
+    def _load_or_build_index(self) -> List[FaiRecord]:
+        if fai_is_current(self.path, self.fai_path):
+            return load_fai(self.fai_path)
+        records = build_fai(self.path)
+        try:
+            write_fai(records, self.fai_path)
+        except OSError:
+            pass  # Diretório somente leitura: o índice fica apenas em memória
+        return records
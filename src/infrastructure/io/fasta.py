@@ -1,26 +1,139 @@
-from typing import Iterator, Tuple
+import os
+from typing import Iterable, Iterator, List, Tuple
+from src.infrastructure.io.compression import is_gzip, iter_lines
 
-def read_fasta(file_path: str) -> Iterator[Tuple[str, str]]:
+FASTA_EXTENSIONS = ('.fasta', '.fa', '.fna')
+COMPRESSED_EXTENSIONS = ('.gz', '.bgz')
+_SCAN_BLOCK = 1 << 20
+# Espaços removidos das bordas de cada linha (além das quebras de linha)
+_LINE_BLANKS = b" \t\v\f"
+
+def read_fasta(file_path: str, workers: int = 1, executor=None) -> Iterator[Tuple[str, str]]:
     """
     Lê um arquivo FASTA e retorna um iterador de (id, sequência).
     Implementação estrita garantindo complexidade espacial O(1) de I/O no parsing,
     bufferizando linha por linha sem instanciar classes pesadas.
+    Entradas gzip/BGZF são detectadas pelo conteúdo; blocos BGZF usam `workers` processos
+    (no `executor` recebido, ou em um pool próprio durante a leitura).
     """
+    if is_gzip(file_path):
+        yield from _parse_lines(line.decode() for line in iter_lines(file_path, workers, executor))
+        return
     with open(file_path, "r") as handle:
-        header = ""
-        seq_parts = []
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith(">"):
-                if header:
-                    yield header, "".join(seq_parts)
-                header = line[1:].split()[0]
-                seq_parts = []
-            else:
-                seq_parts.append(line)
-        
-        # Última sequência
-        if header:
-            yield header, "".join(seq_parts)
+        yield from _parse_lines(handle)
+
+def scan_record_spans(file_path: str) -> List[Tuple[int, int]]:
+    """Lista de `iter_record_spans` (prefira o iterador em arquivos com milhões de registros)."""
+    return list(iter_record_spans(file_path))
+
+def iter_record_spans(file_path: str) -> Iterator[Tuple[int, int]]:
+    """
+    Pré-varredura rápida de um FASTA não comprimido: faixas de bytes [início, fim) de cada
+    registro, localizando '>' em início de linha sem interpretar as sequências.
+    O tamanho da faixa estima o comprimento do registro; texto antes do primeiro
+    cabeçalho fica na primeira faixa (e é ignorado na leitura, como em `read_fasta`).
+    """
+    size = os.path.getsize(file_path)
+    start = 0
+    with open(file_path, "rb") as handle:
+        base, previous = 0, b"\n"
+        for block in iter(lambda: handle.read(_SCAN_BLOCK), b""):
+            found = [base] if block[:1] == b">" and previous == b"\n" and base > 0 else []
+            pos = block.find(b"\n>")
+            while pos >= 0:
+                found.append(base + pos + 1)
+                pos = block.find(b"\n>", pos + 1)
+            for boundary in found:
+                if boundary > start:
+                    yield start, boundary
+                start = boundary
+            base, previous = base + len(block), block[-1:]
+    if size > start:
+        yield start, size
+
+def read_fasta_range(file_path: str, start: int, end: int) -> Iterator[Tuple[str, str]]:
+    """Lê apenas os registros da faixa de bytes [start, end) produzida por `scan_record_spans`."""
+    with open(file_path, "rb") as handle:
+        handle.seek(start)
+        yield from _parse_lines(line.decode() for line in _iter_range(handle, end - start))
+
+def parse_fasta_bytes(data: bytes) -> Iterator[Tuple[str, str]]:
+    """
+    Interpreta um FASTA já em memória (ex.: upload) sem dividi-lo em linhas nem copiá-lo inteiro:
+    os cabeçalhos são localizados por busca de bytes e cada registro vira um único buffer
+    sem quebras de linha, decodificado uma vez. Mesmos registros que `read_fasta` (cabeçalhos
+    sem identificador são ignorados em vez de interromper a leitura).
+    """
+    size = len(data)
+    start = _find_header(data, 0)
+    while start is not None:
+        name_start = data.find(b">", start) + 1
+        header_end = data.find(b"\n", name_start)
+        if header_end < 0:
+            header_end = size
+        following = _find_header(data, header_end)
+        end = size if following is None else following
+        fields = data[name_start:header_end].split(maxsplit=1)
+        if fields:
+            body = data[header_end:end]
+            sequence = body.translate(None, b"\r\n")
+            if len(sequence.translate(None, _LINE_BLANKS)) != len(sequence):
+                # Espaços só saem das bordas das linhas, como em `_parse_lines`
+                sequence = b"".join(line.strip() for line in body.split(b"\n"))
+            yield fields[0].decode(), sequence.decode()
+        start = following
+
+def _find_header(data: bytes, pos: int):
+    """Início da próxima linha de cabeçalho a partir de `pos`: '>' precedido só de espaços na linha."""
+    pos = data.find(b">", pos)
+    while pos >= 0:
+        if pos == 0 or data[pos - 1] == 10:
+            return pos
+        line_start = data.rfind(b"\n", 0, pos) + 1
+        if not data[line_start:pos].strip():
+            return line_start
+        pos = data.find(b">", pos + 1)
+    return None
+
+def is_fasta_path(file_path: str) -> bool:
+    """Reconhece extensões FASTA, opcionalmente seguidas de .gz/.bgz."""
+    name = file_path.lower()
+    for ext in COMPRESSED_EXTENSIONS:
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+            break
+    return name.endswith(FASTA_EXTENSIONS)
+
+def fasta_base_name(file_path: str) -> str:
+    """Nome do arquivo sem a extensão FASTA nem a de compressão."""
+    name = os.path.basename(file_path)
+    for ext in COMPRESSED_EXTENSIONS:
+        if name.lower().endswith(ext):
+            name = name[:-len(ext)]
+            break
+    return os.path.splitext(name)[0]
+
+def _iter_range(handle, remaining: int) -> Iterator[bytes]:
+    for line in handle:
+        if remaining <= 0: return
+        remaining -= len(line)
+        yield line
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    header = ""
+    seq_parts = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(">"):
+            if header:
+                yield header, "".join(seq_parts)
+            header = line[1:].split()[0]
+            seq_parts = []
+        else:
+            seq_parts.append(line)
+    
+    # Última sequência
+    if header:
+        yield header, "".join(seq_parts)
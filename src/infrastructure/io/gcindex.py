@@ -0,0 +1,138 @@
+"""
+Índice persistente de GC (`<fasta>.gci`): contagens cumulativas de G, C, CG e N a cada
+`interval` bases de cada registro, gravadas ao lado do FASTA.
+
+Layout (little-endian):
+    MAGIC | versão (u32) | intervalo (u32)
+    por registro: pontos int64 (G, C, CG, N) em 0, I, 2I, ..., comprimento
+    diretório JSON (id, comprimento, deslocamento, nº de pontos)
+    rodapé: deslocamento do diretório (u64) | MAGIC
+
+Uma região é respondida com dois pontos do índice (mmap) e, nas bordas, no máximo
+`interval` bases lidas do FASTA pelo `.fai`, sem reprocessar a sequência.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Optional
+import numpy as np
+from src.infrastructure.io.faidx import IndexedFasta
+
+MAGIC = b"GCIX"
+VERSION = 1
+DEFAULT_INTERVAL = 4096
+
+_HEADER = struct.Struct("<4sII")
+_FOOTER = struct.Struct("<Q4s")
+_POINT = np.dtype(("<i8", 4))
+# Intervalos processados por leitura durante a construção
+_BUILD_INTERVALS = 256
+
+_G, _C, _N = ord("G"), ord("C"), ord("N")
+
+def index_path_for(fasta_path: str) -> str:
+    return fasta_path + ".gci"
+
+def write_gc_index(fasta_path: str, index_path: Optional[str] = None, interval: int = DEFAULT_INTERVAL) -> str:
+    """
+    Varre o FASTA (via `.fai` + mmap) em blocos e grava o índice; retorna o caminho gravado.
+    Exige FASTA não comprimido, como o `.fai`.
+    """
+    if interval <= 0:
+        raise ValueError("O intervalo do índice deve ser positivo.")
+    index_path = index_path or index_path_for(fasta_path)
+    directory = []
+    with IndexedFasta(fasta_path) as fasta, open(index_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, interval))
+        for seq_id, record in fasta.records.items():
+            offset = out.tell()
+            carry = np.zeros(4, dtype=np.int64)
+            out.write(carry.tobytes())
+            block = interval * _BUILD_INTERVALS
+            for lo in range(0, record.length, block):
+                hi = min(record.length, lo + block)
+                # Uma base a mais para contar o CG que atravessa o fim do bloco
+                raw = fasta.fetch_bytes(seq_id, lo, hi + 1).upper()
+                points = np.cumsum(_interval_counts(raw, hi - lo, interval), axis=0) + carry
+                out.write(points.tobytes())
+                carry = points[-1]
+            directory.append({"id": seq_id, "length": record.length, "offset": offset,
+                              "points": -(-record.length // interval) + 1})
+        directory_offset = out.tell()
+        out.write(json.dumps({"sequences": directory}).encode("utf-8"))
+        out.write(_FOOTER.pack(directory_offset, MAGIC))
+    return index_path
+
+def _interval_counts(raw: bytes, n: int, interval: int) -> np.ndarray:
+    """(G, C, CG, N) de cada intervalo de raw[:n]; o CG conta pela posição do C."""
+    arr = np.frombuffer(raw, dtype=np.uint8)
+    body = arr[:n]
+    following = np.append(arr[1:n + 1], np.zeros(n + 1 - len(arr), dtype=np.uint8))
+    flags = np.stack([body == _G, body == _C, (body == _C) & (following == _G), body == _N], axis=1)
+    return np.add.reduceat(flags.astype(np.int64), np.arange(0, n, interval), axis=0)
+
+class GCIndex:
+    """
+    Consulta de regiões sobre o índice `.gci` (mapeado em memória) e o FASTA indexado.
+    Recusa índices mais antigos que o FASTA: rode `main.py index` novamente.
+    """
+
+    def __init__(self, fasta_path: str, index_path: Optional[str] = None):
+        self.path = index_path or index_path_for(fasta_path)
+        if not os.path.exists(self.path):
+            raise ValueError(f"Índice '{self.path}' não encontrado; rode `main.py index {fasta_path}`.")
+        if os.path.getmtime(self.path) < os.path.getmtime(fasta_path):
+            raise ValueError(f"Índice '{self.path}' desatualizado; rode `main.py index {fasta_path}`.")
+        self._handle = open(self.path, "rb")
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.interval = _HEADER.unpack_from(self._map, 0)
+        directory_offset, tail = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if magic != MAGIC or tail != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{self.path}' não é um índice GCScan válido.")
+        directory = json.loads(self._map[directory_offset:len(self._map) - _FOOTER.size])
+        self.sequences: Dict[str, dict] = {entry["id"]: entry for entry in directory["sequences"]}
+        self.fasta = IndexedFasta(fasta_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if hasattr(self, "fasta"):
+            self.fasta.close()
+        self._map.close()
+        self._handle.close()
+
+    def length(self, seq_id: str) -> int:
+        return self._entry(seq_id)["length"]
+
+    def counts(self, seq_id: str, start: int = 0, end: Optional[int] = None):
+        """(G, C, CG, N) em [start, end); o CG precisa das duas bases dentro da região."""
+        entry = self._entry(seq_id)
+        end = entry["length"] if end is None else min(end, entry["length"])
+        start = max(0, min(start, end))
+        g, c, cg, n = (int(v) for v in self._cumulative(entry, end) - self._cumulative(entry, start))
+        if end > start and self.fasta.fetch_bytes(seq_id, end - 1, end + 1).upper() == b"CG":
+            cg -= 1  # CG iniciado na última base termina fora da região
+        return g, c, cg, n
+
+    def _cumulative(self, entry: dict, pos: int) -> np.ndarray:
+        """Contagens em seq[:pos] (CG iniciados antes de pos): ponto do índice + resto lido do FASTA."""
+        j = pos // self.interval
+        point = np.frombuffer(self._map, _POINT, 1, entry["offset"] + j * _POINT.itemsize)[0].copy()
+        lo = j * self.interval
+        if pos > lo:
+            raw = self.fasta.fetch_bytes(entry["id"], lo, pos + 1).upper()
+            point += _interval_counts(raw, pos - lo, pos - lo)[0]
+        return point
+
+    def _entry(self, seq_id: str) -> dict:
+        try:
+            return self.sequences[seq_id]
+        except KeyError:
+            raise KeyError(f"Sequência '{seq_id}' não encontrada no índice.") from None
@@ -0,0 +1,139 @@
+"""
+Exportação colunar (Parquet) dos resultados: resumo por sequência, trilha de janelas e ilhas CpG.
+Colunas tipadas, compressão e row groups grandes; os dados são gravados em lotes à medida que
+chegam, e as janelas float32 entram no Arrow sem cópia.
+"""
+
+import os
+from typing import Iterable, List, Optional
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.domain.models import WINDOW_TYPECODE, CpGIsland
+
+_SEQ_ID = pa.dictionary(pa.int32(), pa.string())
+
+SEQUENCES_SCHEMA = pa.schema([("sequence_id", pa.string()), ("gc_percent", pa.float64())])
+WINDOWS_SCHEMA = pa.schema([
+    ("sequence_id", _SEQ_ID), ("start", pa.int64()), ("end", pa.int64()), ("gc_percent", pa.float32()),
+])
+ISLANDS_SCHEMA = pa.schema([
+    ("sequence_id", _SEQ_ID), ("start", pa.int64()), ("end", pa.int64()),
+    ("gc_percent", pa.float64()), ("oe_ratio", pa.float64()),
+])
+
+DEFAULT_ROW_GROUP_ROWS = 1 << 20
+
+class _BatchedTable:
+    """Arquivo Parquet criado sob demanda que acumula lotes até completar um row group."""
+
+    def __init__(self, path: str, schema: pa.Schema, compression: str, row_group_rows: int):
+        self.path, self.schema = path, schema
+        self.compression, self.row_group_rows = compression, row_group_rows
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+
+    def append(self, batch: pa.RecordBatch):
+        if batch.num_rows == 0: return
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.row_group_rows:
+            self._flush()
+
+    @property
+    def written(self) -> bool:
+        return self._writer is not None
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def _flush(self):
+        if not self._pending: return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        self._writer.write_table(pa.Table.from_batches(self._pending, self.schema), row_group_size=self.row_group_rows)
+        self._pending, self._pending_rows = [], 0
+
+class ParquetResultWriter:
+    """
+    Grava `<base>_sequences.parquet`, `<base>_windows.parquet` e `<base>_islands.parquet`.
+    Cada tabela só é criada se receber dados. Mesma interface de janelas do `WindowTrackWriter`.
+    """
+
+    def __init__(self, output_dir: str, base_name: str, compression: str = "zstd",
+                 row_group_rows: int = DEFAULT_ROW_GROUP_ROWS):
+        def table(kind, schema):
+            return _BatchedTable(os.path.join(output_dir, f"{base_name}_{kind}.parquet"), schema, compression, row_group_rows)
+        self.sequences = table("sequences", SEQUENCES_SCHEMA)
+        self.windows = table("windows", WINDOWS_SCHEMA)
+        self.islands = table("islands", ISLANDS_SCHEMA)
+        self._seq_ids: List[str] = []
+        self._gc: List[float] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_sequence(self, seq_id: str, gc_percent: float):
+        self._seq_ids.append(seq_id)
+        self._gc.append(gc_percent)
+        if len(self._seq_ids) >= self.sequences.row_group_rows:
+            self._flush_sequences()
+
+    def write_chunk(self, seq_id: str, first: int, chunk, win_size: int, step: int):
+        """Grava um bloco de janelas cujo primeiro índice no registro é `first`."""
+        values = np.frombuffer(chunk, dtype=np.float32) if getattr(chunk, "typecode", None) == WINDOW_TYPECODE \
+            else np.asarray(chunk, dtype=np.float32)
+        n = len(values)
+        if n == 0: return
+        step = step if step > 0 else win_size
+        starts = (np.arange(first, first + n, dtype=np.int64)) * step
+        self.windows.append(pa.record_batch(
+            [_repeat_id(seq_id, n), pa.array(starts), pa.array(starts + win_size), pa.array(values)], schema=WINDOWS_SCHEMA
+        ))
+
+    def write_windows(self, seq_id: str, chunks: Iterable, win_size: int, step: int) -> int:
+        written = 0
+        for chunk in chunks:
+            self.write_chunk(seq_id, written, chunk, win_size, step)
+            written += len(chunk)
+        return written
+
+    def write_islands(self, seq_id: str, islands: Iterable[CpGIsland]):
+        """Aceita `CpGIslandTable` (colunas usadas diretamente) ou qualquer lista de ilhas."""
+        if hasattr(islands, "starts"):
+            columns = [islands.starts, islands.ends, islands.gc_percents, islands.oe_ratios]
+            arrays = [np.frombuffer(col, dtype=np.int64 if col.typecode == 'q' else np.float64) if len(col) else [] for col in columns]
+        else:
+            rows = list(islands)
+            arrays = [[i.start for i in rows], [i.end for i in rows], [i.gc_percent for i in rows], [i.oe_ratio for i in rows]]
+        n = len(arrays[0])
+        if n == 0: return
+        self.islands.append(pa.record_batch(
+            [_repeat_id(seq_id, n)] + [pa.array(col, type=field.type) for col, field in zip(arrays, list(ISLANDS_SCHEMA)[1:])],
+            schema=ISLANDS_SCHEMA
+        ))
+
+    def paths(self) -> List[str]:
+        """Tabelas que receberam dados (válido após `close`)."""
+        return [table.path for table in (self.sequences, self.windows, self.islands) if table.written]
+
+    def close(self):
+        self._flush_sequences()
+        for table in (self.sequences, self.windows, self.islands):
+            table.close()
+
+    def _flush_sequences(self):
+        if not self._seq_ids: return
+        self.sequences.append(pa.record_batch([pa.array(self._seq_ids, pa.string()), pa.array(self._gc, pa.float64())],
+                                              schema=SEQUENCES_SCHEMA))
+        self._seq_ids, self._gc = [], []
+
+def _repeat_id(seq_id: str, n: int) -> pa.DictionaryArray:
+    """Coluna de ID com um único valor de dicionário (n índices zero, sem n strings)."""
+    return pa.DictionaryArray.from_arrays(pa.array(np.zeros(n, dtype=np.int32)), pa.array([seq_id], pa.string()))
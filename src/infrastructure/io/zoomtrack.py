@@ -0,0 +1,310 @@
+"""
+Trilha binária de GC por janela com níveis de zoom pré-calculados (pirâmide, no espírito do bigWig).
+
+Layout do arquivo (little-endian):
+    MAGIC | versão (u32)
+    por sequência: nível 0 (GC de cada janela, float32), depois cada nível de zoom
+                   como três planos float32 (média, mínimo, máximo por bin)
+    diretório JSON (ids, janela, passo e deslocamento de cada nível)
+    rodapé: deslocamento do diretório (u64) | MAGIC
+
+O nível L agrega ZOOM_FACTOR**L janelas por bin. Uma região lida com `pixels` pontos
+usa o nível mais grosso que ainda tem pelo menos `pixels` bins nela, então a leitura
+custa O(pixels) seja qual for o tamanho da região.
+"""
+
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+MAGIC = b"GCZT"
+VERSION = 1
+ZOOM_FACTOR = 10
+
+_HEADER = struct.Struct("<4sI")
+_FOOTER = struct.Struct("<Q4s")
+_F32 = np.dtype("<f4")
+
+@dataclass(frozen=True)
+class ZoomBins:
+    """Bins de uma consulta: coordenadas (bp) e GC médio/mínimo/máximo de cada um."""
+    starts: np.ndarray
+    ends: np.ndarray
+    mean: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    factor: int
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+def downsample(values, window: int, step: int, start: int = 0, end: Optional[int] = None, pixels: int = 1000) -> ZoomBins:
+    """
+    Mesma consulta de `ZoomTrack.query` sobre janelas já em memória (lista ou array('f')):
+    só as janelas visíveis são lidas e viram os mesmos bins, com mínimo e máximo exatos.
+    """
+    step = step if step > 0 else window
+    values = np.asarray(values, dtype=_F32)
+    first = min(len(values), max(0, -(-start // step)))
+    last = len(values) if end is None else min(len(values), max(first, -(-end // step)))
+    pixels = max(1, pixels)
+    size = ZOOM_FACTOR ** _zoom_level(last - first, ZOOM_FACTOR, pixels)
+    bin_first = _bin_starts(first, last, size)
+    bin_last = np.append(bin_first[1:], last) - 1
+    visible = values[first:last]
+    if len(visible):
+        idx = bin_first - first
+        mean = (np.add.reduceat(visible.astype(np.float64), idx) / (bin_last - bin_first + 1)).astype(_F32)
+        low, high = np.minimum.reduceat(visible, idx), np.maximum.reduceat(visible, idx)
+    else:
+        mean = low = high = visible
+    return _merge_bins(bin_first, bin_last, mean, low, high, pixels, step, window, size)
+
+def _zoom_level(windows: int, factor: int, pixels: int) -> int:
+    """Nível mais grosso que ainda tem pelo menos `pixels` bins inteiros em `windows` janelas."""
+    level = 0
+    while windows // factor ** (level + 1) >= pixels:
+        level += 1
+    return level
+
+def _edge_cuts(first: int, last: int, size: int):
+    """Limites [a, b) dos bins de `size` janelas inteiros dentro de [first, last)."""
+    a = min(last, -(-first // size) * size)
+    return a, max(a, last // size * size)
+
+def _bin_starts(first: int, last: int, size: int) -> np.ndarray:
+    """
+    Início de cada bin da região: bins inteiros de `size` janelas alinhados ao nível de zoom,
+    mais um bin parcial em cada borda quando `first`/`last` não caem num limite.
+    """
+    a, b = _edge_cuts(first, last, size)
+    head = [first] if first < a else []
+    tail = [b] if b < last else []
+    return np.concatenate((np.array(head, np.int64), np.arange(a, b, size, dtype=np.int64), np.array(tail, np.int64)))
+
+def _merge_bins(bin_first, bin_last, mean, low, high, pixels: int, step: int, window: int, factor: int) -> ZoomBins:
+    """Funde bins consecutivos (índices de janela [first, last]) até sobrarem no máximo `pixels`."""
+    if len(mean) > pixels:
+        idx = np.linspace(0, len(mean), pixels, endpoint=False).astype(np.int64)
+        weights = (bin_last - bin_first + 1).astype(np.float64)
+        mean = (np.add.reduceat(mean * weights, idx) / np.add.reduceat(weights, idx)).astype(_F32)
+        low, high = np.minimum.reduceat(low, idx), np.maximum.reduceat(high, idx)
+        bin_first, bin_last = bin_first[idx], np.append(bin_first[idx[1:]] - 1, bin_last[-1])
+    return ZoomBins(bin_first * step, bin_last * step + window, mean, low, high, factor)
+
+class _Pyramid:
+    """Agrega em fluxo os blocos de janelas de um registro em todos os níveis de zoom."""
+
+    def __init__(self, factor: int):
+        self.factor = factor
+        self.count = 0
+        self.levels: List[List[List[np.ndarray]]] = []  # nível-1 -> [médias, mínimos, máximos]
+        self._pending: List[Optional[tuple]] = []        # nível-1 -> (somas, contagens, mínimos, máximos)
+
+    def push(self, values: np.ndarray):
+        self.count += len(values)
+        v = values.astype(np.float64)
+        self._push(0, (v, np.ones(len(v)), v, v))
+
+    def finish(self):
+        """Fecha os bins parciais, do nível mais fino ao mais grosso, até sobrar um único bin."""
+        level = 0
+        while level < len(self._pending) and self._bins(level - 1) > 1:
+            pending, self._pending[level] = self._pending[level], None
+            if pending is not None and len(pending[0]):
+                self._emit(level, self._reduce(pending))
+            level += 1
+
+    def _push(self, level: int, block: tuple):
+        if level == len(self._pending):
+            self._pending.append(None)
+        pending = self._pending[level]
+        if pending is not None:
+            block = tuple(np.concatenate((a, b)) for a, b in zip(pending, block))
+        full = len(block[0]) - len(block[0]) % self.factor
+        self._pending[level] = tuple(a[full:] for a in block)
+        if full:
+            self._emit(level, self._reduce(tuple(a[:full] for a in block)))
+
+    def _emit(self, level: int, reduced: tuple):
+        sums, counts, mins, maxs = reduced
+        if level == len(self.levels):
+            self.levels.append([[], [], []])
+        for plane, values in zip(self.levels[level], (sums / counts, mins, maxs)):
+            plane.append(values.astype(_F32))
+        self._push(level + 1, reduced)
+
+    def _reduce(self, block: tuple) -> tuple:
+        idx = np.arange(0, len(block[0]), self.factor)
+        sums, counts, mins, maxs = block
+        return (np.add.reduceat(sums, idx), np.add.reduceat(counts, idx),
+                np.minimum.reduceat(mins, idx), np.maximum.reduceat(maxs, idx))
+
+    def _bins(self, level: int) -> int:
+        """Bins do nível `level` (-1 = janelas)."""
+        if level < 0: return self.count
+        return sum(len(a) for a in self.levels[level][0])
+
+class ZoomTrackWriter:
+    """
+    Grava a trilha `.gcz` bloco a bloco (mesma interface de janelas do `WindowTrackWriter`).
+    O nível 0 vai direto para o disco; só os níveis de zoom (~1/9 das janelas) ficam em memória
+    até o fim de cada registro.
+    """
+
+    def __init__(self, output_path: str, factor: int = ZOOM_FACTOR):
+        self.path = output_path
+        self.factor = factor
+        self._handle = open(output_path, "wb")
+        self._handle.write(_HEADER.pack(MAGIC, VERSION))
+        self._directory: List[dict] = []
+        self._current: Optional[dict] = None
+        self._pyramid: Optional[_Pyramid] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_chunk(self, seq_id: str, first: int, chunk, win_size: int, step: int):
+        """Anexa um bloco de janelas; um novo `seq_id` encerra o registro anterior."""
+        values = np.asarray(chunk, dtype=_F32)
+        if len(values) == 0: return
+        if self._current is None or self._current["id"] != seq_id:
+            self._finish_sequence()
+            self._current = {"id": seq_id, "window": win_size, "step": step if step > 0 else win_size,
+                             "offset": self._handle.tell()}
+            self._pyramid = _Pyramid(self.factor)
+        self._handle.write(values.tobytes())
+        self._pyramid.push(values)
+
+    def write_windows(self, seq_id: str, chunks: Iterable, win_size: int, step: int) -> int:
+        written = 0
+        for chunk in chunks:
+            self.write_chunk(seq_id, written, chunk, win_size, step)
+            written += len(chunk)
+        return written
+
+    def close(self):
+        if self._handle.closed: return
+        self._finish_sequence()
+        directory_offset = self._handle.tell()
+        self._handle.write(json.dumps({"factor": self.factor, "sequences": self._directory}).encode("utf-8"))
+        self._handle.write(_FOOTER.pack(directory_offset, MAGIC))
+        self._handle.close()
+
+    def _finish_sequence(self):
+        if self._current is None: return
+        pyramid = self._pyramid
+        pyramid.finish()
+        levels = []
+        for planes in pyramid.levels:
+            offset = self._handle.tell()
+            for plane in planes:
+                for block in plane:
+                    self._handle.write(block.tobytes())
+            levels.append({"offset": offset, "bins": sum(len(b) for b in planes[0])})
+        self._current.update(count=pyramid.count, levels=levels)
+        self._directory.append(self._current)
+        self._current = self._pyramid = None
+
+class ZoomTrack:
+    """Leitor mapeado em memória da trilha `.gcz`; `query` devolve no máximo `pixels` bins."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = open(path, "rb")
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _HEADER.unpack_from(self._map, 0)
+        directory_offset, tail = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if magic != MAGIC or tail != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' não é uma trilha GCScan (.gcz).")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Versão de trilha não suportada: {version}.")
+        directory = json.loads(self._map[directory_offset:len(self._map) - _FOOTER.size])
+        self.factor: int = directory["factor"]
+        self.sequences: Dict[str, dict] = {entry["id"]: entry for entry in directory["sequences"]}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._handle.close()
+
+    def length(self, seq_id: str) -> int:
+        """Extensão coberta pelas janelas do registro (bp)."""
+        entry = self._entry(seq_id)
+        return (entry["count"] - 1) * entry["step"] + entry["window"] if entry["count"] else 0
+
+    def query(self, seq_id: str, start: int = 0, end: Optional[int] = None, pixels: int = 1000) -> ZoomBins:
+        """
+        Janelas que começam em [start, end) agregadas em até `pixels` bins.
+        Lê só o nível de zoom adequado, nunca mais que ~ZOOM_FACTOR * pixels valores.
+        """
+        entry = self._entry(seq_id)
+        step, count = entry["step"], entry["count"]
+        first = min(count, max(0, -(-start // step)))
+        last = count if end is None else min(count, max(first, -(-end // step)))
+        pixels = max(1, pixels)
+        level = min(_zoom_level(last - first, self.factor, pixels), len(entry["levels"]))
+        size = self.factor ** level
+        a, b = _edge_cuts(first, last, size)
+        mean, low, high = self._planes(entry, level, a // size, b // size)
+        # Bins parciais das bordas: só as janelas dentro da região, lidas de níveis mais finos
+        head = [self._summary(entry, level - 1, first, a)] if first < a else []
+        tail = [self._summary(entry, level - 1, b, last)] if b < last else []
+        if head or tail:
+            mean, low, high = (
+                np.concatenate((np.array([edge[k] for edge in head], _F32), plane,
+                                np.array([edge[k] for edge in tail], _F32)))
+                for k, plane in enumerate((mean, low, high))
+            )
+        bin_first = _bin_starts(first, last, size)
+        bin_last = np.append(bin_first[1:], last) - 1
+        return _merge_bins(bin_first, bin_last, mean, low, high, pixels, step, entry["window"], size)
+
+    def _summary(self, entry: dict, level: int, lo: int, hi: int) -> tuple:
+        """
+        (média, mínimo, máximo) exatos das janelas [lo, hi): bins inteiros do nível `level`
+        e, nas bordas, os níveis abaixo. Lê O(ZOOM_FACTOR * level) valores.
+        """
+        size = self.factor ** level
+        a, b = _edge_cuts(lo, hi, size) if level > 0 else (lo, hi)
+        if a == b:
+            return self._summary(entry, level - 1, lo, hi)
+        mean, low, high = self._planes(entry, level, a // size, b // size)
+        parts = [(float(mean.astype(np.float64).sum()) * size, b - a, float(low.min()), float(high.max()))]
+        for edge_lo, edge_hi in ((lo, a), (b, hi)):
+            if edge_lo < edge_hi:
+                part_mean, part_low, part_high = self._summary(entry, level - 1, edge_lo, edge_hi)
+                parts.append((part_mean * (edge_hi - edge_lo), edge_hi - edge_lo, part_low, part_high))
+        total = sum(part[1] for part in parts)
+        return (sum(part[0] for part in parts) / total,
+                min(part[2] for part in parts), max(part[3] for part in parts))
+
+    def _planes(self, entry: dict, level: int, lo: int, hi: int):
+        """Copia (média, mínimo, máximo) dos bins [lo, hi) do nível; o mmap pode ser fechado depois."""
+        if level == 0:
+            values = np.frombuffer(self._map, _F32, hi - lo, entry["offset"] + lo * _F32.itemsize).copy()
+            return values, values, values
+        info = entry["levels"][level - 1]
+        return tuple(
+            np.frombuffer(self._map, _F32, hi - lo, info["offset"] + (k * info["bins"] + lo) * _F32.itemsize).copy()
+            for k in range(3)
+        )
+
+    def _entry(self, seq_id: str) -> dict:
+        try:
+            return self.sequences[seq_id]
+        except KeyError:
+            raise KeyError(f"Sequência '{seq_id}' não encontrada na trilha.") from None
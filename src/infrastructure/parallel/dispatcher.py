@@ -1,59 +1,493 @@
 import concurrent.futures
+import gzip
+import heapq
 import os
-from typing import Dict, List, Tuple, Any
-from src.infrastructure.io.fasta import read_fasta
-from src.domain.analysis import calculate_gc_percentage, calculate_sliding_window, detect_cpg_islands
-from src.domain.models import CpGIsland
+import sys
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.infrastructure.io.compression import is_gzip
+from src.infrastructure.io.faidx import IndexedFasta, fai_is_current
+from src.infrastructure.io.fasta import iter_record_spans, read_fasta, read_fasta_range
+from src.domain.chunking import merge_chunk_scans, plan_chunks
+from src.domain.kernels import DEFAULT_KERNEL, get_kernel
+from src.domain.models import ChunkScan, CpGIsland, window_array
+from src.infrastructure.parallel.memo import SequenceMemo
+from src.infrastructure.parallel.shared import (
+    SharedSequence, attach, read_sequence, read_windows, release, share_sequence, window_count, write_windows
+)
 
-def _process_single_sequence(item: Tuple[str, str, int, int, bool]) -> Tuple[str, float, List[CpGIsland], List[float]]:
+# Registros maiores que isso são divididos entre os workers (0 desativa a divisão)
+DEFAULT_CHUNK_SIZE = 1 << 22
+# Abaixo disso o pickle pelo pipe custa menos que criar um bloco compartilhado
+SHARED_MEMORY_MIN_SIZE = 1 << 20
+# Backends de execução: processos (padrão), threads ou escolha automática
+EXECUTOR_KINDS = ("processes", "threads", "auto")
+DEFAULT_EXECUTOR = "processes"
+# No modo auto: entradas pequenas não compensam subir processos
+_AUTO_THREADS_MAX_BYTES = 8 << 20
+_AUTO_SAMPLE_BYTES = 1 << 20
+# Lotes medidos em bases, não em nº de registros: ~8 lotes por worker, entre 64 KB e 4 MB
+_BATCHES_TARGET_PER_WORKER = 8
+_BATCH_MIN_BYTES = 1 << 16
+_BATCH_MAX_BYTES = 1 << 22
+# Lotes em voo por worker
+_BATCHES_PER_WORKER = 2
+# Leitura nos workers: grupos à frente do próximo a entregar que podem ser despachados fora de ordem
+_REORDER_GROUPS_PER_WORKER = 4
+# Intervalo de consulta do sinal de parada enquanto um lote roda
+_STOP_POLL_SECONDS = 0.1
+# Custo de cada janela devolvida ao processo principal (buffer float32 do modelo)
+_RESULT_WINDOW_SIZE = 4
+
+def _process_single_sequence(item: Tuple[str, str, int, int, bool, str]) -> Tuple[str, float, List[CpGIsland], List[float]]:
     """Função encapsulada para rodar isoladamente em cada núcleo (Process) e evitar overhead."""
-    seq_id, sequence, window, step, cpg = item
+    seq_id, sequence, window, step, cpg, kernel_name = item
+    # Varredura fundida: uma normalização e uma passada para GC, janelas e CpG
+    analysis = get_kernel(kernel_name).scan(seq_id, sequence, window, step, cpg)
+    return seq_id, analysis.gc_percent, analysis.cpg_islands, analysis.sliding_window
+
+def _process_shared_sequence(item: Tuple[str, SharedSequence, int, int, bool, str]) -> Tuple[str, float, List[CpGIsland], None]:
+    """Como `_process_single_sequence`, mas lê a sequência e grava as janelas na memória compartilhada."""
+    seq_id, handle, window, step, cpg, kernel_name = item
+    with attach(handle) as shm:
+        analysis = get_kernel(kernel_name).scan(seq_id, read_sequence(shm, 0, handle.length), window, step, cpg)
+        write_windows(shm, handle, 0, analysis.sliding_window)
+    return seq_id, analysis.gc_percent, analysis.cpg_islands, None
+
+def _process_sequence_chunk(item: Tuple[str, SharedSequence, int, int, int, int, int, bool, str]) -> Tuple[str, int, ChunkScan]:
+    """Varre um pedaço (núcleo + sobreposição) de um registro longo em memória compartilhada."""
+    seq_id, handle, start, core_end, fetch_end, window, step, cpg, kernel_name = item
+    with attach(handle) as shm:
+        part = get_kernel(kernel_name).scan_chunk(read_sequence(shm, start, fetch_end), core_end - start, window, step, cpg)
+        # Núcleos começam em múltiplos do passo: a primeira janela do pedaço tem índice start // passo
+        if part.sliding_window:
+            write_windows(shm, handle, start // (step if step > 0 else window), part.sliding_window)
+    return seq_id, start, ChunkScan(part.gc_count, window_array(), part.cpg_seeds)
+
+def _process_shard(item: Tuple[str, int, int, int, int, bool, str]) -> List[Tuple[str, float, List[CpGIsland], List[float]]]:
+    """Lê e analisa, no próprio worker, os registros de uma faixa de bytes do arquivo."""
+    file_path, start, end, window, step, cpg, kernel_name = item
+    return [_process_single_sequence((seq_id, sequence, window, step, cpg, kernel_name))
+            for seq_id, sequence in read_fasta_range(file_path, start, end)]
+
+_TASKS = {
+    "seq": _process_single_sequence,
+    "shared": _process_shared_sequence,
+    "chunk": _process_sequence_chunk,
+    "shard": _process_shard,
+}
+
+def _run_task(task: Tuple[str, tuple]) -> Tuple[str, tuple]:
+    kind, item = task
+    return kind, _TASKS[kind](item)
+
+def _run_batch(batch: List[Tuple[str, tuple]]) -> List[Tuple[str, tuple]]:
+    """Executa um lote de tarefas pequenas de uma vez, amortizando o IPC."""
+    return [_run_task(task) for task in batch]
+
+def resolve_executor(kind: str, kernel: str, file_paths: List[str]) -> str:
+    """
+    Resolve `auto` para "threads" ou "processes":
+    threads em CPython sem GIL, em entradas pequenas (o custo de subir processos domina) e no
+    kernel NumPy com registros longos (as operações vetorizadas liberam o GIL); processos nos demais.
+    """
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"Executor desconhecido: '{kind}'. Opções: {', '.join(EXECUTOR_KINDS)}.")
+    if kind != "auto":
+        return kind
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        return "threads"
+    if sum(os.path.getsize(p) for p in file_paths) <= _AUTO_THREADS_MAX_BYTES:
+        return "threads"
+    if kernel == "numpy" and all(_mean_record_size(p) >= SHARED_MEMORY_MIN_SIZE for p in file_paths):
+        return "threads"
+    return "processes"
+
+def _mean_record_size(file_path: str) -> float:
+    """Tamanho médio de registro estimado a partir do primeiro 1 MB (descomprimido) do arquivo."""
+    with (gzip.open(file_path, "rb") if is_gzip(file_path) else open(file_path, "rb")) as handle:
+        sample = handle.read(_AUTO_SAMPLE_BYTES)
+    records = sample.count(b"\n>") + sample.startswith(b">")
+    if len(sample) < _AUTO_SAMPLE_BYTES:
+        return len(sample) / max(1, records)
+    # Amostra cheia: o último registro continua além dela
+    return len(sample) / max(1, records - 1) if records > 1 else float("inf")
+
+def _new_pool(kind: str, max_workers: int) -> concurrent.futures.Executor:
+    if kind == "threads":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+
+def create_worker_pool(max_workers: int = None, kernel: str = DEFAULT_KERNEL, kind: str = DEFAULT_EXECUTOR) -> concurrent.futures.Executor:
+    """
+    Cria um pool de vida longa e já aquecido: todos os workers são iniciados e importam o
+    kernel antes da primeira tarefa. Pode ser compartilhado entre vários arquivos.
+    `kind` é "processes" ou "threads" (resolva "auto" antes com `resolve_executor`).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    executor = _new_pool(kind, max_workers)
+    for future in [executor.submit(_warm_up, kernel) for _ in range(max_workers)]:
+        future.result()
+    return executor
+
+def _warm_up(kernel_name: str) -> str:
+    return get_kernel(kernel_name).name
+
+@contextmanager
+def _worker_pool(executor, max_workers: int, kind: str):
+    """Usa o pool recebido sem encerrá-lo, ou cria um pool temporário para a chamada."""
+    if executor is not None:
+        yield executor
+        return
+    with _new_pool(kind, max_workers) as pool:
+        yield pool
+
+def _batch_target(total_bytes: int, workers: int) -> int:
+    """Tamanho alvo de lote: milhões de leituras curtas viram poucos lotes grandes, e poucos
+    cromossomos ainda geram lotes suficientes para ocupar todos os workers."""
+    return min(_BATCH_MAX_BYTES, max(_BATCH_MIN_BYTES, total_bytes // (workers * _BATCHES_TARGET_PER_WORKER)))
+
+def _batched(tasks: Iterator[Tuple[str, tuple, int]], target: int) -> Iterator[Tuple[List[Tuple[str, tuple]], int]]:
+    """Agrupa tarefas (tipo, item, custo) em lotes de pelo menos `target` bytes."""
+    batch, cost = [], 0
+    for kind, item, task_cost in tasks:
+        batch.append((kind, item))
+        cost += task_cost
+        if cost >= target:
+            yield batch, cost
+            batch, cost = [], 0
+    if batch:
+        yield batch, cost
+
+def _plan_record_groups(spans: Iterable[Tuple[int, int]], target: int) -> Iterator[Tuple[int, int]]:
+    """
+    Agrupa registros vizinhos (faixas de bytes) até `target` bytes; registros maiores que
+    o alvo ficam sozinhos. Cada grupo é uma tarefa de leitura no worker.
+    """
+    start = end = None
+    for a, b in spans:
+        if b - a >= target:
+            if start is not None:
+                yield start, end
+            yield a, b
+            start = None
+            continue
+        if start is None:
+            start = a
+        end = b
+        if end - start >= target:
+            yield start, end
+            start = None
+    if start is not None:
+        yield start, end
+
+def _bounded_map(pool, batches, max_tasks: int, max_bytes: Optional[int], stop=None) -> Iterator[Tuple[str, tuple]]:
+    """
+    Submete os lotes mantendo no máximo `max_tasks` lotes e `max_bytes` em voo, e entrega
+    os resultados na ordem de submissão assim que chegam. O primeiro lote sempre é aceito,
+    então um único registro maior que o limite ainda é processado.
+    Com `stop` (ex.: `threading.Event`) ligado, a espera termina e nada mais é entregue;
+    ao parar ou ser fechado, os lotes ainda não iniciados são cancelados no pool.
+    """
+    pending = deque()
+    in_flight = 0
+    try:
+        for batch, cost in batches:
+            while pending and (len(pending) >= max_tasks or (max_bytes is not None and in_flight + cost > max_bytes)):
+                # O lote só sai da fila depois de pronto: se a espera parar, ele também é cancelado
+                if not _wait_result(pending[0][0], stop): return
+                future, done_cost = pending.popleft()
+                in_flight -= done_cost
+                yield from future.result()
+            if stop is not None and stop.is_set(): return
+            pending.append((pool.submit(_run_batch, batch), cost))
+            in_flight += cost
+        while pending:
+            if not _wait_result(pending[0][0], stop): return
+            yield from pending.popleft()[0].result()
+    finally:
+        for future, _ in pending:
+            future.cancel()
+
+def _wait_result(future, stop) -> bool:
+    """Espera o lote consultando `stop` a cada `_STOP_POLL_SECONDS`; False se parou antes."""
+    while stop is not None and not stop.is_set():
+        if concurrent.futures.wait([future], timeout=_STOP_POLL_SECONDS).done:
+            return True
+    return stop is None
+
+def iter_fasta_parallel(
+    file_path: str,
+    window: int = 0,
+    step: int = 0,
+    cpg: bool = False,
+    max_workers: int = None,
+    kernel: str = DEFAULT_KERNEL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    worker_parsing: bool = False,
+    executor: concurrent.futures.Executor = None,
+    max_memory: Optional[int] = None,
+    executor_kind: str = DEFAULT_EXECUTOR,
+    memo: Optional[SequenceMemo] = None
+) -> Iterator[Tuple[str, float, List[CpGIsland], List[float]]]:
+    """
+    Versão em fluxo de `process_fasta_parallel`: produz (id, GC, ilhas, janelas) na ordem do
+    arquivo assim que cada registro termina, sem acumular resultados.
+    A leitura só avança enquanto os dados em voo (sequências enviadas, blocos compartilhados e
+    janelas reservadas) cabem em `max_memory` bytes; o limite é aproximado (um registro a mais).
+    Lotes são formados por total de bases, com alvo ajustado ao tamanho do arquivo.
+    `executor_kind` escolhe processos, threads ou "auto" quando nenhum `executor` é fornecido.
+    Com `memo`, registros já vistos (ou idênticos a um em voo) não são despachados; a leitura
+    nos workers (`worker_parsing`) não passa pelo memo, pois as sequências não chegam aqui.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if executor is None:
+        executor_kind = resolve_executor(executor_kind, kernel, [file_path])
+    else:
+        executor_kind = _executor_kind(executor)
+    target = _batch_target(os.path.getsize(file_path), max_workers)
+    
+    if worker_parsing and not is_gzip(file_path):
+        yield from _iter_worker_parsed(file_path, window, step, cpg, max_workers, kernel, executor, max_memory, target, executor_kind)
+        return
+    
+    # Entradas BGZF são descomprimidas no mesmo pool que analisa os registros
+    with _worker_pool(executor, max_workers, executor_kind) as pool:
+        yield from iter_records_parallel(
+            read_fasta(file_path, max_workers, pool), window, step, cpg, max_workers, kernel, chunk_size, pool,
+            max_memory, executor_kind, memo, target
+        )
+
+def _executor_kind(executor: concurrent.futures.Executor) -> str:
+    return "threads" if isinstance(executor, concurrent.futures.ThreadPoolExecutor) else "processes"
+
+def iter_records_parallel(
+    records: Iterable[Tuple[str, str]],
+    window: int = 0,
+    step: int = 0,
+    cpg: bool = False,
+    max_workers: int = None,
+    kernel: str = DEFAULT_KERNEL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: concurrent.futures.Executor = None,
+    max_memory: Optional[int] = None,
+    executor_kind: str = DEFAULT_EXECUTOR,
+    memo: Optional[SequenceMemo] = None,
+    batch_target: int = _BATCH_MIN_BYTES,
+    stop=None
+) -> Iterator[Tuple[str, float, List[CpGIsland], List[float]]]:
+    """
+    Núcleo de `iter_fasta_parallel` para registros (id, sequência) de qualquer origem, como
+    uploads já em memória. `executor_kind` deve vir resolvido ("processes" ou "threads").
+    Com `stop` ligado (ou fechando o gerador), a espera termina em até `_STOP_POLL_SECONDS`,
+    os lotes ainda na fila do pool são cancelados e os blocos compartilhados liberados.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if executor is not None:
+        executor_kind = _executor_kind(executor)
+    max_tasks = max_workers * _BATCHES_PER_WORKER
+    iterator = iter(records)
+    target = batch_target
+    
+    # Registros em memória compartilhada, na ordem de despacho: (id, bloco, referência, nº de tarefas)
+    shared_records = deque()
+    # Ordem de entrega: ("task", id, chave) despachados, ("memo", resultado) e ("dup", id, chave) resolvidos no memo
+    order = deque()
+    # Chave -> nº de duplicatas esperando um registro idêntico ainda em voo; resultado retido para elas
+    dispatched, pinned = {}, {}
+    
+    def generate_tasks():
+        for seq_id, sequence in iterator:
+            key = None
+            if memo is not None:
+                key = memo.key(sequence, window, step, cpg, kernel)
+                if key in dispatched:
+                    dispatched[key] += 1
+                    memo.count_hit()
+                    order.append(("dup", seq_id, key))
+                    continue
+                cached = memo.get(key)
+                if cached is not None:
+                    order.append(("memo", (seq_id,) + cached))
+                    continue
+                dispatched[key] = 0
+            order.append(("task", seq_id, key))
+            n = len(sequence)
+            split = bool(chunk_size) and n > chunk_size
+            n_windows = window_count(n, window, step)
+            # Threads já compartilham a memória: só registros divididos usam blocos compartilhados
+            if not split and (n < SHARED_MEMORY_MIN_SIZE or executor_kind == "threads"):
+                yield "seq", (seq_id, sequence, window, step, cpg, kernel), n + n_windows * _RESULT_WINDOW_SIZE
+                continue
+            shm, handle = share_sequence(sequence, n_windows)
+            cost = shm.size + n_windows * _RESULT_WINDOW_SIZE
+            if not split:
+                shared_records.append((seq_id, shm, handle, 1))
+                yield "shared", (seq_id, handle, window, step, cpg, kernel), cost
+                continue
+            plan = plan_chunks(n, chunk_size, window, step, cpg)
+            shared_records.append((seq_id, shm, handle, len(plan)))
+            # O bloco só é liberado quando o último pedaço volta: o custo fica com ele
+            for k, (start, core_end, fetch_end) in enumerate(plan):
+                yield "chunk", (seq_id, handle, start, core_end, fetch_end, window, step, cpg, kernel), cost if k == len(plan) - 1 else 0
+    
+    def resolved():
+        """Entrega os registros resolvidos no memo que antecedem o próximo despachado."""
+        while order and order[0][0] != "task":
+            entry = order.popleft()
+            if entry[0] == "memo":
+                yield entry[1]
+                continue
+            _, seq_id, key = entry
+            yield (seq_id,) + pinned[key]
+            dispatched[key] -= 1
+            if not dispatched[key]:
+                del dispatched[key], pinned[key]
+    
+    def deliver(record):
+        yield from resolved()
+        _, _, key = order.popleft()
+        if key is not None:
+            memo.put(key, *record[1:])
+            if dispatched[key]:
+                pinned[key] = record[1:]
+            else:
+                del dispatched[key]
+        yield record
+    
+    parts = []
+    try:
+        with _worker_pool(executor, max_workers, executor_kind) as pool:
+            for kind, out in _bounded_map(pool, _batched(generate_tasks(), target), max_tasks, max_memory, stop):
+                if kind == "seq":
+                    yield from deliver(out)
+                    continue
+                # A ordem é preservada: as tarefas de um registro chegam consecutivas
+                if kind == "chunk":
+                    parts.append(out[1:])
+                seq_id, shm, handle, total = shared_records[0]
+                if kind == "chunk" and len(parts) < total:
+                    continue
+                shared_records.popleft()
+                if kind == "chunk":
+                    sequence = read_sequence(shm, 0, handle.length) if cpg else ""
+                    analysis = merge_chunk_scans(seq_id, handle.length, parts, sequence, cpg)
+                    gc, islands = analysis.gc_percent, analysis.cpg_islands
+                    parts = []
+                else:
+                    _, gc, islands, _ = out
+                windows = read_windows(shm, handle)
+                release(shm)
+                yield from deliver((seq_id, gc, islands, windows))
+            yield from resolved()
+    finally:
+        for _, shm, _, _ in shared_records:
+            release(shm)
+
+def _record_spans(file_path: str) -> Iterator[Tuple[int, int]]:
+    """Faixas de bytes dos registros: do `.fai` atualizado, se houver, senão de uma pré-varredura."""
+    if not fai_is_current(file_path):
+        yield from iter_record_spans(file_path)
+        return
+    with IndexedFasta(file_path) as fasta:
+        yield from fasta.record_spans()
+
+def _iter_worker_parsed(file_path, window, step, cpg, max_workers, kernel, executor, max_memory, target, executor_kind):
+    """
+    Leitura nos workers com escalonamento por tamanho: uma pré-varredura em fluxo estima o
+    tamanho de cada registro, registros pequenos são agrupados por total de bases e, dentro
+    de uma janela à frente do próximo grupo a entregar, os grupos são despachados do maior
+    para o menor, para que todos os workers terminem juntos.
+    Os resultados são reordenados e entregues na ordem do arquivo; a janela (no máximo
+    `_REORDER_GROUPS_PER_WORKER` grupos por worker e `max_memory` bytes) limita o que fica
+    retido esperando um grupo anterior.
+    """
+    groups = _plan_record_groups(_record_spans(file_path), target)
+    max_tasks = max_workers * _BATCHES_PER_WORKER
+    lookahead = max(max_tasks, max_workers * _REORDER_GROUPS_PER_WORKER)
+    window_groups = deque()  # (início, fim) dos grupos na janela, a partir de next_key
+    window_bytes = 0
+    candidates = []          # heap (-tamanho, chave) dos grupos da janela ainda não despachados
+    pending, ready = {}, {}
+    next_key = 0
+    exhausted = False
     
-    gc_percent = calculate_gc_percentage(sequence)
+    def extend_window():
+        nonlocal window_bytes, exhausted
+        while not exhausted and len(window_groups) < lookahead:
+            if window_groups and max_memory is not None and window_bytes >= max_memory:
+                return
+            group = next(groups, None)
+            if group is None:
+                exhausted = True
+                return
+            heapq.heappush(candidates, (group[0] - group[1], next_key + len(window_groups), group))
+            window_groups.append(group)
+            window_bytes += group[1] - group[0]
     
-    islands = []
-    if cpg:
-        islands = detect_cpg_islands(sequence)
-        
-    windows = []
-    if window > 0:
-        actual_step = step if step > 0 else window
-        windows = calculate_sliding_window(sequence, window, actual_step)
-        
-    return seq_id, gc_percent, islands, windows
+    with _worker_pool(executor, max_workers, executor_kind) as pool:
+        try:
+            while True:
+                extend_window()
+                while candidates and len(pending) < max_tasks:
+                    _, key, (start, end) = heapq.heappop(candidates)
+                    batch = [("shard", (file_path, start, end, window, step, cpg, kernel))]
+                    pending[pool.submit(_run_batch, batch)] = key
+                if not pending:
+                    return
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    [(_, ready[pending.pop(future)])] = future.result()
+                while next_key in ready:
+                    start, end = window_groups.popleft()
+                    window_bytes -= end - start
+                    next_key += 1
+                    yield from ready.pop(next_key - 1)
+        finally:
+            for future in pending:
+                future.cancel()
 
 def process_fasta_parallel(
     file_path: str, 
     window: int = 0, 
     step: int = 0, 
     cpg: bool = False, 
-    max_workers: int = None
+    max_workers: int = None,
+    kernel: str = DEFAULT_KERNEL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    worker_parsing: bool = False,
+    executor: concurrent.futures.Executor = None,
+    max_memory: Optional[int] = None,
+    executor_kind: str = DEFAULT_EXECUTOR,
+    memo: Optional[SequenceMemo] = None
 ) -> Tuple[Dict[str, float], Dict[str, List[CpGIsland]], Dict[str, List[float]]]:
     """
     Despacha a leitura FASTA através de `os.cpu_count()` ou max_workers definidos.
     O iterador do Biopython aciona via generator (prevenindo OOM em arquivos Gigantes),
     e o executor mapeia a rotina pura algébrica sobre os núcleos disponíveis.
+    Registros a partir de `SHARED_MEMORY_MIN_SIZE` trafegam por memória compartilhada, e os
+    maiores que `chunk_size` são divididos em pedaços sobrepostos e costurados de volta,
+    com resultado idêntico ao processamento serial.
+    Com `worker_parsing`, arquivos não comprimidos são divididos em faixas de bytes alinhadas
+    aos cabeçalhos e cada worker interpreta a sua; o processo principal só reúne os resultados.
+    Um `executor` já existente (ver `create_worker_pool`) é reaproveitado e não é encerrado.
+    Para não acumular tudo em memória, consuma `iter_fasta_parallel` diretamente.
     """
-    if max_workers is None:
-        max_workers = os.cpu_count() or 1
-        
     results = {}
     all_islands = {}
     all_windows = {}
-    
-    iterator = read_fasta(file_path)
-    
-    def generate_tasks():
-        for seq_id, sequence in iterator:
-            yield (seq_id, sequence, window, step, cpg)
-            
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # chunkSize agrupa processos em lotes para minimizar o overhead de pickle e troca de IPC
-        for seq_id, gc, islands, windows in executor.map(_process_single_sequence, generate_tasks(), chunksize=10):
-            results[seq_id] = gc
-            if cpg:
-                all_islands[seq_id] = islands
-            if window > 0:
-                all_windows[seq_id] = windows
+    records = iter_fasta_parallel(
+        file_path, window, step, cpg, max_workers, kernel, chunk_size, worker_parsing, executor, max_memory,
+        executor_kind, memo
+    )
+    for seq_id, gc, islands, windows in records:
+        results[seq_id] = gc
+        if cpg:
+            all_islands[seq_id] = islands
+        if window > 0:
+            all_windows[seq_id] = windows
                 
     return results, all_islands, all_windows
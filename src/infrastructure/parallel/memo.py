@@ -0,0 +1,65 @@
+"""
+Memoização por registro: resultados indexados pelo hash da sequência e pelos parâmetros.
+Registros idênticos (pangenomas, amplicons) ou repetidos entre arquivos da mesma execução
+custam só o hash; a consulta acontece antes de a tarefa ir para um worker.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+# Custo fixo estimado por entrada (objetos Python, chave, nó do dicionário)
+_ENTRY_OVERHEAD = 256
+_ISLAND_SIZE = 32
+_WINDOW_SIZE = 4
+
+class SequenceMemo:
+    """LRU de (GC, ilhas, janelas) limitado a `max_bytes` estimados; seguro entre threads."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[tuple, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(sequence: str, window: int, step: int, cpg: bool, kernel: str) -> Hashable:
+        digest = hashlib.blake2b(sequence.encode("ascii", "replace"), digest_size=16).digest()
+        return digest, len(sequence), window, step, bool(cpg), kernel
+
+    def fits(self, window_count: int) -> bool:
+        """Um resultado com tantas janelas cabe no orçamento? (evita acumular janelas à toa)."""
+        return window_count * _WINDOW_SIZE + _ENTRY_OVERHEAD <= self.max_bytes
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def count_hit(self):
+        """Acerto resolvido fora do LRU (duplicata de um registro ainda em voo)."""
+        with self._lock:
+            self.hits += 1
+
+    def put(self, key: Hashable, gc: float, islands, windows):
+        size = len(windows) * _WINDOW_SIZE + len(islands) * _ISLAND_SIZE + _ENTRY_OVERHEAD
+        if size > self.max_bytes: return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = ((gc, islands, windows), size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
@@ -0,0 +1,68 @@
+"""
+Transporte por memória compartilhada entre o dispatcher e os workers.
+A sequência é copiada uma única vez para um bloco `SharedMemory`; pelo pipe trafegam
+apenas o nome do bloco e deslocamentos. As janelas são gravadas pelos workers em uma
+área float32 reservada no mesmo bloco, sem voltar serializadas.
+"""
+
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, Tuple
+from src.domain.models import WINDOW_TYPECODE, window_array
+
+_WINDOW_ITEM_SIZE = array(WINDOW_TYPECODE).itemsize
+
+@dataclass(frozen=True)
+class SharedSequence:
+    """Referência serializável a uma sequência em memória compartilhada."""
+    name: str
+    length: int
+    windows_offset: int
+    windows_count: int
+
+def window_count(length: int, window: int, step: int) -> int:
+    """Número de janelas que a varredura produz (passo padrão = janela)."""
+    if window <= 0: return 0
+    return len(range(0, length - window + 1, step if step > 0 else window))
+
+def share_sequence(sequence: str, windows_count: int = 0) -> Tuple[shared_memory.SharedMemory, SharedSequence]:
+    """
+    Cria o bloco com a sequência (ASCII) seguida da área de janelas, alinhada ao tamanho do item.
+    O chamador é dono do bloco e deve liberá-lo com `release`.
+    """
+    raw = sequence.encode("ascii", "replace")
+    windows_offset = -(-len(raw) // _WINDOW_ITEM_SIZE) * _WINDOW_ITEM_SIZE
+    shm = shared_memory.SharedMemory(create=True, size=max(1, windows_offset + windows_count * _WINDOW_ITEM_SIZE))
+    shm.buf[:len(raw)] = raw
+    return shm, SharedSequence(shm.name, len(raw), windows_offset, windows_count)
+
+@contextmanager
+def attach(handle: SharedSequence) -> Iterator[shared_memory.SharedMemory]:
+    """Abre o bloco no worker; fecha (sem remover) ao sair."""
+    shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        yield shm
+    finally:
+        shm.close()
+
+def read_sequence(shm: shared_memory.SharedMemory, start: int, end: int) -> str:
+    return bytes(shm.buf[start:end]).decode("ascii")
+
+def write_windows(shm: shared_memory.SharedMemory, handle: SharedSequence, first: int, windows: Iterable[float]):
+    """Grava as janelas a partir do índice `first` da área reservada."""
+    if not isinstance(windows, array) or windows.typecode != WINDOW_TYPECODE:
+        windows = window_array(windows)
+    if not windows: return
+    start = handle.windows_offset + first * _WINDOW_ITEM_SIZE
+    shm.buf[start:start + len(windows) * _WINDOW_ITEM_SIZE] = memoryview(windows).cast("B")
+
+def read_windows(shm: shared_memory.SharedMemory, handle: SharedSequence) -> array:
+    start = handle.windows_offset
+    return window_array(bytes(shm.buf[start:start + handle.windows_count * _WINDOW_ITEM_SIZE]))
+
+def release(shm: shared_memory.SharedMemory):
+    """Fecha e remove o bloco (lado dono)."""
+    shm.close()
+    shm.unlink()
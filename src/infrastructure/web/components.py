@@ -2,11 +2,16 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import matplotlib.pyplot as plt
+import hashlib
 import os
-from Bio import SeqIO
-from src.domain.analysis import calculate_gc_percentage, calculate_sliding_window, detect_cpg_islands
+import threading
+from collections import OrderedDict
+from src.domain.kernels import DEFAULT_KERNEL, KERNEL_NAMES
 from src.domain.statistics import calculate_descriptive_stats
+from src.infrastructure.io.zoomtrack import downsample
+from src.infrastructure.parallel.dispatcher import create_worker_pool
 from src.infrastructure.plotting.adapters import plot_gc_distribution
+from src.infrastructure.web.jobs import AnalysisJob
 
 def render_sidebar():
     """Renderiza a barra lateral e retorna as configurações."""
@@ -21,37 +26,173 @@ def render_sidebar():
             w = st.number_input("Janela (bp)", min_value=10, value=100)
             s = st.number_input("Passo (bp)", min_value=1, value=50)
         do_cpg = st.checkbox("Detecção de Ilhas CpG", value=False)
-    return files, do_sw, w, s, do_cpg
+        kernel = st.selectbox("Kernel de Cálculo", KERNEL_NAMES, index=KERNEL_NAMES.index(DEFAULT_KERNEL))
+    return files, do_sw, w, s, do_cpg, kernel
 
-def process_uploads(uploaded_files, do_sw, win_size, step_size, do_cpg):
-    """Processa arquivos carregados."""
+# Orçamento dos resultados por upload mantidos entre reruns (estimativa em bytes)
+UPLOAD_CACHE_BYTES = 512 << 20
+# DataFrames/CSV guardados por conjunto de resultados
+_FRAME_CACHE_ENTRIES = 8
+# Digests de upload lembrados por file_id (uploads mais antigos voltam a ser lidos)
+_DIGEST_CACHE_ENTRIES = 256
+# Análise em segundo plano: pool do dashboard e intervalo de atualização do progresso
+WEB_EXECUTOR = "processes"
+WEB_WORKERS = None  # todos os núcleos
+REFRESH_SECONDS = 0.5
+# Pontos por gráfico de janelas (~largura do gráfico em pixels)
+CHART_POINTS = 1000
+
+class _UploadCache:
+    """
+    LRU de análises por arquivo enviado, chaveado por digest do conteúdo + parâmetros.
+    Compartilhado entre reruns e sessões do servidor; os valores são somente leitura.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, records):
+        size = sum(200 + len(windows) * 4 + len(islands) * 32 for _, _, windows, islands in records)
+        if size > self.max_bytes: return
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (records, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._size -= self._entries.popitem(last=False)[1][1]
+
+@st.cache_resource(show_spinner=False)
+def _upload_cache() -> _UploadCache:
+    return _UploadCache(UPLOAD_CACHE_BYTES)
+
+@st.cache_resource(max_entries=_DIGEST_CACHE_ENTRIES, show_spinner=False)
+def _cached_digest(file_id: str, _up) -> bytes:
+    """Digest por file_id do Streamlit: cada upload é lido para hash uma única vez."""
+    return _hash_upload(_up)
+
+def _hash_upload(up) -> bytes:
+    return hashlib.blake2b(up.getvalue(), digest_size=16).digest()
+
+def _content_digest(up) -> bytes:
+    file_id = getattr(up, "file_id", None)
+    return _cached_digest(file_id, up) if isinstance(file_id, str) else _hash_upload(up)
+
+def upload_key(up, do_sw, win_size, step_size, do_cpg, kernel_name=DEFAULT_KERNEL) -> str:
+    """Digest do conteúdo do upload + parâmetros que alteram o resultado."""
+    digest = hashlib.blake2b(_content_digest(up), digest_size=16)
+    digest.update(repr((win_size if do_sw else 0, step_size if do_sw else 0, bool(do_cpg), kernel_name)).encode())
+    return digest.hexdigest()
+
+def analysis_key(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name=DEFAULT_KERNEL) -> str:
+    """Chave do conjunto de uploads (nomes entram porque compõem os IDs exibidos)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for up in uploaded_files:
+        digest.update(f"{up.name}\0{upload_key(up, do_sw, win_size, step_size, do_cpg, kernel_name)}\0".encode())
+    return digest.hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def _analysis_pool():
+    """Pool aquecido do dashboard: criado uma vez por servidor e compartilhado entre sessões."""
+    return create_worker_pool(WEB_WORKERS, kind=WEB_EXECUTOR)
+
+def start_analysis(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name=DEFAULT_KERNEL) -> AnalysisJob:
+    """Dispara a análise dos uploads em segundo plano; uploads já analisados vêm do cache."""
+    uploads = [(up.name, upload_key(up, do_sw, win_size, step_size, do_cpg, kernel_name), up.getvalue())
+               for up in uploaded_files]
+    return AnalysisJob(uploads, win_size if do_sw else 0, step_size, do_cpg, kernel_name,
+                       _analysis_pool(), WEB_WORKERS, cache=_upload_cache()).start()
+
+def session_analysis(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name=DEFAULT_KERNEL) -> AnalysisJob:
+    """
+    Análise da sessão para estes uploads e parâmetros: reaproveitada entre reruns enquanto a
+    chave não muda; uma chave nova cancela a análise anterior e inicia outra.
+    """
+    key = analysis_key(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name)
+    current = st.session_state.get("analysis_job")
+    if current is not None and current[0] == key:
+        return current[1]
+    if current is not None:
+        current[1].cancel()
+    job = start_analysis(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name)
+    st.session_state["analysis_job"] = (key, job)
+    return job
+
+def collect_results(job: AnalysisJob, multiple_files: bool):
+    """Resultados (completos ou parciais) do job no formato do dashboard."""
     results, sw_res, cpg_res = {}, {}, {}
+    for name, record_id, gc, windows, islands in job.snapshot():
+        uid = f"{name}::{record_id}" if multiple_files else record_id
+        results[uid] = gc
+        if job.window: sw_res[uid] = windows
+        if job.cpg: cpg_res[uid] = islands
+    return results, sw_res, cpg_res
+
+def render_analysis_status(job: AnalysisJob):
+    """Progresso por registro enquanto a análise roda, com botões de cancelar e retomar."""
+    if job.error is not None:
+        st.error(f"Erro na análise: {job.error}")
+    elif job.cancelled:
+        st.warning(f"Análise cancelada: {job.completed} de {job.total} registros exibidos.")
+        if st.button("Retomar análise"):
+            st.session_state.pop("analysis_job", None)
+            st.rerun()
+    elif not job.done:
+        st.progress(job.progress(), text=f"Analisando: {job.completed} de {job.total} registros")
+        if st.button("Cancelar análise"):
+            job.cancel()
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def render_live_analysis(job: AnalysisJob, multiple_files: bool):
+    """
+    Área que se atualiza sozinha enquanto a análise roda: progresso, cancelamento e um resumo
+    leve dos resultados parciais, sem rerun da página. Ao terminar (ou cancelar), um único
+    rerun da página monta o dashboard completo.
+    """
+    _render_live_analysis(job, multiple_files)
+
+def _render_live_analysis(job: AnalysisJob, multiple_files: bool):
+    if job.done or job.cancelled:
+        st.rerun()
+        return
+    render_analysis_status(job)
+    results, _, _ = collect_results(job, multiple_files)
+    if results:
+        _render_kpis(calculate_descriptive_stats(list(results.values())))
+        st.dataframe(_results_frame(results), use_container_width=True)
+
+def process_uploads(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name=DEFAULT_KERNEL):
+    """Processa arquivos carregados e espera o fim (mesmo caminho em segundo plano do dashboard)."""
+    job = start_analysis(uploaded_files, do_sw, win_size, step_size, do_cpg, kernel_name)
     prog = st.progress(0)
-    for i, up in enumerate(uploaded_files):
-        # Usando processamento em memória para evitar arquivos temporários se possível, 
-        # mas Biopython SeqIO.parse prefere handle ou path.
-        from io import StringIO
-        stringio = StringIO(up.getvalue().decode("utf-8"))
-        for record in SeqIO.parse(stringio, "fasta"):
-            uid = f"{up.name}::{record.id}" if len(uploaded_files) > 1 else record.id
-            results[uid] = calculate_gc_percentage(str(record.seq))
-            if do_sw: sw_res[uid] = calculate_sliding_window(str(record.seq), win_size, step_size)
-            if do_cpg: cpg_res[uid] = detect_cpg_islands(str(record.seq))
-        prog.progress((i + 1) / len(uploaded_files))
+    while not job.wait(REFRESH_SECONDS):
+        prog.progress(job.progress())
     prog.empty()
-    return results, sw_res, cpg_res
+    if job.error is not None:
+        raise job.error
+    return collect_results(job, len(uploaded_files) > 1)
 
-def render_main_dashboard(results, sw_res, cpg_res, sw_params):
-    """Renderiza o dashboard principal."""
+def render_main_dashboard(results, sw_res, cpg_res, sw_params, cache_key=None):
+    """Renderiza o dashboard principal (`cache_key` identifica os resultados para reaproveitar tabelas)."""
     stats = calculate_descriptive_stats(list(results.values()))
     _render_kpis(stats)
     st.divider()
     
     tabs = st.tabs(["📈 Visão Geral", "🔍 Individual", "🧬 Avançada", "📄 Dados Brutos"])
     with tabs[0]: _render_overview_tab(results, stats)
-    with tabs[1]: _render_details_tab(results)
+    with tabs[1]: _render_details_tab(results, cache_key)
     with tabs[2]: _render_advanced_tab(sw_res, cpg_res, sw_params)
-    with tabs[3]: _render_raw_tab(results)
+    with tabs[3]: _render_raw_tab(results, cache_key)
 
 def _render_kpis(stats):
     st.subheader("📊 Relatório de Estatísticas")
@@ -73,8 +214,20 @@ def _render_overview_tab(results, stats):
     st.pyplot(fig)
     plt.close(fig)
 
-def _render_details_tab(results):
-    df = pd.DataFrame(list(results.items()), columns=['ID', 'GC (%)'])
+@st.cache_resource(max_entries=_FRAME_CACHE_ENTRIES, show_spinner=False)
+def _cached_frame(cache_key: str, _results) -> pd.DataFrame:
+    """DataFrame dos resultados, montado uma vez por chave (somente leitura: filtros geram cópias)."""
+    return _results_frame(_results)
+
+@st.cache_resource(max_entries=_FRAME_CACHE_ENTRIES, show_spinner=False)
+def _cached_csv(cache_key: str, _results) -> bytes:
+    return _results_frame(_results).to_csv(index=False).encode('utf-8')
+
+def _results_frame(results) -> pd.DataFrame:
+    return pd.DataFrame(list(results.items()), columns=['ID', 'GC (%)'])
+
+def _render_details_tab(results, cache_key=None):
+    df = _cached_frame(cache_key, results) if cache_key else _results_frame(results)
     c1, c2 = st.columns(2)
     min_v = c1.slider("Mínimo %", 0.0, 100.0, 0.0)
     max_v = c2.slider("Máximo %", 0.0, 100.0, 100.0)
@@ -88,10 +241,7 @@ def _render_advanced_tab(sw_res, cpg_res, sw_params):
     if sw_res:
         st.subheader("🪟 Janela Deslizante")
         sel = st.selectbox("Sequência", list(sw_res.keys()))
-        step = sw_params['step']
-        sw_df = pd.DataFrame({'Posição': [i*step for i in range(len(sw_res[sel]))], 'GC': sw_res[sel]})
-        chart = alt.Chart(sw_df).mark_line().encode(x='Posição', y=alt.Y('GC', scale=alt.Scale(domain=[0, 100])))
-        st.altair_chart(chart, use_container_width=True)
+        st.altair_chart(_window_chart(sw_res[sel], sw_params['window'], sw_params['step']), use_container_width=True)
     if cpg_res:
         st.subheader("🏝️ Ilhas CpG")
         for sid, isls in cpg_res.items():
@@ -99,6 +249,25 @@ def _render_advanced_tab(sw_res, cpg_res, sw_params):
                 data = [[i.start, i.end, i.gc_percent, i.oe_ratio] for i in isls]
                 st.table(pd.DataFrame(data, columns=['Início', 'Fim', 'GC %', 'O/E']))
 
-def _render_raw_tab(results):
-    df = pd.DataFrame(list(results.items()), columns=['ID', 'GC (%)'])
-    st.download_button("📥 Baixar CSV", df.to_csv(index=False).encode('utf-8'), "results.csv", "text/csv")
+def _window_chart(windows, window, step):
+    """
+    Gráfico da região visível com no máximo CHART_POINTS pontos: média por bin e faixa
+    mínimo-máximo, para picos e vales não sumirem. Com mais janelas que pontos, um
+    controle de região faz zoom e pan; cada mudança só reagrega as janelas visíveis.
+    """
+    step = step if step > 0 else window
+    start, end = 0, None
+    if len(windows) > CHART_POINTS:
+        length = (len(windows) - 1) * step + window
+        start, end = st.slider("Região (bp)", 0, length, (0, length), step=step)
+    bins = downsample(windows, window, step, start, end, CHART_POINTS)
+    frame = pd.DataFrame({'Posição': bins.starts, 'GC': bins.mean, 'Mín': bins.min, 'Máx': bins.max})
+    base = alt.Chart(frame).encode(x=alt.X('Posição', scale=alt.Scale(zero=False)))
+    line = base.mark_line().encode(y=alt.Y('GC', scale=alt.Scale(domain=[0, 100])))
+    if (frame['Mín'] == frame['Máx']).all():
+        return line  # uma janela por ponto: não há faixa
+    return base.mark_area(opacity=0.3).encode(y='Mín', y2='Máx') + line
+
+def _render_raw_tab(results, cache_key=None):
+    data = _cached_csv(cache_key, results) if cache_key else _results_frame(results).to_csv(index=False).encode('utf-8')
+    st.download_button("📥 Baixar CSV", data, "results.csv", "text/csv")
@@ -0,0 +1,100 @@
+"""
+Análise de uploads em segundo plano: uma thread consome `iter_records_parallel` sobre um
+pool de workers e publica cada registro assim que ele termina, para o dashboard mostrar
+progresso por registro, resultados parciais e permitir cancelar sem travar o script.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+from src.infrastructure.io.fasta import parse_fasta_bytes
+from src.infrastructure.parallel.dispatcher import iter_records_parallel
+
+def count_records(data: bytes) -> int:
+    """Nº de cabeçalhos do FASTA em memória (denominador do progresso)."""
+    return data.count(b"\n>") + data.startswith(b">")
+
+class AnalysisJob:
+    """
+    Analisa uploads `[(nome, chave, bytes)]` na ordem recebida. Uploads presentes em `cache`
+    (get/put por chave, como `_UploadCache`) são entregues direto; os demais vão ao `executor`
+    e só entram no cache se terminarem sem cancelamento.
+    """
+
+    def __init__(self, uploads: List[Tuple[str, str, bytes]], window: int, step: int, cpg: bool,
+                 kernel: str, executor, max_workers: Optional[int] = None, cache=None):
+        self.window, self.step, self.cpg, self.kernel = window, step, cpg, kernel
+        self.total = sum(count_records(data) for _, _, data in uploads)
+        self.completed = 0
+        self.error: Optional[BaseException] = None
+        self._uploads = uploads
+        self._executor = executor
+        self._max_workers = max_workers
+        self._cache = cache
+        self._records: List[tuple] = []  # (nome, id, GC, janelas, ilhas)
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="gcscan-analysis", daemon=True)
+
+    def start(self) -> "AnalysisJob":
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """
+        Pede a parada: a espera pelo registro em andamento é interrompida, os lotes ainda
+        na fila do pool compartilhado são cancelados e nenhum outro é despachado.
+        """
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return self.done
+
+    def progress(self) -> float:
+        return 1.0 if self.done or not self.total else min(1.0, self.completed / self.total)
+
+    def snapshot(self) -> List[tuple]:
+        """Registros prontos até agora, na ordem dos arquivos."""
+        with self._lock:
+            return list(self._records)
+
+    def _run(self):
+        try:
+            for name, key, data in self._uploads:
+                records = self._cache.get(key) if self._cache is not None else None
+                if records is not None:
+                    self._publish(name, records)
+                    continue
+                records = []
+                stream = self._analyze(data)
+                try:
+                    for seq_id, gc, islands, windows in stream:
+                        if self._cancel.is_set(): return
+                        records.append((seq_id, gc, windows, islands))
+                        self._publish(name, records[-1:])
+                finally:
+                    stream.close()
+                if self._cancel.is_set(): return
+                if self._cache is not None:
+                    self._cache.put(key, records)
+        except Exception as exc:  # exibido pelo dashboard; a thread não tem a quem propagar
+            self.error = exc
+
+    def _analyze(self, data: bytes):
+        return iter_records_parallel(
+            parse_fasta_bytes(data), self.window, self.step, self.cpg, self._max_workers, self.kernel,
+            executor=self._executor, stop=self._cancel
+        )
+
+    def _publish(self, name: str, records: List[tuple]):
+        with self._lock:
+            self._records.extend((name,) + record for record in records)
+            self.completed += len(records)
@@ -81,3 +81,49 @@ def test_expand_and_validate_returns_none_when_criteria_unmet():
     seq = "A" * 100 + "GC" * 30 + "A" * 100
     result = _expand_and_validate(seq, 100, 200, 50.0, 0.6)
     assert result is None
+
+
+def test_sliding_window_matches_naive_slicing():
+    """Prefix-sum windows must be identical to slicing each window."""
+    from src.domain.analysis import calculate_gc_percentage
+    sequence = "acgtNNGCGCatatGGCCtagc" * 7
+    for win, step in [(5, 1), (7, 3), (13, 13), (50, 4)]:
+        naive = [calculate_gc_percentage(sequence[i:i+win])
+                 for i in range(0, len(sequence)-win+1, step)]
+        assert calculate_sliding_window(sequence, win, step) == naive
+
+
+def test_gc_index_range_queries():
+    """Any range is answered from the cumulative index with two lookups."""
+    from src.domain.analysis import build_gc_index, gc_percentage_in_range
+    idx = build_gc_index("AAGGccTT")
+    assert list(idx) == [0, 0, 0, 1, 2, 3, 4, 4, 4]
+    assert gc_percentage_in_range(idx, 2, 6) == 100.0
+    assert gc_percentage_in_range(idx, 0, 8) == 50.0
+    assert gc_percentage_in_range(idx, 3, 3) == 0.0
+
+
+def test_screen_cpg_seeds_matches_grid_check():
+    """Every position passing the seed screen satisfies the reference per-seed criterion."""
+    from src.domain.analysis import screen_cpg_seeds, _seed_passes
+    seq = ("AT" * 40 + "CGCGGC" * 20 + "TTAGCA" * 15) * 2
+    seeds = screen_cpg_seeds(seq)
+    assert seeds == [i for i in range(len(seq) - 49) if _seed_passes(seq, i, 50.0, 0.6)]
+    assert seeds
+
+
+def test_plan_chunks_aligns_cores_to_step_and_overlaps():
+    """Chunk cores tile the sequence on the window grid and reads overlap the next core."""
+    from src.domain.chunking import plan_chunks
+    plan = plan_chunks(1000, 250, win_size=40, step=30, cpg=True)
+    assert [core_start for core_start, _, _ in plan] == [0, 240, 480, 720, 960]
+    assert plan[0] == (0, 240, 289)
+    assert plan[-1] == (960, 1000, 1000)
+    assert plan_chunks(0, 100) == []
+
+
+def test_gc_and_oe_from_counts_matches_island_formulas():
+    from src.domain.analysis import gc_and_oe_from_counts
+    assert gc_and_oe_from_counts(2, 2, 2, 20) == (20.0, 10.0)
+    assert gc_and_oe_from_counts(3, 0, 0, 10) == (30.0, 0)
+    assert gc_and_oe_from_counts(0, 0, 0, 0) == (0.0, 0.0)
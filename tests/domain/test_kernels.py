@@ -0,0 +1,130 @@
+import pytest
+from src.domain.kernels import get_kernel, KERNEL_NAMES, DEFAULT_KERNEL
+from src.domain import analysis_numpy
+from src.domain.models import CpGIsland, CpGIslandTable, window_array
+
+SEQUENCES = [
+    "",
+    "ATGC",
+    "acgtNNgcGCatAT" * 20,
+    ("A" * 400) + ("CGCG" * 100) + ("A" * 400),
+    ("CGCGCGCGCG" * 25) + ("ATATATATAT" * 20) + ("GCGCGCGCGC" * 30),
+    "GGGCCC" * 40 + "TTAA" + "CGATCGCG" * 60 + "ATATTA" * 10,
+]
+
+def test_get_kernel_default_is_reference():
+    """The default kernel is the pure-Python reference."""
+    assert DEFAULT_KERNEL == "python"
+    assert get_kernel().name == "python"
+    assert set(KERNEL_NAMES) == {"python", "numpy"}
+
+def test_get_kernel_unknown_raises():
+    """Unknown kernel names are rejected."""
+    with pytest.raises(ValueError):
+        get_kernel("fortran")
+
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_numpy_kernel_matches_reference(sequence):
+    """Vectorized kernel must reproduce the reference output exactly."""
+    ref, vec = get_kernel("python"), get_kernel("numpy")
+    assert vec.gc_percentage(sequence) == ref.gc_percentage(sequence)
+    for win, step in [(1, 1), (10, 3), (50, 50)]:
+        assert vec.sliding_window(sequence, win, step) == ref.sliding_window(sequence, win, step)
+    for params in [(), (100, 55.0, 0.65), (20, 40.0, 0.3)]:
+        assert vec.cpg_islands(sequence, *params) == ref.cpg_islands(sequence, *params)
+
+def test_as_uint8_normalizes_case():
+    """The uint8 view is uppercased and accepts bytes as well as str."""
+    assert analysis_numpy.as_uint8("acGt").tobytes() == b"ACGT"
+    assert analysis_numpy.as_uint8(b"ggc").tobytes() == b"GGC"
+
+def test_numpy_seed_screen_matches_per_seed_check():
+    """One-pass screening flags exactly the seeds the reference would accept."""
+    sequence = ("ATTA" * 30 + "CGGC" * 20 + "GATC" * 15) * 4
+    arr = analysis_numpy.as_uint8(sequence)
+    screened = analysis_numpy._BaseCounts(arr).screen_seeds(50.0, 0.6)
+
+    expected = []
+    for i in range(len(sequence) - 50 + 1):
+        sub = sequence[i:i + 50]
+        g, c = sub.count("G"), sub.count("C")
+        oe = (sub.count("CG") * 50) / (c * g) if c * g > 0 else 0
+        if ((g + c) / 50) * 100 >= 50.0 and oe >= 0.6:
+            expected.append(i)
+    assert screened.tolist() == expected
+
+def test_numpy_cpg_walk_restarts_grid_after_island():
+    """Islands found after an off-grid island end are identical to the reference."""
+    sequence = "AT" * 60 + "CG" * 117 + "A" * 7 + "GCGC" * 80 + "TTAA" * 30 + "CG" * 103 + "A" * 3
+    assert get_kernel("numpy").cpg_islands(sequence) == get_kernel("python").cpg_islands(sequence)
+    assert len(get_kernel("python").cpg_islands(sequence)) == 3
+
+@pytest.mark.parametrize("name", KERNEL_NAMES)
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_scan_sequence_matches_separate_kernels(name, sequence):
+    """The fused scan returns what the three separate calls would."""
+    kernel = get_kernel(name)
+    analysis = kernel.scan("s1", sequence, 10, 4, True)
+    assert analysis.id == "s1"
+    assert analysis.gc_percent == kernel.gc_percentage(sequence)
+    assert analysis.sliding_window == window_array(kernel.sliding_window(sequence, 10, 4))
+    assert analysis.cpg_islands == kernel.cpg_islands(sequence)
+
+@pytest.mark.parametrize("name", KERNEL_NAMES)
+def test_scan_sequence_defaults(name):
+    """Without window/cpg only global GC is computed; step 0 falls back to the window size."""
+    kernel = get_kernel(name)
+    bare = kernel.scan("s1", "ggccAATT")
+    assert (bare.gc_percent, list(bare.sliding_window), bare.cpg_islands) == (50.0, [], [])
+    assert list(kernel.scan("s1", "GGCCAATT", 4, 0).sliding_window) == [100.0, 0.0]
+
+
+@pytest.mark.parametrize("name", KERNEL_NAMES)
+def test_scan_results_are_compact(name):
+    """Windows come back as a float32 buffer and islands as a columnar table."""
+    analysis = get_kernel(name).scan("s1", "A" * 100 + "CG" * 150 + "T" * 100, 7, 3, True)
+    assert analysis.sliding_window.typecode == "f" and analysis.sliding_window.itemsize == 4
+    assert isinstance(analysis.cpg_islands, CpGIslandTable)
+    assert analysis.cpg_islands.starts.tolist() == [100]
+
+
+def test_island_table_behaves_like_a_list():
+    """The struct-of-arrays table iterates, indexes, compares and pickles like List[CpGIsland]."""
+    import pickle
+    islands = [CpGIsland(0, 250, 60.0, 0.9), CpGIsland(400, 700, 55.5, 0.7)]
+    table = CpGIslandTable(islands)
+    assert len(table) == 2 and bool(table) and not CpGIslandTable()
+    assert list(table) == islands and table[1] == islands[1] and table[-1:] == islands[-1:]
+    assert table == islands and table != islands[:1]
+    assert pickle.loads(pickle.dumps(table)) == table
+    assert not hasattr(islands[0], "__dict__")
+
+
+@pytest.mark.parametrize("name", KERNEL_NAMES)
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_window_chunks_match_scan(name, sequence):
+    """Streaming window chunks concatenate to exactly the fused scan's windows."""
+    kernel = get_kernel(name)
+    chunks = list(kernel.window_chunks(sequence, 10, 3, chunk_windows=7))
+    assert all(len(chunk) <= 7 for chunk in chunks)
+    streamed = window_array()
+    for chunk in chunks:
+        streamed.extend(chunk)
+    assert streamed == kernel.scan("s1", sequence, 10, 3).sliding_window
+    assert list(kernel.window_chunks(sequence, 0, 3)) == []
+
+
+@pytest.mark.parametrize("name", KERNEL_NAMES)
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_scan_stream_matches_scan(name, sequence):
+    """The streaming scan gives the fused scan's GC and islands, and its windows as chunks."""
+    kernel = get_kernel(name)
+    expected = kernel.scan("s1", sequence, 10, 3, True)
+    analysis, chunks = kernel.scan_stream("s1", sequence, 10, 3, True, chunk_windows=7)
+    streamed = window_array()
+    for chunk in chunks:
+        assert len(chunk) <= 7
+        streamed.extend(chunk)
+    assert (analysis.gc_percent, list(analysis.cpg_islands)) == (expected.gc_percent, list(expected.cpg_islands))
+    assert streamed == expected.sliding_window
+    assert list(kernel.scan_stream("s1", sequence, 0, 3)[1]) == []
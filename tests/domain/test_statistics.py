@@ -14,3 +14,57 @@ def test_calculate_descriptive_stats():
 def test_calculate_descriptive_stats_empty():
     """Empty data should return empty dict or default values."""
     assert calculate_descriptive_stats([]) == {}
+
+def test_streaming_stats_matches_batch():
+    """Small streams are exact and agree with calculate_descriptive_stats."""
+    from src.domain.statistics import StreamingStats
+    data = [40.0, 60.0, 55.5, 31.25, 70.0, 48.0]
+    batch = calculate_descriptive_stats(data)
+    online = StreamingStats().extend(data).to_dict()
+    assert online["median"] == batch["median"]
+    assert online["min"] == batch["min"] and online["max"] == batch["max"]
+    assert online["count"] == batch["count"]
+    assert online["mean"] == pytest.approx(batch["mean"])
+    assert online["std_dev"] == pytest.approx(batch["std_dev"])
+
+def test_streaming_stats_merge_equals_single_pass():
+    """Merging per-worker accumulators equals accumulating everything in one."""
+    from src.domain.statistics import StreamingStats
+    values = [float((i * 37) % 101) for i in range(5000)]
+    whole = StreamingStats(capacity=64).extend(values)
+    parts = [StreamingStats(capacity=64).extend(values[i::3]) for i in range(3)]
+    merged = StreamingStats(capacity=64)
+    for part in parts:
+        merged.merge(part)
+    assert merged.count == whole.count == 5000
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.std_dev == pytest.approx(whole.std_dev)
+    assert (merged.min, merged.max) == (0.0, 100.0)
+    assert abs(merged.median - 50.0) <= 3.0
+
+def test_streaming_stats_sketch_is_bounded():
+    """Memory stays bounded by the sketch capacity per level, not by the stream size."""
+    from src.domain.statistics import StreamingStats
+    acc = StreamingStats(capacity=32).extend(float(i % 1000) for i in range(100_000))
+    assert sum(len(level) for level in acc._levels) <= 32 * len(acc._levels)
+    assert len(acc._levels) <= 14
+    assert abs(acc.quantile(0.25) - 250) <= 40
+    assert abs(acc.median - 500) <= 40
+
+def test_streaming_stats_empty():
+    """An empty accumulator reports no statistics and merges as identity."""
+    from src.domain.statistics import StreamingStats
+    acc = StreamingStats()
+    assert acc.to_dict() == {}
+    assert acc.merge(StreamingStats()).count == 0
+
+def test_streaming_stats_state_round_trip():
+    """to_state/from_state restore an accumulator that keeps merging like the original."""
+    import json
+    from src.domain.statistics import StreamingStats
+    acc = StreamingStats(capacity=16).extend(float(i % 37) for i in range(500))
+    restored = StreamingStats.from_state(json.loads(json.dumps(acc.to_state())))
+    assert restored.to_dict() == acc.to_dict()
+    other = StreamingStats(capacity=16).extend([1.0, 2.0])
+    assert restored.merge(other).to_dict() == acc.merge(other).to_dict()
+    assert StreamingStats.from_state(StreamingStats().to_state()).to_dict() == {}
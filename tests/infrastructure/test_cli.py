@@ -4,12 +4,28 @@ import pytest
 from unittest.mock import patch, MagicMock
 from main import main
 
+
+def _make_args(**overrides):
+    """CLI args with every flag the runner reads set explicitly (bare MagicMock attributes are truthy)."""
+    args = MagicMock()
+    flags = dict(
+        input=None, output_dir=None, parallel=False, workers=2, file_jobs=None, window=None, step=None,
+        cpg=False, kernel="python", chunk_size=0, worker_parsing=False, max_memory=None, executor="threads",
+        parquet=False, zoom_track=False, cache_dir=None, cache_max_size=None, clear_cache=False, memo_size=None,
+    )
+    flags.update(overrides)
+    for name, value in flags.items():
+        setattr(args, name, value)
+    return args
+
+
 def test_main_cli_help():
     with patch("sys.argv", ["main.py", "--help"]):
         with pytest.raises(SystemExit) as e:
             main()
         assert e.value.code == 0
 
+
 def test_main_cli_file(tmp_path):
     fasta_file = tmp_path / "test.fasta"
     fasta_file.write_text(">seq1\nATGC\n")
@@ -23,12 +39,14 @@ def test_main_cli_file(tmp_path):
     assert os.path.exists(output_dir / "test_gc.csv")
     assert os.path.exists(output_dir / "test_gc_analysis.png")
 
+
 def test_main_cli_not_found():
     with patch("sys.argv", ["main.py", "nonexistent.fasta"]):
         with pytest.raises(SystemExit) as e:
             main()
         assert e.value.code == 1
 
+
 def test_formatter():
     from src.infrastructure.cli.formatter import print_header, print_stats, print_cpg_islands
     from src.domain.models import CpGIsland
@@ -37,10 +55,10 @@ def test_formatter():
     print_cpg_islands("s1", [CpGIsland(0, 100, 50.0, 0.8)])
     print_cpg_islands("s1", [])
 
+
 def test_runner_no_files():
     from src.infrastructure.cli.runner import run_analysis
-    args = MagicMock()
-    args.input = "nonexistent_dir"
+    args = _make_args(input="nonexistent_dir")
     with patch("os.path.isfile", return_value=False), patch("os.path.isdir", return_value=True), patch("os.listdir", return_value=[]):
         run_analysis(args)
 
@@ -59,13 +77,17 @@ def test_process_single_file_parallel(tmp_path):
     fasta_file = tmp_path / "par.fasta"
     fasta_file.write_text(">s1\nATGCATGCATGC\n")
 
-    args = MagicMock()
-    args.parallel = True
-    args.window = 4
-    args.step = 4
-    args.cpg = True
-    args.workers = 1
-    args.output_dir = str(tmp_path / "out")
+    args = _make_args(
+        parallel=True,
+        window=4,
+        step=4,
+        cpg=True,
+        workers=1,
+        chunk_size=8,
+        max_memory=64,
+        executor="processes",
+        output_dir=str(tmp_path / "out"),
+    )
     os.makedirs(args.output_dir, exist_ok=True)
 
     _process_single_file(str(fasta_file), args)
@@ -78,12 +100,7 @@ def test_process_single_file_sequential_with_window_and_cpg(tmp_path):
     fasta_file = tmp_path / "seq.fasta"
     fasta_file.write_text(">s1\nATGCATGC\n")
 
-    args = MagicMock()
-    args.parallel = False
-    args.window = 4
-    args.step = 0
-    args.cpg = True
-    args.output_dir = str(tmp_path / "out")
+    args = _make_args(window=4, step=0, cpg=True, kernel="numpy", output_dir=str(tmp_path / "out"))
     os.makedirs(args.output_dir, exist_ok=True)
 
     _process_single_file(str(fasta_file), args)
@@ -93,3 +110,256 @@ def test_formatter_sliding_window_info():
     """Cover formatter.py line 17: print_sliding_window_info."""
     from src.infrastructure.cli.formatter import print_sliding_window_info
     print_sliding_window_info("seq1", 10)
+
+
+def test_run_analysis_directory_prints_run_summary(tmp_path, capsys):
+    """Per-file accumulators are merged into a run-wide summary for directory inputs."""
+    from src.infrastructure.cli.runner import run_analysis
+    (tmp_path / "a.fasta").write_text(">a1\nGGGG\n>a2\nATAT\n")
+    (tmp_path / "b.fa").write_text(">b1\nGCAT\n")
+
+    args = _make_args(input=str(tmp_path), output_dir=str(tmp_path / "out"))
+    run_analysis(args)
+
+    out = capsys.readouterr().out
+    assert "Resumo geral: 3 sequências" in out
+    assert "Média GC:   50.00%" in out
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_per_file_stats_are_exact(tmp_path, parallel):
+    """Per-file stats printed and plotted use the exact median, even past the sketch capacity."""
+    from src.infrastructure.cli.runner import run_analysis
+    values = ["GGGAAAAAAA"] * 3000 + ["GGGGGGGGGAAAAAAAAAAA"] * 2 + ["GGGGGGAAAA"] * 2999
+    (tmp_path / "a.fasta").write_text("".join(f">r{i}\n{seq}\n" for i, seq in enumerate(values)))
+    args = _make_args(input=str(tmp_path / "a.fasta"), output_dir=str(tmp_path / "out"), parallel=parallel)
+    with patch("src.infrastructure.cli.runner.print_stats") as printed, \
+            patch("src.infrastructure.cli.runner.plot_gc_distribution") as plot, \
+            patch("src.infrastructure.cli.runner._print_record"):
+        run_analysis(args)
+    assert printed.call_args_list[0][0][0]["median"] == 45.0
+    assert plot.call_args[0][1]["median"] == 45.0
+
+
+def test_run_analysis_parallel_directory_shares_one_pool(tmp_path, capsys):
+    """Directory runs in parallel mode reuse a single warm pool and export every file."""
+    from src.infrastructure.cli.runner import run_analysis
+    from src.infrastructure.parallel.dispatcher import create_worker_pool
+    (tmp_path / "a.fasta").write_text(">a1\nGGGG\n>a2\nATAT\n")
+    (tmp_path / "b.fa").write_text(">b1\nGCAT\n")
+    (tmp_path / "c.fna").write_text(">c1\nGCGCAT\n")
+
+    args = _make_args(input=str(tmp_path), output_dir=str(tmp_path / "out"), parallel=True, file_jobs=2)
+
+    with patch("src.infrastructure.cli.runner.create_worker_pool", wraps=create_worker_pool) as pool:
+        run_analysis(args)
+    assert pool.call_count == 1
+
+    out = capsys.readouterr().out
+    assert "Resumo geral: 4 sequências" in out
+    for name in ("a", "b", "c"):
+        assert (tmp_path / "out" / f"{name}_gc.csv").exists()
+        assert (tmp_path / "out" / f"{name}_gc_analysis.png").exists()
+
+
+def test_parse_size_units():
+    """--max-memory accepts plain bytes and K/M/G suffixes and rejects junk."""
+    import argparse
+    from src.infrastructure.cli.parser import parse_size
+    assert parse_size("1048576") == 1 << 20
+    assert parse_size("512M") == 512 << 20
+    assert parse_size("1.5g") == 3 << 29
+    assert parse_size("16GB") == 16 << 30
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_size("lots")
+
+
+def test_window_track_written_in_both_modes(tmp_path):
+    """--window streams a bedGraph track to the output dir; parallel and sequential agree."""
+    from src.infrastructure.cli.runner import _process_single_file
+    fasta_file = tmp_path / "track.fasta"
+    fasta_file.write_text(">s1\n" + "ACGTGGCC" * 30 + "\n>s2\nATATGC\n")
+
+    tracks = []
+    for parallel in (False, True):
+        args = _make_args(
+            parallel=parallel,
+            window=10,
+            step=5,
+            kernel="numpy",
+            output_dir=str(tmp_path / f"out{int(parallel)}"),
+        )
+        os.makedirs(args.output_dir)
+        _process_single_file(str(fasta_file), args)
+        tracks.append((tmp_path / f"out{int(parallel)}" / "track_windows.bedgraph").read_text())
+
+    assert tracks[0] == tracks[1]
+    lines = tracks[0].splitlines()
+    assert len(lines) == 47
+    assert lines[0] == "s1\t0\t10\t70.00"
+
+
+def test_parquet_export_from_cli(tmp_path):
+    """--parquet writes per-sequence, window and island tables matching the bedGraph track."""
+    import pyarrow.parquet as pq
+    from src.infrastructure.cli.runner import _process_single_file
+    fasta_file = tmp_path / "cols.fasta"
+    fasta_file.write_text(">s1\n" + "ACGTGGCC" * 30 + "\n>s2\nATATGC\n")
+
+    args = _make_args(window=10, step=5, kernel="numpy", parquet=True, output_dir=str(tmp_path))
+    _process_single_file(str(fasta_file), args)
+
+    sequences = pq.read_table(tmp_path / "cols_sequences.parquet").to_pylist()
+    assert [row["sequence_id"] for row in sequences] == ["s1", "s2"]
+    windows = pq.read_table(tmp_path / "cols_windows.parquet")
+    track = (tmp_path / "cols_windows.bedgraph").read_text().splitlines()
+    assert windows.num_rows == len(track) == 47
+    assert windows.slice(0, 1).to_pylist()[0]["start"] == 0
+    assert not (tmp_path / "cols_islands.parquet").exists()
+
+
+def test_zoom_track_from_cli_matches_bedgraph(tmp_path):
+    """--zoom-track writes a .gcz whose full-resolution level equals the bedGraph values."""
+    from src.infrastructure.cli.runner import _process_single_file
+    from src.infrastructure.io.zoomtrack import ZoomTrack
+    fasta_file = tmp_path / "zoom.fasta"
+    fasta_file.write_text(">s1\n" + "ACGTGGCC" * 30 + "\n>s2\nATATGC\n")
+
+    args = _make_args(
+        parallel=True,
+        window=10,
+        step=5,
+        kernel="numpy",
+        zoom_track=True,
+        output_dir=str(tmp_path),
+    )
+    _process_single_file(str(fasta_file), args)
+
+    track = [line.split("\t") for line in (tmp_path / "zoom_windows.bedgraph").read_text().splitlines()]
+    with ZoomTrack(str(tmp_path / "zoom_windows.gcz")) as zoom:
+        assert list(zoom.sequences) == ["s1"]
+        bins = zoom.query("s1", pixels=1000)
+    assert [f"{v:.2f}" for v in bins.mean] == [row[3] for row in track]
+    assert bins.ends[-1] == int(track[-1][2])
+
+
+def test_index_and_query_subcommands(tmp_path, capsys):
+    """`main.py index` writes the sidecar; `query` reports GC, CpG o/e and windows for a region."""
+    from src.infrastructure.cli.commands import query_region
+    fasta_file = tmp_path / "idx.fasta"
+    fasta_file.write_text(">chr1\n" + "ATATATATCG" * 10 + "\n")
+
+    with patch("sys.argv", ["main.py", "index", str(fasta_file), "--interval", "16"]):
+        main()
+    assert os.path.exists(str(fasta_file) + ".gci")
+
+    stats = query_region(str(fasta_file), "chr1:1-20", window=10, step=5)
+    assert (stats.start, stats.end) == (0, 20)
+    assert stats.gc_percent == 20.0
+    assert stats.oe_ratio == 10.0
+    assert list(stats.sliding_window) == [20.0, 20.0, 20.0]
+
+    with patch("sys.argv", ["main.py", "query", str(fasta_file), "chr1:91-100"]):
+        main()
+    out = capsys.readouterr().out
+    assert "chr1:91-100 (10 bp)" in out and "20.00%" in out
+
+    with patch("sys.argv", ["main.py", "query", str(fasta_file), "chrX"]):
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert e.value.code == 1
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_result_cache_skips_unchanged_files(tmp_path, capsys, parallel):
+    """A re-run reuses cached summaries for unchanged files and recomputes only edited ones."""
+    from src.infrastructure.cli.runner import run_analysis
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.fasta").write_text(">a1\nGGGG\n>a2\nATAT\n")
+    (data / "b.fa").write_text(">b1\nGCAT\n")
+
+    args = _make_args(
+        input=str(data),
+        cache_dir=str(tmp_path / "cache"),
+        output_dir=str(tmp_path / "out"),
+        parallel=parallel,
+        file_jobs=2,
+    )
+
+    run_analysis(args)
+    assert "0 acerto(s), 2 arquivo(s) recalculado(s)" in capsys.readouterr().out
+    csv_mtime = os.path.getmtime(tmp_path / "out" / "a_gc.csv")
+
+    (data / "b.fa").write_text(">b1\nGCAT\n>b2\nGGCC\n")
+    with patch("src.infrastructure.cli.runner.plot_gc_distribution") as plot:
+        run_analysis(args)
+    out = capsys.readouterr().out
+    assert "1 acerto(s), 1 arquivo(s) recalculado(s)" in out
+    assert "Resumo geral: 4 sequências" in out
+    assert plot.call_count == 1
+    assert os.path.getmtime(tmp_path / "out" / "a_gc.csv") == csv_mtime
+
+    args.clear_cache = True
+    run_analysis(args)
+    assert "0 acerto(s), 2 arquivo(s) recalculado(s)" in capsys.readouterr().out
+
+
+def test_result_cache_misses_when_outputs_were_overwritten(tmp_path, capsys):
+    """An entry whose outputs were rewritten by a run with other parameters is recomputed."""
+    from src.infrastructure.cli.runner import run_analysis
+    (tmp_path / "a.fasta").write_text(">a1\n" + "GGCCATAT" * 100 + "\n")
+    args = _make_args(
+        input=str(tmp_path / "a.fasta"),
+        cache_dir=str(tmp_path / "cache"),
+        output_dir=str(tmp_path / "out"),
+    )
+
+    track = tmp_path / "out" / "a_windows.bedgraph"
+    args.window = 100
+    run_analysis(args)
+    first = track.read_text()
+    args.window = 200
+    run_analysis(args)
+    capsys.readouterr()
+    args.window = 100
+    run_analysis(args)
+    assert "0 acerto(s), 1 arquivo(s) recalculado(s)" in capsys.readouterr().out
+    assert track.read_text() == first
+
+
+def test_memo_reports_hits_and_keeps_outputs(tmp_path, capsys):
+    """--memo-size reuses duplicate records in sequential runs without changing the track."""
+    from src.infrastructure.cli.runner import run_analysis
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "amp.fasta").write_text(">a\nACGTGGCCAT\n>b\nACGTGGCCAT\n>c\nTTTTAAAAGC\n")
+
+    tracks = []
+    for memo_size in (None, 1 << 20):
+        args = _make_args(
+            input=str(data / "amp.fasta"),
+            memo_size=memo_size,
+            output_dir=str(tmp_path / f"out{bool(memo_size)}"),
+            window=4,
+            step=2,
+        )
+        run_analysis(args)
+        tracks.append((tmp_path / f"out{bool(memo_size)}" / "amp_windows.bedgraph").read_text())
+
+    assert tracks[0] == tracks[1]
+    assert "Memo de registros: 1 acerto(s), 2 falha(s), 2 registro(s)" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("window", [None, 4])
+def test_memo_stores_each_missed_record_once(tmp_path, window):
+    """Sequential runs store each memo miss exactly once, with or without windows."""
+    from src.infrastructure.cli.runner import run_analysis
+    from src.infrastructure.parallel.memo import SequenceMemo
+    (tmp_path / "amp.fasta").write_text(">a\nACGTGGCCAT\n>b\nACGTGGCCAT\n>c\nTTTTAAAAGC\n")
+    args = _make_args(input=str(tmp_path / "amp.fasta"), output_dir=str(tmp_path / "out"),
+                      memo_size=1 << 20, window=window, step=2)
+    with patch.object(SequenceMemo, "put", autospec=True, side_effect=SequenceMemo.put) as put:
+        run_analysis(args)
+    assert put.call_count == 2
+    assert [len(call.args[4]) for call in put.call_args_list] == [4 if window else 0] * 2
@@ -34,3 +34,304 @@ def test_read_fasta_with_blank_lines(tmp_path):
 
     results = list(read_fasta(str(fasta_file)))
     assert results == [("seq1", "ATGC"), ("seq2", "GCGC")]
+
+
+def test_indexed_fasta_fetch_and_fai(tmp_path):
+    """The .fai matches samtools' layout and record/region lookups slice the mmap."""
+    from src.infrastructure.io.faidx import IndexedFasta, load_fai
+    from src.infrastructure.io.fasta import iter_record_spans
+    fasta_file = tmp_path / "ref.fa"
+    fasta_file.write_bytes(b">chr1 desc\nACGTA\nCCGGT\nTT\n>chr2\nGGGG\nCC\n")
+
+    with IndexedFasta(str(fasta_file)) as fa:
+        assert len(fa) == 2 and "chr1" in fa
+        assert fa.length("chr1") == 12
+        assert fa.fetch("chr1") == "ACGTACCGGTTT"
+        assert fa.fetch("chr1", 3, 8) == "TACCG"
+        assert fa.fetch("chr1", 5, 10) == "CCGGT"
+        assert fa.fetch_region("chr1:4-8") == "TACCG"
+        assert fa.fetch_region("chr2") == "GGGGCC"
+        assert list(fa) == list(read_fasta(str(fasta_file)))
+        with pytest.raises(KeyError):
+            fa.fetch("chrX")
+
+    fai = (tmp_path / "ref.fa.fai").read_text()
+    assert fai == "chr1\t12\t11\t5\t6\nchr2\t6\t32\t4\t5\n"
+    with IndexedFasta(str(fasta_file)) as fa:
+        assert list(fa.record_spans()) == list(iter_record_spans(str(fasta_file)))
+    assert [r.name for r in load_fai(str(tmp_path / "ref.fa.fai"))] == ["chr1", "chr2"]
+
+
+def test_indexed_fasta_crlf_and_no_trailing_newline(tmp_path):
+    """CRLF line endings and a missing final newline are indexed correctly."""
+    from src.infrastructure.io.faidx import IndexedFasta
+    fasta_file = tmp_path / "crlf.fa"
+    fasta_file.write_bytes(b">s1\r\nACG\r\nTTA\r\nG")
+    with IndexedFasta(str(fasta_file)) as fa:
+        assert fa.fetch("s1") == "ACGTTAG"
+        assert fa.fetch("s1", 2, 5) == "GTT"
+
+
+def test_build_fai_rejects_ragged_lines(tmp_path):
+    """Records with non-uniform line lengths cannot be indexed."""
+    from src.infrastructure.io.faidx import build_fai
+    fasta_file = tmp_path / "ragged.fa"
+    fasta_file.write_text(">s1\nACG\nTTAAC\nG\n")
+    with pytest.raises(ValueError):
+        build_fai(str(fasta_file))
+
+
+def test_parse_region():
+    """samtools-style regions are converted to 0-based half-open coordinates."""
+    from src.infrastructure.io.faidx import parse_region
+    assert parse_region("chr1:1,001-2,000") == ("chr1", 1000, 2000)
+    assert parse_region("chr1:5") == ("chr1", 4, None)
+    assert parse_region("scaffold_1") == ("scaffold_1", None, None)
+    # IDs com ':' (samtools): um ID conhecido vale inteiro; senão só o último ':start-end' é coordenada
+    assert parse_region("chrUn:KI270302v1") == ("chrUn:KI270302v1", None, None)
+    assert parse_region("chrUn:KI270302v1:11-20") == ("chrUn:KI270302v1", 10, 20)
+    names = {"HLA-A*01:01:01:01"}
+    assert parse_region("HLA-A*01:01:01:01", names) == ("HLA-A*01:01:01:01", None, None)
+    assert parse_region("HLA-A*01:01:01:01:2-5", names) == ("HLA-A*01:01:01:01", 1, 5)
+    with pytest.raises(ValueError):
+        parse_region("chr1:0-5")
+
+
+def _fasta_records(n):
+    return "".join(f">r{i} desc\n{'ACGTTGCA' * (i % 7 + 1)}\n{'GGCC' * (i % 3)}\n" for i in range(n))
+
+
+def test_read_fasta_gzip(tmp_path):
+    """Plain gzip input is detected by content and parsed like text."""
+    import gzip
+    content = _fasta_records(50)
+    plain = tmp_path / "plain.fa"
+    plain.write_text(content)
+    gz = tmp_path / "reads.fa.gz"
+    gz.write_bytes(gzip.compress(content.encode()))
+    assert list(read_fasta(str(gz))) == list(read_fasta(str(plain)))
+
+
+def test_read_fasta_bgzf_parallel(tmp_path, monkeypatch):
+    """BGZF blocks inflated by worker processes feed the same record iterator, in order."""
+    from Bio import bgzf
+    from src.infrastructure.io import compression
+    from src.infrastructure.io.compression import is_bgzf
+    monkeypatch.setattr(compression, "_BLOCKS_PER_TASK", 1)
+    content = _fasta_records(3000)
+    plain = tmp_path / "plain.fa"
+    plain.write_text(content)
+    bgz = tmp_path / "ref.fa.gz"
+    with bgzf.BgzfWriter(str(bgz), "wb") as writer:
+        writer.write(content.encode())
+
+    assert is_bgzf(str(bgz))
+    expected = list(read_fasta(str(plain)))
+    assert list(read_fasta(str(bgz), workers=3)) == expected
+    assert list(read_fasta(str(bgz))) == expected
+
+
+def test_fasta_path_helpers():
+    """Compressed FASTA extensions are recognised and stripped from output names."""
+    from src.infrastructure.io.fasta import is_fasta_path, fasta_base_name
+    assert is_fasta_path("data/hg38.fa.gz")
+    assert is_fasta_path("x.FNA.bgz")
+    assert not is_fasta_path("notes.txt.gz")
+    assert fasta_base_name("/ref/hg38.fa.gz") == "hg38"
+    assert fasta_base_name("sample.fasta") == "sample"
+
+
+def test_parse_fasta_bytes_matches_read_fasta(tmp_path):
+    """The in-memory bytes parser yields the same records as the line reader."""
+    from src.infrastructure.io.fasta import parse_fasta_bytes
+    content = (b"notes before\n>s1 desc\r\nACgt\r\n\r\nNN \r\n>s2\n\nGCGC\n>s3\n>s4 x\nTT\n"
+               b"  >s5\n AC GT \n\tGG\n")
+    fasta_file = tmp_path / "mixed.fasta"
+    fasta_file.write_bytes(content)
+
+    records = list(parse_fasta_bytes(content))
+    assert records == list(read_fasta(str(fasta_file)))
+    assert records == [("s1", "ACgtNN"), ("s2", "GCGC"), ("s3", ""), ("s4", "TT"), ("s5", "AC GTGG")]
+    assert list(parse_fasta_bytes(b"")) == [] and list(parse_fasta_bytes(b"ACGT\n")) == []
+
+
+def test_scan_record_spans_one_span_per_record(tmp_path):
+    """The pre-scan finds one header-aligned byte span per record, covering the whole file."""
+    from src.infrastructure.io.fasta import scan_record_spans, read_fasta_range
+    fasta = tmp_path / "spans.fa"
+    fasta.write_text("".join(f">r{i} desc\n{'ACGT' * (i + 3)}\nGG\n" for i in range(40)))
+
+    spans = scan_record_spans(str(fasta))
+    raw = fasta.read_bytes()
+    assert len(spans) == 40
+    assert spans[0][0] == 0 and spans[-1][1] == len(raw)
+    assert all(raw[start:start + 1] == b">" for start, _ in spans)
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+
+    records = [rec for start, end in spans for rec in read_fasta_range(str(fasta), start, end)]
+    assert records == list(read_fasta(str(fasta)))
+
+
+def test_scan_record_spans_across_block_boundaries(tmp_path, monkeypatch):
+    """Headers that straddle scan blocks are still found."""
+    from src.infrastructure.io import fasta as fasta_io
+    monkeypatch.setattr(fasta_io, "_SCAN_BLOCK", 5)
+    path = tmp_path / "tiny.fa"
+    path.write_text(">a\nACGT\n>b\nGG\n>c\nT\n")
+    assert fasta_io.scan_record_spans(str(path)) == [(0, 8), (8, 14), (14, 19)]
+
+
+def test_window_track_writer_streams_bedgraph(tmp_path):
+    """Window chunks are written as bedGraph lines with continuous coordinates."""
+    from array import array
+    from src.infrastructure.io.exporters import WindowTrackWriter
+    path = tmp_path / "track.bedgraph"
+    with WindowTrackWriter(str(path)) as track:
+        count = track.write_windows("chr1", iter([array('f', [50.0, 25.0]), array('f', [12.5])]), 4, 2)
+        track.write_windows("chr2", [[100.0]], 4, 0)
+    assert count == 3
+    assert path.read_text().splitlines() == [
+        "chr1\t0\t4\t50.00", "chr1\t2\t6\t25.00", "chr1\t4\t8\t12.50", "chr2\t0\t4\t100.00",
+    ]
+
+
+def test_parquet_result_writer_typed_tables(tmp_path):
+    """Sequences, window chunks and island tables land in typed, batched Parquet files."""
+    from array import array
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from src.domain.models import CpGIsland, CpGIslandTable
+    from src.infrastructure.io.parquet import ParquetResultWriter
+    with ParquetResultWriter(str(tmp_path), "run", row_group_rows=2) as out:
+        out.write_sequence("chr1", 55.5)
+        out.write_windows("chr1", iter([array('f', [50.0, 25.0]), array('f', [12.5])]), 4, 2)
+        out.write_islands("chr1", CpGIslandTable([CpGIsland(0, 200, 60.0, 0.7)]))
+        out.write_islands("chr2", [])
+
+    windows = pq.read_table(tmp_path / "run_windows.parquet")
+    assert windows.schema.field("gc_percent").type == pa.float32()
+    assert pa.types.is_dictionary(windows.schema.field("sequence_id").type)
+    assert pq.ParquetFile(tmp_path / "run_windows.parquet").metadata.num_row_groups == 2
+    assert windows.column("start").to_pylist() == [0, 2, 4]
+    assert windows.column("end").to_pylist() == [4, 6, 8]
+    assert windows.column("gc_percent").to_pylist() == [50.0, 25.0, 12.5]
+    islands = pq.read_table(tmp_path / "run_islands.parquet").to_pylist()
+    assert islands == [{"sequence_id": "chr1", "start": 0, "end": 200, "gc_percent": 60.0, "oe_ratio": 0.7}]
+    assert pq.read_table(tmp_path / "run_sequences.parquet").to_pylist() == [{"sequence_id": "chr1", "gc_percent": 55.5}]
+
+
+def test_zoom_track_pyramid_and_region_query(tmp_path):
+    """Zoom levels keep exact min/max, queries return at most `pixels` bins from the right level."""
+    import numpy as np
+    from src.infrastructure.io.zoomtrack import ZoomTrack, ZoomTrackWriter
+    values = (np.random.default_rng(7).random(2345) * 100).astype(np.float32)
+    path = tmp_path / "t.gcz"
+    with ZoomTrackWriter(str(path)) as writer:
+        for i in range(0, len(values), 1000):
+            writer.write_chunk("chr1", i, values[i:i + 1000], 50, 25)
+        writer.write_windows("chr2", [[40.0, 60.0]], 10, 0)
+
+    with ZoomTrack(str(path)) as track:
+        assert [level["bins"] for level in track.sequences["chr1"]["levels"]] == [235, 24, 3, 1]
+        assert track.length("chr1") == 2344 * 25 + 50
+        full = track.query("chr1", 2500, 5000, pixels=1000)
+        assert full.factor == 1 and np.array_equal(full.mean, values[100:200])
+        assert full.starts[0] == 2500 and full.ends[-1] == 199 * 25 + 50
+        coarse = track.query("chr1", pixels=20)
+        assert coarse.factor == 100 and len(coarse) == 20
+        assert coarse.min.min() == values.min() and coarse.max.max() == values.max()
+        # Regiões além da extensão coberta devolvem bins vazios, sem ler fora do nível
+        for start in (2345 * 25, 2345 * 25 + 100, 10 ** 9):
+            assert len(track.query("chr1", start)) == 0
+        assert len(track.query("chr1", 10 ** 9, 10 ** 9 + 10)) == 0
+        assert np.isclose(np.average(coarse.mean, weights=(coarse.ends - coarse.starts - 25) // 25), values.mean(), rtol=1e-5)
+        # Região desalinhada: os bins de borda cobrem só janelas dentro de [start, end)
+        clipped = track.query("chr1", 1234, 56789, pixels=3)
+        inside = values[50:2272]
+        assert clipped.factor == 100 and clipped.starts[0] == 1250 and clipped.ends[-1] == 2271 * 25 + 50
+        assert clipped.min.min() == inside.min() and clipped.max.max() == inside.max()
+        weights = (clipped.ends - clipped.starts - 25) // 25
+        assert weights.sum() == len(inside)
+        assert np.isclose(np.average(clipped.mean, weights=weights), inside.mean(), rtol=1e-5)
+        assert track.query("chr2", pixels=5).mean.tolist() == [40.0, 60.0]
+        with pytest.raises(KeyError):
+            track.query("chrX")
+
+    (tmp_path / "bad.gcz").write_bytes(b"not a track at all")
+    with pytest.raises(ValueError):
+        ZoomTrack(str(tmp_path / "bad.gcz"))
+
+
+def test_gc_index_counts_match_sequence(tmp_path):
+    """Region counts from the .gci sidecar equal direct counting, including CG across boundaries."""
+    import random
+    from src.infrastructure.io.gcindex import GCIndex, write_gc_index
+    rng = random.Random(3)
+    seq = "".join(rng.choice("ACGTNCG") for _ in range(5003))
+    path = tmp_path / "g.fa"
+    path.write_text(">chr1\n" + "\n".join(seq[i:i + 60].lower() if i % 120 else seq[i:i + 60]
+                                          for i in range(0, len(seq), 60)) + "\n>chr2\nCGCG\n")
+    write_gc_index(str(path), interval=64)
+
+    with GCIndex(str(path)) as index:
+        for start, end in [(0, 5003), (0, 0), (63, 65), (64, 128), (127, 129), (100, 4999)] + \
+                [sorted(rng.sample(range(5004), 2)) for _ in range(200)]:
+            region = seq[start:end]
+            expected = (region.count("G"), region.count("C"), region.count("CG"), region.count("N"))
+            assert index.counts("chr1", start, end) == expected
+        assert index.counts("chr2") == (2, 2, 2, 0)
+        assert index.counts("chr2", 0, 3) == (1, 2, 1, 0)
+
+
+def test_gc_index_rejects_missing_or_stale(tmp_path):
+    import os
+    from src.infrastructure.io.gcindex import GCIndex, write_gc_index
+    path = tmp_path / "g.fa"
+    path.write_text(">a\nACGT\n")
+    with pytest.raises(ValueError):
+        GCIndex(str(path))
+    write_gc_index(str(path))
+    os.utime(str(path) + ".gci", (0, 0))
+    with pytest.raises(ValueError):
+        GCIndex(str(path))
+
+
+def test_result_cache_keys_validation_and_eviction(tmp_path):
+    """Keys follow content and parameters; entries need their untouched outputs; LRU eviction by size."""
+    import os
+    from src.infrastructure.io.cache import ResultCache
+    data = tmp_path / "a.fa"
+    data.write_text(">a\nACGT\n")
+    output = tmp_path / "a_gc.csv"
+    output.write_text("x")
+    cache = ResultCache(str(tmp_path / "cache"))
+
+    key = cache.key(str(data), {"window": 10})
+    assert key == cache.key(str(data), {"window": 10})
+    assert key != cache.key(str(data), {"window": 20})
+    assert cache.get(key) is None
+    cache.put(key, {"stats": {}, "outputs": [str(output)]})
+    assert cache.get(key) == {"stats": {}, "outputs": [str(output)]}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    output.write_text("rewritten by another run")
+    assert cache.get(key) is None
+    cache.put(key, {"stats": {}, "outputs": [str(output)]})
+    assert cache.get(key) is not None
+
+    data.write_text(">a\nACGG\n")
+    os.utime(data, ns=(1, 1))
+    assert cache.key(str(data), {"window": 10}) != key
+    output.unlink()
+    assert cache.get(key) is None
+
+    small = ResultCache(str(tmp_path / "small"), max_bytes=150)
+    for k in ("k1", "k2", "k3"):
+        small.put(k, {"stats": {}, "outputs": [], "pad": "x" * 40})
+    assert small.get("k1") is None and small.get("k3") is not None
+    small.key(str(data), {"window": 10})
+    entries = len(os.listdir(tmp_path / "small")) - 1
+    assert entries >= 1 and small.clear() == entries and small.get("k3") is None
+    # O índice de hashes é regravado vazio, não contado nem perdido como entrada
+    assert os.listdir(tmp_path / "small") == ["digests.json"]
+    assert (tmp_path / "small" / "digests.json").read_text() == "{}"
@@ -1,6 +1,8 @@
 import pytest
 import os
+from concurrent.futures import ThreadPoolExecutor
 from src.infrastructure.parallel.dispatcher import process_fasta_parallel, _process_single_sequence
+from src.domain.models import CpGIslandTable
 
 def test_process_fasta_parallel_returns_correct_stats(tmp_path):
     """
@@ -64,14 +66,15 @@ def test_process_single_sequence_with_cpg_and_window():
     """Cover _process_single_sequence lines 10-23: cpg=True and window>0."""
     seq_id = "test_seq"
     sequence = "ATGC" * 25  # 100bp, 50% GC
-    item = (seq_id, sequence, 10, 5, True)
+    item = (seq_id, sequence, 10, 5, True, "python")
 
     result_id, gc, islands, windows = _process_single_sequence(item)
 
     assert result_id == seq_id
     assert gc == 50.0
-    assert isinstance(islands, list)
-    assert isinstance(windows, list)
+    # Compact result models: columnar island table and float32 window buffer
+    assert isinstance(islands, CpGIslandTable)
+    assert windows.typecode == "f"
     assert len(windows) > 0
 
 
@@ -95,3 +98,308 @@ def test_process_fasta_parallel_with_cpg_and_window(tmp_path):
     assert "s1" in all_windows
     assert "s2" in all_windows
     assert len(all_windows["s1"]) > 0
+
+
+def test_process_fasta_parallel_numpy_kernel(tmp_path):
+    """The numpy kernel is threaded through the workers and matches the reference."""
+    fasta_file = tmp_path / "kernel.fasta"
+    fasta_file.write_text(">s1\n" + "ACGT" * 20 + "CG" * 150 + "AT" * 40 + "\n>s2\nGGCCAATT\n")
+
+    ref = process_fasta_parallel(str(fasta_file), window=10, step=3, cpg=True, max_workers=2, kernel="python")
+    vec = process_fasta_parallel(str(fasta_file), window=10, step=3, cpg=True, max_workers=2, kernel="numpy")
+
+    assert ref == vec
+    assert len(vec[1]["s1"]) == 1
+
+
+@pytest.mark.parametrize("kernel", ["python", "numpy"])
+def test_process_fasta_parallel_chunked_matches_serial(tmp_path, kernel):
+    """Records split across workers are stitched back exactly, even across chunk boundaries."""
+    from src.domain.analysis import scan_sequence
+    long_seq = ("AT" * 137 + "CG" * 160 + "ACGT" * 33 + "GGCGCC" * 45 + "T" * 91) * 3
+    fasta_file = tmp_path / "huge.fasta"
+    fasta_file.write_text(">big\n" + long_seq + "\n>small\nGGCCAATT\n")
+
+    results, all_islands, all_windows = process_fasta_parallel(
+        str(fasta_file), window=37, step=7, cpg=True, max_workers=2, kernel=kernel, chunk_size=300
+    )
+
+    serial = scan_sequence("big", long_seq, 37, 7, True)
+    assert results["big"] == serial.gc_percent
+    assert all_windows["big"] == serial.sliding_window
+    assert all_islands["big"] == serial.cpg_islands
+    assert len(serial.cpg_islands) > 1
+    assert results["small"] == 50.0
+
+
+def test_process_fasta_parallel_shared_memory_matches_pickled(tmp_path, monkeypatch):
+    """Records sent through shared memory give the same results as pickled ones."""
+    from src.infrastructure.parallel import dispatcher
+    fasta_file = tmp_path / "shm.fasta"
+    fasta_file.write_text(">s1\n" + "ACGT" * 20 + "CG" * 150 + "AT" * 40 + "\n>s2\nGGCCAATTG\n>s3\nAT\n")
+
+    pickled = process_fasta_parallel(str(fasta_file), window=10, step=3, cpg=True, max_workers=2)
+    monkeypatch.setattr(dispatcher, "SHARED_MEMORY_MIN_SIZE", 1)
+    shared = process_fasta_parallel(str(fasta_file), window=10, step=3, cpg=True, max_workers=2)
+
+    assert shared == pickled
+    assert len(shared[2]["s3"]) == 0
+
+
+def test_shared_sequence_roundtrip():
+    """Sequence bytes and window slots round-trip through a shared memory block."""
+    from src.infrastructure.parallel.shared import (
+        share_sequence, attach, read_sequence, write_windows, read_windows, release, window_count
+    )
+    shm, handle = share_sequence("ACGTACG", window_count(7, 2, 2))
+    try:
+        assert handle.windows_count == 3 and handle.windows_offset == 8
+        with attach(handle) as view:
+            assert read_sequence(view, 2, 5) == "GTA"
+            write_windows(view, handle, 1, [50.0, 12.5])
+        assert list(read_windows(shm, handle)) == [0.0, 50.0, 12.5]
+    finally:
+        release(shm)
+
+
+def test_process_fasta_parallel_worker_parsing_matches_parent_parsing(tmp_path):
+    """Workers parsing their own byte ranges return the same results, in file order."""
+    fasta_file = tmp_path / "sharded.fasta"
+    fasta_file.write_text("".join(f">s{i}\n{'ACGT' * i}\n{'CG' * (i * 7)}\n" for i in range(1, 30)))
+
+    parent = process_fasta_parallel(str(fasta_file), window=8, step=4, cpg=True, max_workers=3)
+    workers = process_fasta_parallel(str(fasta_file), window=8, step=4, cpg=True, max_workers=3, worker_parsing=True)
+
+    assert workers == parent
+    assert list(workers[0]) == [f"s{i}" for i in range(1, 30)]
+
+
+def test_worker_parsing_takes_record_spans_from_fai(tmp_path, monkeypatch):
+    """With an up-to-date .fai, worker parsing skips the pre-scan and gets the same results."""
+    from src.infrastructure.io.faidx import build_fai, write_fai
+    from src.infrastructure.parallel import dispatcher
+    fasta_file = tmp_path / "indexed.fasta"
+    fasta_file.write_text("".join(f">s{i} desc\n{'ACGTCG' * 12}\n{'CG' * (i + 1)}\n" for i in range(1, 30)))
+    parent = process_fasta_parallel(str(fasta_file), window=8, step=4, cpg=True, max_workers=3)
+    write_fai(build_fai(str(fasta_file)), str(fasta_file) + ".fai")
+
+    def no_scan(path):
+        raise AssertionError("pre-scan should not run with a .fai")
+    monkeypatch.setattr(dispatcher, "iter_record_spans", no_scan)
+    workers = process_fasta_parallel(str(fasta_file), window=8, step=4, cpg=True, max_workers=3, worker_parsing=True)
+    assert workers == parent
+
+
+def test_iter_fasta_parallel_bounds_in_flight_work(tmp_path, monkeypatch):
+    """With a tiny memory budget only one batch is in flight, and results still stream in order."""
+    from src.infrastructure.parallel import dispatcher
+    fasta_file = tmp_path / "bounded.fasta"
+    fasta_file.write_text("".join(f">s{i}\n{'GC' * (i + 1)}{'AT' * 20}\n" for i in range(25)))
+
+    submitted = []
+    peak = []
+    real_bounded_map = dispatcher._bounded_map
+
+    def spy(pool, batches, max_tasks, max_bytes, stop=None):
+        def counting():
+            for batch, cost in batches:
+                submitted.append(cost)
+                yield batch, cost
+        for out in real_bounded_map(pool, counting(), max_tasks, max_bytes, stop):
+            peak.append(len(submitted))
+            yield out
+    monkeypatch.setattr(dispatcher, "_bounded_map", spy)
+    monkeypatch.setattr(dispatcher, "_BATCH_MIN_BYTES", 1)
+    monkeypatch.setattr(dispatcher, "_BATCH_MAX_BYTES", 1)
+
+    records = list(dispatcher.iter_fasta_parallel(str(fasta_file), window=4, max_workers=2, max_memory=1))
+
+    assert [r[0] for r in records] == [f"s{i}" for i in range(25)]
+    # No máximo um lote em voo além do que já foi entregue (mais o lote lido aguardando vaga)
+    assert all(seen <= k + 2 for k, seen in enumerate(peak))
+    assert records == list(dispatcher.iter_fasta_parallel(str(fasta_file), window=4, max_workers=2))
+
+
+def test_plan_record_groups_batches_by_bases():
+    """Small neighbouring records are grouped up to the target; big records stay alone."""
+    from src.infrastructure.parallel.dispatcher import _plan_record_groups
+    spans = [(0, 10), (10, 20), (20, 30), (30, 500), (500, 510), (510, 515)]
+    assert list(_plan_record_groups(iter(spans), 25)) == [(0, 30), (30, 500), (500, 515)]
+
+
+def test_worker_parsing_dispatches_longest_first_and_keeps_file_order(tmp_path, monkeypatch):
+    """Record groups are submitted largest-first while results still come back in file order."""
+    from src.infrastructure.parallel import dispatcher
+    fasta_file = tmp_path / "skewed.fasta"
+    sizes = [3, 400, 5, 90, 2000, 7]
+    fasta_file.write_text("".join(f">s{i}\n{'ACGT' * n}\n" for i, n in enumerate(sizes)))
+    monkeypatch.setattr(dispatcher, "_BATCH_MIN_BYTES", 1)
+    monkeypatch.setattr(dispatcher, "_BATCH_MAX_BYTES", 1)
+
+    pool = _RecordingPool(2)
+    with pool:
+        records = list(dispatcher.iter_fasta_parallel(str(fasta_file), max_workers=2, worker_parsing=True, executor=pool))
+    submitted = [end - start for start, end in pool.shards]
+
+    assert submitted == sorted(submitted, reverse=True)
+    assert [r[0] for r in records] == [f"s{i}" for i in range(len(sizes))]
+
+
+
+class _RecordingPool(ThreadPoolExecutor):
+    """Thread pool that records the byte range of every worker-parsing shard submitted."""
+
+    def __init__(self, workers):
+        super().__init__(workers)
+        self.shards = []
+
+    def submit(self, fn, *args, **kwargs):
+        for kind, item in args[0] if args else []:
+            if kind == "shard":
+                self.shards.append(item[1:3])
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_worker_parsing_bounds_out_of_order_results(tmp_path, monkeypatch):
+    """A small first record is not starved behind every larger group; held results stay bounded."""
+    from src.infrastructure.parallel import dispatcher
+    fasta_file = tmp_path / "late_first.fasta"
+    fasta_file.write_text(">s0\nAC\n" + "".join(f">s{i}\n{'ACGT' * 100}\n" for i in range(1, 40)))
+    monkeypatch.setattr(dispatcher, "_BATCH_MIN_BYTES", 1)
+    monkeypatch.setattr(dispatcher, "_BATCH_MAX_BYTES", 1)
+
+    pool = _RecordingPool(1)
+    delivered = []
+    with pool:
+        for record in dispatcher.iter_fasta_parallel(str(fasta_file), max_workers=1, worker_parsing=True, executor=pool):
+            delivered.append(record[0])
+            # Despachados mas ainda não entregues nunca passam da janela de reordenação
+            assert len(pool.shards) - len(delivered) <= dispatcher._REORDER_GROUPS_PER_WORKER
+    assert delivered == [f"s{i}" for i in range(40)]
+    assert pool.shards.index((0, 7)) < dispatcher._REORDER_GROUPS_PER_WORKER
+
+@pytest.mark.parametrize("worker_parsing", [False, True])
+def test_thread_executor_matches_processes(tmp_path, worker_parsing):
+    """The thread backend produces exactly the process backend's results."""
+    fasta_file = tmp_path / "threads.fasta"
+    fasta_file.write_text(">s1\n" + "ACGT" * 20 + "CG" * 150 + "AT" * 40 + "\n>s2\nGGCCAATT\n")
+
+    kwargs = dict(window=10, step=3, cpg=True, max_workers=2, kernel="numpy", chunk_size=200, worker_parsing=worker_parsing)
+    assert process_fasta_parallel(str(fasta_file), executor_kind="threads", **kwargs) == \
+        process_fasta_parallel(str(fasta_file), executor_kind="processes", **kwargs)
+
+
+
+def test_iter_records_parallel_matches_file_dispatch(tmp_path):
+    """In-memory records go through the same dispatch as a FASTA file, in order."""
+    from src.infrastructure.parallel.dispatcher import iter_fasta_parallel, iter_records_parallel
+    records = [("s1", "ACGT" * 20 + "CG" * 150), ("s2", "GGCCAATT"), ("s3", "CG" * 150)]
+    fasta_file = tmp_path / "records.fasta"
+    fasta_file.write_text("".join(f">{seq_id}\n{seq}\n" for seq_id, seq in records))
+
+    kwargs = dict(window=10, step=3, cpg=True, max_workers=2, kernel="python", chunk_size=200, executor_kind="threads")
+    assert list(iter_records_parallel(iter(records), **kwargs)) == list(iter_fasta_parallel(str(fasta_file), **kwargs))
+
+def test_resolve_executor_auto(tmp_path, monkeypatch):
+    """auto picks threads for small inputs and numpy on long records, processes otherwise."""
+    from src.infrastructure.parallel import dispatcher
+    from src.infrastructure.parallel.dispatcher import resolve_executor
+    reads = tmp_path / "reads.fa"
+    reads.write_text("".join(f">r{i}\nACGT\n" for i in range(2000)))
+    chrom = tmp_path / "chrom.fa"
+    chrom.write_text(">chr1\n" + "ACGT" * 5000 + "\n")
+
+    assert resolve_executor("processes", "numpy", [str(reads)]) == "processes"
+    assert resolve_executor("auto", "python", [str(reads)]) == "threads"
+    monkeypatch.setattr(dispatcher, "_AUTO_THREADS_MAX_BYTES", 0)
+    monkeypatch.setattr(dispatcher, "SHARED_MEMORY_MIN_SIZE", 10000)
+    assert resolve_executor("auto", "numpy", [str(chrom)]) == "threads"
+    assert resolve_executor("auto", "numpy", [str(reads)]) == "processes"
+    assert resolve_executor("auto", "python", [str(chrom)]) == "processes"
+    with pytest.raises(ValueError):
+        resolve_executor("gpu", "python", [str(chrom)])
+
+
+def test_sequence_memo_lru_budget():
+    """The memo evicts least recently used records past its byte budget and counts hits."""
+    from array import array
+    from src.infrastructure.parallel.memo import SequenceMemo
+    memo = SequenceMemo(max_bytes=1000)
+    keys = [SequenceMemo.key(seq, 10, 5, False, "python") for seq in ("AAAA", "CCCC", "GGGG")]
+    assert keys[0] != SequenceMemo.key("AAAA", 10, 5, True, "python")
+    memo.put(keys[0], 0.0, [], array('f', [1.0] * 50))
+    memo.put(keys[1], 100.0, [], array('f', [2.0] * 50))
+    assert memo.get(keys[0])[0] == 0.0
+    memo.put(keys[2], 100.0, [], array('f', [3.0] * 50))
+    assert memo.get(keys[1]) is None and memo.get(keys[0]) is not None and len(memo) == 2
+    memo.put(keys[1], 1.0, [], array('f', [0.0] * 1000))
+    assert memo.get(keys[1]) is None
+    assert (memo.hits, memo.misses) == (2, 2)
+
+
+@pytest.mark.parametrize("chunk_size", [0, 200])
+def test_memo_skips_duplicate_records(tmp_path, chunk_size):
+    """Byte-identical records are dispatched once; results and file order are unchanged."""
+    from src.infrastructure.parallel.dispatcher import iter_fasta_parallel
+    from src.infrastructure.parallel.memo import SequenceMemo
+    unique = ["ACGT" * 20 + "CG" * 150 + "AT" * 40, "GGCCAATT", "ATATGCGC" * 40]
+    order = [0, 1, 0, 2, 0, 1, 2, 2]
+    fasta_file = tmp_path / "dups.fasta"
+    fasta_file.write_text("".join(f">r{i}\n{unique[k]}\n" for i, k in enumerate(order)))
+
+    kwargs = dict(window=10, step=3, cpg=True, max_workers=2, kernel="numpy", chunk_size=chunk_size, executor_kind="threads")
+    plain = list(iter_fasta_parallel(str(fasta_file), **kwargs))
+    memo = SequenceMemo(1 << 20)
+    memoized = list(iter_fasta_parallel(str(fasta_file), memo=memo, **kwargs))
+    assert memoized == plain
+    assert [r[0] for r in memoized] == [f"r{i}" for i in range(len(order))]
+    assert (memo.hits, memo.misses) == (5, 3)
+
+    again = list(iter_fasta_parallel(str(fasta_file), memo=memo, **kwargs))
+    assert again == plain
+    assert (memo.hits, memo.misses) == (13, 3)
+
+
+def test_stop_interrupts_wait_and_cancels_queued_batches():
+    """Setting `stop` ends the wait on a busy pool and cancels batches that never started."""
+    import threading
+    import time
+    from src.infrastructure.parallel.dispatcher import iter_records_parallel
+    release, stop = threading.Event(), threading.Event()
+    futures = []
+
+    class Pool(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            futures.append(super().submit(fn, *args, **kwargs))
+            return futures[-1]
+
+    with Pool(1) as pool:
+        pool.submit(release.wait, 30)  # ocupa o único worker
+        records = iter_records_parallel(((f"s{i}", "ACGT" * 10) for i in range(6)), max_workers=2,
+                                        executor=pool, stop=stop, batch_target=1)
+        threading.Timer(0.2, stop.set).start()
+        began = time.monotonic()
+        assert list(records) == []
+        assert time.monotonic() - began < 5
+        assert len(futures) > 2 and all(f.cancelled() for f in futures[1:])
+        release.set()
+
+
+def test_bgzf_inflate_reuses_the_run_pool(tmp_path, monkeypatch):
+    """BGZF blocks are inflated on the pool that analyzes the records, not on a new pool per file."""
+    import concurrent.futures
+    from Bio import bgzf
+    from src.infrastructure.parallel.dispatcher import iter_fasta_parallel
+    content = "".join(f">r{i}\n{'ACGTGGCC' * 40}\n" for i in range(200))
+    plain, packed = tmp_path / "plain.fa", tmp_path / "packed.fa.gz"
+    plain.write_text(content)
+    with bgzf.BgzfWriter(str(packed), "wb") as writer:
+        writer.write(content.encode())
+    expected = list(iter_fasta_parallel(str(plain), window=50, max_workers=2, executor_kind="threads"))
+
+    def no_new_pool(*args, **kwargs):
+        raise AssertionError("a second process pool was started")
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_new_pool)
+    assert list(iter_fasta_parallel(str(packed), window=50, max_workers=2, executor_kind="threads")) == expected
+    with ThreadPoolExecutor(2) as pool:
+        assert list(iter_fasta_parallel(str(packed), window=50, max_workers=2, executor=pool)) == expected
@@ -8,12 +8,13 @@ def test_render_sidebar():
         mock_st.file_uploader.return_value = []
         mock_st.checkbox.return_value = False
         
-        files, do_sw, w, s, do_cpg = render_sidebar()
+        files, do_sw, w, s, do_cpg, kernel = render_sidebar()
         
         assert files == []
         assert do_sw is False
         assert w == 100
         assert s == 50
+        assert kernel is mock_st.selectbox.return_value
 
 def test_process_uploads():
     mock_file = MagicMock()
@@ -26,6 +27,19 @@ def test_process_uploads():
         assert "seq1" in results
         assert results["seq1"] == 50.0
 
+
+def test_process_uploads_numpy_kernel_matches_reference():
+    """The numpy kernel selected in the UI yields the same results as the reference."""
+    mock_file = MagicMock()
+    mock_file.name = "test.fasta"
+    mock_file.getvalue.return_value = b">seq1\n" + b"ATGCGCGCAT" * 30 + b"\n"
+
+    with patch("src.infrastructure.web.components.st"):
+        ref = process_uploads([mock_file], True, 20, 5, True, "python")
+        vec = process_uploads([mock_file], True, 20, 5, True, "numpy")
+
+    assert ref == vec
+
 def test_render_kpis():
     stats = {"count": 1, "mean": 50.0, "std_dev": 0.0, "median": 50.0}
     with patch("src.infrastructure.web.components.st") as mock_st:
@@ -78,7 +92,7 @@ def test_render_sidebar_with_sliding_window():
         mock_st.checkbox.side_effect = [True, False]
         mock_st.number_input.side_effect = [200, 100]
 
-        files, do_sw, w, s, do_cpg = render_sidebar()
+        files, do_sw, w, s, do_cpg, kernel = render_sidebar()
 
         assert do_sw is True
         assert w == 200
@@ -101,3 +115,169 @@ def test_render_advanced_tab_empty_warning():
         from src.infrastructure.web.components import _render_advanced_tab
         _render_advanced_tab({}, {}, {'window': 100, 'step': 50})
         mock_st.warning.assert_called_once()
+
+
+def test_process_uploads_reuses_cached_analysis():
+    """Re-runs with the same upload and parameters skip parsing and analysis entirely."""
+    from src.infrastructure.web import components
+    mock_file = MagicMock()
+    mock_file.name = "cached.fasta"
+    mock_file.getvalue.return_value = b">c1\n" + b"GGCCAATTAC" * 20 + b"\n"
+
+    from src.infrastructure.web.jobs import AnalysisJob
+    with patch("src.infrastructure.web.components.st"), \
+            patch.object(AnalysisJob, "_analyze", autospec=True, side_effect=AnalysisJob._analyze) as analyze:
+        first = process_uploads([mock_file], True, 20, 10, False, "python")
+        second = process_uploads([mock_file], True, 20, 10, False, "python")
+        process_uploads([mock_file], True, 20, 5, False, "python")
+    assert first == second
+    assert analyze.call_count == 2
+
+
+def test_upload_cache_evicts_by_size():
+    from array import array
+    from src.infrastructure.web.components import _UploadCache
+    cache = _UploadCache(max_bytes=1500)
+    cache.put("a", [("s", 50.0, array('f', [1.0] * 100), [])])
+    cache.put("b", [("s", 50.0, array('f', [1.0] * 100), [])])
+    assert cache.get("a") is not None
+    cache.put("c", [("s", 50.0, array('f', [1.0] * 100), [])])
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.put("huge", [("s", 50.0, array('f', [1.0] * 1000), [])])
+    assert cache.get("huge") is None
+
+
+def test_results_frame_and_csv_cached_by_key():
+    """Tables and CSV bytes are built once per results key, not on every rerun."""
+    from src.infrastructure.web import components
+    results = {"s1": 50.0, "s2": 25.0}
+    with patch("src.infrastructure.web.components.st") as mock_st, \
+            patch.object(components, "_results_frame", wraps=components._results_frame) as build:
+        columns = [MagicMock(), MagicMock()]
+        columns[0].slider.return_value, columns[1].slider.return_value = 0.0, 100.0
+        mock_st.columns.return_value = columns
+        for _ in range(3):
+            components._render_raw_tab(results, "key-1")
+            components._render_details_tab(results, "key-1")
+    assert build.call_count == 2
+    assert mock_st.download_button.call_args[0][1] == b"ID,GC (%)\ns1,50.0\ns2,25.0\n"
+
+
+def test_analysis_job_streams_records_and_cancels():
+    """Background jobs publish records as they finish; cancelled uploads are not cached."""
+    import concurrent.futures
+    import threading
+    from src.infrastructure.web.components import _UploadCache
+    from src.infrastructure.web.jobs import AnalysisJob
+    data = b"".join(b">r%d\n" % i + b"ACGTGC" * 50 + b"\n" for i in range(6))
+    cache = _UploadCache(1 << 20)
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        job = AnalysisJob([("a.fa", "k", data)], 20, 10, True, "python", pool, 2, cache=cache).start()
+        assert job.wait(30) and job.error is None
+        assert [r[1] for r in job.snapshot()] == [f"r{i}" for i in range(6)]
+        assert job.completed == job.total == 6 and job.progress() == 1.0
+        assert cache.get("k") is not None
+
+        gate = threading.Event()
+        slow = AnalysisJob([("b.fa", "k2", data)], 20, 10, True, "python", pool, 2, cache=cache)
+        original = slow._publish
+        def publish(name, records):
+            original(name, records)
+            gate.wait(30)
+        slow._publish = publish
+        slow.start()
+        while not slow.snapshot(): pass
+        slow.cancel()
+        gate.set()
+        assert slow.wait(30) and slow.cancelled
+    assert 1 <= len(slow.snapshot()) < 6
+    assert cache.get("k2") is None
+
+
+def test_collect_results_from_partial_job():
+    """Partial snapshots map to the dashboard's per-record dicts."""
+    from src.infrastructure.web.components import collect_results
+    job = MagicMock(window=10, cpg=False)
+    job.snapshot.return_value = [("a.fa", "s1", 40.0, [1.0], []), ("b.fa", "s1", 60.0, [2.0], [])]
+    results, sw_res, cpg_res = collect_results(job, True)
+    assert results == {"a.fa::s1": 40.0, "b.fa::s1": 60.0}
+    assert sw_res == {"a.fa::s1": [1.0], "b.fa::s1": [2.0]} and cpg_res == {}
+
+
+def test_window_chart_downsamples_visible_region():
+    """Long window tracks are drawn from at most CHART_POINTS bins of the selected region."""
+    import numpy as np
+    from array import array
+    from src.infrastructure.web import components
+    windows = array('f', (np.random.default_rng(3).random(50_000) * 100).astype(np.float32))
+    with patch("src.infrastructure.web.components.st") as mock_st:
+        mock_st.slider.return_value = (10_000, 210_000)
+        chart = components._window_chart(windows, 100, 10)
+    assert mock_st.slider.call_args[0][:3] == ("Região (bp)", 0, 49_999 * 10 + 100)
+    assert len(chart.layer) == 2
+    frame = chart.data
+    assert len(frame) == components.CHART_POINTS
+    assert frame["Posição"].iloc[0] == 10_000 and frame["Posição"].iloc[-1] < 210_000
+    assert frame["Máx"].max() == max(windows[1000:21000]) and frame["Mín"].min() == min(windows[1000:21000])
+
+
+@pytest.mark.parametrize("start, end, pixels", [
+    (100, 1500, 50),        # nível 0, alinhado
+    (1234, 56789, 30),      # nível grosso com bordas desalinhadas
+    (7, 59999, 7),
+    (0, None, 1000),
+    (59990, None, 4),
+])
+def test_downsample_matches_zoom_track_query(tmp_path, start, end, pixels):
+    """In-memory downsampling gives the same bins as the on-disk zoom track, aligned or not."""
+    import numpy as np
+    from src.infrastructure.io.zoomtrack import ZoomTrack, ZoomTrackWriter, downsample
+    values = (np.random.default_rng(5).random(12000) * 100).astype(np.float32)
+    with ZoomTrackWriter(str(tmp_path / "t.gcz")) as writer:
+        writer.write_windows("s", [values], 20, 5)
+    with ZoomTrack(str(tmp_path / "t.gcz")) as track:
+        expected = track.query("s", start, end, pixels=pixels)
+    got = downsample(values, 20, 5, start, end, pixels)
+    assert got.factor == expected.factor
+    for field in ("starts", "ends", "min", "max"):
+        assert np.array_equal(getattr(got, field), getattr(expected, field))
+    # As médias dos níveis são float32 pré-agregados: iguais até o arredondamento
+    assert np.allclose(got.mean, expected.mean, rtol=1e-5)
+
+
+def test_live_analysis_fragment_shows_partial_results_then_reruns_page():
+    """While running, the fragment renders progress and partial results; when done it reruns the page."""
+    from src.infrastructure.web.components import _render_live_analysis as render_live_analysis
+    job = MagicMock(done=False, cancelled=False, error=None, completed=1, total=3, window=0, cpg=False)
+    job.progress.return_value = 1 / 3
+    job.snapshot.return_value = [("a.fa", "s1", 40.0, [], [])]
+    with patch("src.infrastructure.web.components.st") as mock_st:
+        mock_st.columns.return_value = [MagicMock() for _ in range(4)]
+        mock_st.button.return_value = False
+        render_live_analysis(job, False)
+        assert mock_st.progress.called and mock_st.dataframe.called
+        assert not mock_st.rerun.called
+
+        job.done = True
+        render_live_analysis(job, False)
+        mock_st.rerun.assert_called_once()
+
+
+def test_content_digests_are_bounded():
+    """Upload digests are hashed once per file_id and the oldest ids are evicted past the limit."""
+    from src.infrastructure.web import components
+    components._cached_digest.clear()
+    uploads = []
+    for i in range(components._DIGEST_CACHE_ENTRIES + 1):
+        up = MagicMock()
+        up.file_id = f"id-{i}"
+        up.getvalue.return_value = b">s\nACGT%d\n" % i
+        uploads.append(up)
+    first = components._content_digest(uploads[0])
+    assert components._content_digest(uploads[0]) == first
+    assert uploads[0].getvalue.call_count == 1
+    for up in uploads[1:]:
+        components._content_digest(up)
+    assert components._content_digest(uploads[0]) == first
+    assert uploads[0].getvalue.call_count == 2
+    components._cached_digest.clear()